@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark - md_to_html.py 批量转换
+在合成的多年日文件目录上测量：首次全量转换（串行 / -j 并行）、无改动时重新运行、
+改动少量日文件后重新运行；后两者的耗时应只与改动的文件数有关
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'skills' / 'usage-analyst' / 'scripts'))
+
+from md_to_html import batch_convert  # noqa: E402
+
+TYPES = ['工具错误', '理解偏差', '执行失败', '性能问题', '其他']
+
+
+def write_day(path, day, records, revision=0):
+    lines = [f'# Claude Code 会话记录 - {day}', '', '## 概览统计', '',
+             f'- **记录总数**: {records}', f'- **修订**: {revision}', '', '## 详细记录', '',
+             '| 时间戳 | 阶段 | 问题 | 类型 | 耗时 | 状态 |',
+             '|--------|------|------|------|------|------|']
+    for i in range(records):
+        lines.append(f'| {i % 24:02d}:00 | 调试 | 测试用例 {i} 失败 | {TYPES[i % len(TYPES)]} | {i % 30} | 已解决 |')
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+
+def timed(input_dir, jobs, force=False):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        converted = batch_convert(input_dir, jobs=jobs, force=force)
+    return time.perf_counter() - start, converted
+
+
+def main():
+    parser = argparse.ArgumentParser(description='批量转换基准测试')
+    parser.add_argument('--days', type=int, default=3 * 365, help='日文件数')
+    parser.add_argument('--records', type=int, default=40, help='每个日文件的记录数')
+    parser.add_argument('--changed', type=int, default=7, help='第二轮改动的日文件数')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help='并行进程数')
+    args = parser.parse_args()
+
+    start_day = date(2023, 1, 1)
+    days = [(start_day + timedelta(days=i)).isoformat() for i in range(args.days)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_dir = Path(tmp)
+        for day in days:
+            write_day(input_dir / f'{day}.md', day, args.records)
+
+        rows = [
+            ('首次全量（串行）', *timed(input_dir, 1, force=True)),
+            (f'首次全量（-j {args.jobs}）', *timed(input_dir, args.jobs, force=True)),
+            ('无改动重新运行', *timed(input_dir, args.jobs)),
+        ]
+        for day in days[-args.changed:]:
+            write_day(input_dir / f'{day}.md', day, args.records + 1, revision=1)
+        rows.append((f'改动 {args.changed} 个后重新运行', *timed(input_dir, args.jobs)))
+
+    print(f"{args.days} 个日文件，每个 {args.records} 条记录\n")
+    print(f"{'场景':<22} {'耗时(s)':>10} {'转换文件数':>10}")
+    print('-' * 48)
+    for name, elapsed, converted in rows:
+        print(f"{name:<20} {elapsed:>10.3f} {converted:>10}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
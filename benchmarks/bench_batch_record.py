@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark - 批量导入：逐条调用 record_session.py vs 一次 --batch
+逐条方式按实际用法每条记录启动一个进程（只测前 --single 条再外推），
+批量方式把 N 条跨多天的 JSONL 记录一次导入，两者都写入 markdown 日文件
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPT = Path(__file__).resolve().parent.parent / 'skills' / 'usage-recorder' / 'scripts' / 'record_session.py'
+
+TYPES = ['工具错误', '理解偏差', '执行失败', '性能问题', '其他']
+
+
+def make_record(i, days):
+    return {
+        'date': f'2026-01-{1 + i % days:02d}',
+        'stage': '调试',
+        'step': '运行测试',
+        'problem': f'测试用例 {i} 失败',
+        'type': TYPES[i % len(TYPES)],
+        'solution': '修改断言',
+        'session': f'session_{i % 7}',
+        'time': i % 30,
+        'status': '已解决' if i % 3 else '待解决',
+    }
+
+
+def run_single(storage, count, days):
+    """每条记录一个进程"""
+    env = dict(os.environ, CLAUDE_ANALYSIS_PATH=storage, CLAUDE_ANALYSIS_STORAGE='markdown')
+    start = time.perf_counter()
+    for i in range(count):
+        r = make_record(i, days)
+        subprocess.run(
+            [sys.executable, str(SCRIPT), '--date', r['date'], '-s', r['stage'], '--step', r['step'],
+             '-p', r['problem'], '-t', r['type'], '--solution', r['solution'],
+             '--session', r['session'], '--time', str(r['time']), '--status', r['status']],
+            env=env, stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def run_batch(storage, count, days):
+    """一次 --batch 导入"""
+    batch_path = Path(storage) / 'batch.jsonl'
+    with open(batch_path, 'w', encoding='utf-8') as f:
+        for i in range(count):
+            f.write(json.dumps(make_record(i, days), ensure_ascii=False) + '\n')
+
+    env = dict(os.environ, CLAUDE_ANALYSIS_PATH=storage, CLAUDE_ANALYSIS_STORAGE='markdown')
+    start = time.perf_counter()
+    subprocess.run([sys.executable, str(SCRIPT), '--batch', str(batch_path)],
+                   env=env, stdout=subprocess.DEVNULL, check=True)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='批量导入基准测试')
+    parser.add_argument('-n', '--count', type=int, default=100000, help='导入记录数')
+    parser.add_argument('--days', type=int, default=28, help='记录分布的天数')
+    parser.add_argument('--single', type=int, default=200, help='逐条方式实际执行的记录数（其余外推）')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        single = run_single(tmp, args.single, args.days)
+    with tempfile.TemporaryDirectory() as tmp:
+        batch = run_batch(tmp, args.count, args.days)
+
+    projected = single / args.single * args.count
+    print(f"{args.count} 条记录，分布在 {args.days} 天\n")
+    print(f"{'方式':<24} {'耗时(s)':>10} {'吞吐(条/s)':>12}")
+    print('-' * 50)
+    print(f"{'逐条进程（外推）':<22} {projected:>10.1f} {args.count / projected:>12.0f}")
+    print(f"{'--batch':<24} {batch:>10.2f} {args.count / batch:>12.0f}")
+    print(f"\n加速 {projected / batch:.0f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
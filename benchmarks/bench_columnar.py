@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark - 统计 N 条记录：逐行 calculate_stats vs 列式引擎（array / NumPy）
+列式引擎分别计时装载和聚合，并校验统计结果与 calculate_stats 完全一致；
+另外计时按各维度的分组汇总（计数、耗时、解决率）
+"""
+
+import argparse
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'skills' / 'usage-analyst' / 'scripts'))
+
+import record_columns  # noqa: E402
+from record_columns import DIMENSIONS, RecordColumns  # noqa: E402
+from tracker_core.records import SUMMARY_TYPES, Record  # noqa: E402
+from tracker_core.stats import calculate_stats  # noqa: E402
+
+STAGES = ['需求分析', '代码编写', '调试', '测试']
+STATUSES = ['已解决', '待解决', '需跟进']
+PRIORITIES = ['高', '中', '低']
+
+
+def make_records(count, per_day):
+    """生成 count 条按日期排列的合成记录"""
+    start = date(2024, 1, 1)
+    records = []
+    for i in range(count):
+        records.append(Record(
+            (start + timedelta(days=i // per_day)).isoformat(), f'{9 + i % 10:02d}:{i % 60:02d}',
+            STAGES[i % 4], '运行测试', f'测试用例 {i} 失败', SUMMARY_TYPES[i % 5], '修改断言',
+            '', '', str(i % 30), PRIORITIES[i % 3], STATUSES[i % 7 % 3], ''
+        ))
+    return records
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='列式统计引擎基准测试')
+    parser.add_argument('-n', '--count', type=int, default=1000000, help='记录条数')
+    parser.add_argument('--per-day', type=int, default=1000, help='每天记录数')
+    args = parser.parse_args()
+
+    records = make_records(args.count, args.per_day)
+    print(f"{args.count} 条记录，{(args.count - 1) // args.per_day + 1} 天\n")
+
+    row_time, expected = timed(lambda: calculate_stats(records))
+    print(f"{'实现':<24} {'装载(s)':>10} {'统计(s)':>10} {'分组汇总(s)':>12}")
+    print('-' * 60)
+    print(f"{'calculate_stats（逐行）':<24} {'-':>10} {row_time:>10.3f} {'-':>12}")
+
+    backends = [('列式（array）', False)]
+    if record_columns.np is not None:
+        backends.append(('列式（NumPy）', True))
+    else:
+        print("（未安装 NumPy，跳过 NumPy 后端）")
+
+    for name, use_numpy in backends:
+        load_time, table = timed(lambda: RecordColumns.from_records(records, use_numpy))
+        stats_time, stats = timed(table.stats)
+        assert stats == expected, name
+        group_time, _ = timed(lambda: [table.group_by(dim) for dim in DIMENSIONS])
+        print(f"{name:<24} {load_time:>10.3f} {stats_time:>10.3f} {group_time:>12.3f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
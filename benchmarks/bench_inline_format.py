@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark - md_to_html.py 行内格式解析
+在合成的大报告（默认 50 MB）上对比五次 re.sub（旧实现）与单遍行内标记解析，
+并核对两者对所有行的输出一致，最后测量整个报告的 Markdown → HTML 转换时间
+"""
+
+import argparse
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'skills' / 'usage-analyst' / 'scripts'))
+
+from md_to_html import convert_markdown_to_html, parse_inline_formatting  # noqa: E402
+
+TYPES = ['工具错误', '理解偏差', '执行失败', '性能问题', '其他']
+
+# 报告中常见的行内格式片段；只用旧实现也能正确处理的写法，以便逐行核对输出一致
+# （行内代码中含 * 或 _、粗体内嵌同符号斜体等旧实现会输出错乱标签的写法不在此列）
+FRAGMENTS = [
+    '**{type}** 出现 {n} 次',
+    '运行 `pytest -k case{n}` 后失败',
+    '*建议*：先检查 __配置文件__ 再重试',
+    '耗时 {n} 分钟，状态 _已解决_',
+    '**关键问题：`record.py` 中 _路径_ 错误**',
+    '普通描述文字，没有任何格式标记，第 {n} 条',
+]
+
+
+def inline_legacy(text):
+    """旧实现：五次 re.sub"""
+    text = re.sub(r'`([^`]+)`', r'<code>\1</code>', text)
+    text = re.sub(r'\*\*([^*]+)\*\*', r'<strong>\1</strong>', text)
+    text = re.sub(r'__([^_]+)__', r'<strong>\1</strong>', text)
+    text = re.sub(r'\*([^*]+)\*', r'<em>\1</em>', text)
+    text = re.sub(r'_([^_]+)_', r'<em>\1</em>', text)
+    return text
+
+
+def make_line(rng, n):
+    parts = [rng.choice(FRAGMENTS).format(type=rng.choice(TYPES), n=n) for _ in range(rng.randint(1, 3))]
+    return '，'.join(parts)
+
+
+def make_report(size):
+    """构造约 size 字节的报告：每节一个标题、若干段落与列表项、一张记录表"""
+    rng = random.Random(size)
+    lines = ['# 使用分析报告', '']
+    total = 0
+    n = 0
+    while total < size:
+        section = [f'## 第 {n // 50 + 1} 周', '']
+        for _ in range(10):
+            n += 1
+            section.append(make_line(rng, n))
+            section.append('')
+        for _ in range(20):
+            n += 1
+            section.append(f'- {make_line(rng, n)}')
+        section.append('')
+        section.append('| 日期 | 类型 | 耗时 |')
+        section.append('|------|------|------|')
+        for _ in range(20):
+            n += 1
+            section.append(f'| 2026-01-{1 + n % 28:02d} | {rng.choice(TYPES)} | {n % 60} |')
+        section.append('')
+        block = '\n'.join(section) + '\n'
+        lines.append(block)
+        total += len(block.encode('utf-8'))
+    return '\n'.join(lines)
+
+
+def inline_lines(report):
+    """取出会经过行内格式解析的文本（段落、列表项、标题）"""
+    texts = []
+    for line in report.split('\n'):
+        line = line.strip()
+        if not line or line.startswith('|'):
+            continue
+        if line.startswith('- '):
+            line = line[2:]
+        texts.append(line.lstrip('# '))
+    return texts
+
+
+def timed(func, texts):
+    start = time.perf_counter()
+    out = [func(t) for t in texts]
+    return time.perf_counter() - start, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description='行内格式解析基准测试')
+    parser.add_argument('--size-mb', type=float, default=50, help='合成报告大小（MB）')
+    args = parser.parse_args()
+
+    report = make_report(int(args.size_mb * (1 << 20)))
+    texts = inline_lines(report)
+    print(f"报告 {len(report.encode('utf-8')) / (1 << 20):.1f} MB，行内格式解析 {len(texts)} 行\n")
+
+    legacy, legacy_out = timed(inline_legacy, texts)
+    single, single_out = timed(parse_inline_formatting, texts)
+    mismatches = sum(1 for a, b in zip(legacy_out, single_out) if a != b)
+
+    print(f"{'实现':<20} {'耗时(s)':>10} {'行/s':>12}")
+    print('-' * 44)
+    print(f"{'五次 re.sub':<17} {legacy:>10.2f} {len(texts) / legacy:>12.0f}")
+    print(f"{'单遍解析':<16} {single:>10.2f} {len(texts) / single:>12.0f}")
+    print(f"\n加速 {legacy / single:.1f}x，输出不一致 {mismatches} 行")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        md_path = Path(tmp) / 'report.md'
+        md_path.write_text(report, encoding='utf-8')
+        start = time.perf_counter()
+        convert_markdown_to_html(md_path, Path(tmp) / 'report.html')
+        print(f"\n整个报告转换: {time.perf_counter() - start:.2f} s")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark - keyword_router 单次 prompt 路由延迟
+对比逐关键词 `in` 扫描（旧实现）与预编译 KeywordMatcher，prompt 大小 1 KB ~ 1 MB
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'hooks'))
+
+from keyword_router import MATCHER, PROBLEM_KEYWORDS, RESOLUTION_KEYWORDS  # noqa: E402
+
+SIZES = [1 << 10, 10 << 10, 100 << 10, 1 << 20]
+
+FILLER = (
+    "INFO worker started pid=4312 module=loader 正在加载配置 status=200 "
+    "TRACE request handled in 12ms path=/api/v1/items 数据同步完成 "
+)
+
+
+def make_prompt(size, tail_keyword=None):
+    """构造接近真实日志的 prompt；关键词放在末尾模拟最坏情况"""
+    rng = random.Random(size)
+    parts = []
+    total = 0
+    while total < size:
+        chunk = FILLER[rng.randrange(len(FILLER) // 2):]
+        parts.append(chunk)
+        total += len(chunk)
+    text = ''.join(parts)[:size]
+    if tail_keyword:
+        text = text[:-len(tail_keyword)] + tail_keyword
+    return text
+
+
+def contains_keywords(text, keywords):
+    """旧版路由的关键词检查：逐个关键词做子串判断（对照组）"""
+    text_lower = text.lower()
+    for keyword in keywords:
+        if keyword.lower() in text_lower:
+            return True
+    return False
+
+
+def route_legacy(text):
+    if contains_keywords(text, RESOLUTION_KEYWORDS):
+        return 'resolution'
+    if contains_keywords(text, PROBLEM_KEYWORDS):
+        return 'problem'
+    return None
+
+
+def route_matcher(text):
+    match = MATCHER.first_match(text, ('resolution', 'problem'))
+    return match.group if match else None
+
+
+def find_all_naive(text):
+    """逐关键词反复 find，收集所有匹配位置（对照组）"""
+    folded = text.lower()
+    matches = []
+    for group, keywords in (('resolution', RESOLUTION_KEYWORDS), ('problem', PROBLEM_KEYWORDS)):
+        for keyword in keywords:
+            keyword = keyword.lower()
+            start = folded.find(keyword)
+            while start >= 0:
+                matches.append((keyword, group, start, start + len(keyword)))
+                start = folded.find(keyword, start + 1)
+    return matches
+
+
+def timeit(func, text, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(text)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description='keyword_router 路由延迟基准测试')
+    parser.add_argument('--repeat', type=int, default=5, help='每组重复次数（取最小值）')
+    args = parser.parse_args()
+
+    scenarios = [
+        ('无关键词', None),
+        ('末尾问题词', 'timeout'),
+        ('末尾解决词', '搞定了'),
+    ]
+
+    print(f"{'场景':<10} {'大小':>8} {'legacy(ms)':>12} {'matcher(ms)':>12} {'加速比':>8}")
+    print('-' * 56)
+    for label, keyword in scenarios:
+        for size in SIZES:
+            text = make_prompt(size, keyword)
+            assert route_legacy(text) == route_matcher(text)
+            legacy = timeit(route_legacy, text, args.repeat)
+            matcher = timeit(route_matcher, text, args.repeat)
+            speedup = legacy / matcher if matcher else float('inf')
+            print(f"{label:<10} {size // 1024:>6}KB {legacy:>12.3f} {matcher:>12.3f} {speedup:>7.1f}x")
+
+    print(f"\n{'全量匹配报告':<10} {'大小':>8} {'naive(ms)':>12} {'matcher(ms)':>12} {'匹配数':>8}")
+    print('-' * 56)
+    for size in SIZES:
+        # 每行日志带一个关键词，模拟报错日志
+        text = make_prompt(size).replace('TRACE', 'ERROR')
+        expected = sorted(find_all_naive(text), key=lambda m: (m[2], m[0]))
+        got = sorted(MATCHER.find_all(text), key=lambda m: (m.start, m.keyword))
+        assert expected == [tuple(m) for m in got]
+        naive = timeit(find_all_naive, text, args.repeat)
+        matcher = timeit(MATCHER.find_all, text, args.repeat)
+        print(f"{'':<10} {size // 1024:>6}KB {naive:>12.3f} {matcher:>12.3f} {len(got):>8}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark - 教练知识库
+在 3 年合成日文件上测量知识库首次构建、已是最新、改动一天后增量构建的耗时和文件大小，
+校验增量构建与全量重建的条目一致，并对比 mmap 读取知识库与重新分析原始历史得到同样条目的耗时
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'skills' / 'usage-coach' / 'scripts'))
+
+from knowledge_base import KnowledgeHistory, build_knowledge  # noqa: E402
+from tracker_core.knowledge import KnowledgeBase, get_knowledge_path  # noqa: E402
+from tracker_core.records import SUMMARY_TYPES  # noqa: E402
+from tracker_core.writer import render_markdown, write_records  # noqa: E402
+
+STAGES = ['需求分析', '代码编写', '调试', '测试', '部署']
+PROBLEMS = ['npm install 依赖冲突', 'pytest 测试超时', 'Read 工具读取大文件失败', 'docker build 内存溢出',
+            'git rebase 冲突', '接口返回空数据', '配置文件缺失', '类型检查报错', '权限不足', '编码异常']
+SOLUTIONS = ['重新安装依赖', '增加超时时间', '拆分大文件分段读取', '加锁串行化', 'pin version',
+             'clear cache and retry', '回滚提交', '修改断言']
+DOCS = ['-', 'package.json', 'README.md', 'docs/setup.md, Makefile', 'pyproject.toml']
+
+
+def make_records(per_day, rng):
+    return [{
+        'timestamp': '10:00', 'stage': rng.choice(STAGES), 'step': '-',
+        'problem': f'{rng.choice(PROBLEMS)} #{rng.randrange(200)}', 'type': rng.choice(SUMMARY_TYPES),
+        'solution': rng.choice(SOLUTIONS), 'docs': rng.choice(DOCS), 'session': '-',
+        'time': str(rng.randrange(1, 60)), 'priority': '中',
+        'status': '已解决' if rng.random() < 0.7 else '待解决', 'note': '',
+    } for _ in range(per_day)]
+
+
+def generate_history(storage_path, days, per_day, rng):
+    today = datetime.now()
+    for d in range(days):
+        date_str = (today - timedelta(days=d)).strftime('%Y-%m-%d')
+        (storage_path / f'{date_str}.md').write_text(
+            render_markdown(date_str, make_records(per_day, rng)), encoding='utf-8')
+
+
+def read_entries(storage_path):
+    """mmap 打开知识库，读取全部条目"""
+    with KnowledgeBase.open(get_knowledge_path(storage_path)) as kb:
+        return {dim: kb.entries(dim) for dim in ('type', 'stage')}
+
+
+def analyse_raw(storage_path):
+    """不使用任何缓存，重新解析全部日文件得到同样的条目"""
+    history = KnowledgeHistory()
+    history.update(storage_path)
+    return list(history.entries())
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def median_ms(func, arg, repeat):
+    return statistics.median(timed(func, arg)[0] for _ in range(repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='教练知识库基准测试')
+    parser.add_argument('--days', type=int, default=3 * 365, help='日文件历史天数')
+    parser.add_argument('--per-day', type=int, default=20, help='每天记录数')
+    parser.add_argument('--repeat', type=int, default=20, help='读取知识库的重复次数')
+    args = parser.parse_args()
+    rng = random.Random(5)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage_path = Path(tmp)
+        generate_history(storage_path, args.days, args.per_day, rng)
+        print(f"{args.days} 天历史，每天 {args.per_day} 条记录\n")
+
+        cold_ms, _ = timed(build_knowledge, storage_path)
+        warm_ms, _ = timed(build_knowledge, storage_path)
+        write_records(datetime.now().strftime('%Y-%m-%d'), [{
+            'stage': '调试', 'problem': 'npm install 依赖冲突', 'type': '执行失败',
+            'solution': 'npm install --legacy-peer-deps', 'docs': 'package.json', 'time': '3', 'status': '已解决',
+        }], storage_path, 'markdown')
+        changed_ms, (history, _) = timed(build_knowledge, storage_path)
+
+        incremental = read_entries(storage_path)
+        build_knowledge(storage_path, rebuild=True)
+        assert read_entries(storage_path) == incremental, '增量构建与全量重建的条目不一致'
+
+        kb_size = os.path.getsize(get_knowledge_path(storage_path))
+        print(f"首次构建 {cold_ms:.0f} ms（知识库 {kb_size / 1024:.1f} KB）")
+        print(f"已是最新 {warm_ms:.0f} ms")
+        print(f"改动一天后 {changed_ms:.0f} ms（重新解析 {history.days_parsed} 个日文件，与全量重建一致）\n")
+
+        read_ms = median_ms(read_entries, storage_path, args.repeat)
+        raw_ms = median_ms(analyse_raw, storage_path, 3)
+        print(f"{'方式':<20} {'耗时(ms)':>10}")
+        print('-' * 32)
+        print(f"{'mmap 读取知识库':<16} {read_ms:>10.2f}")
+        print(f"{'重新分析原始历史':<14} {raw_ms:>10.0f}")
+        print(f"\n加速比 {raw_ms / read_ms:.0f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark - md_to_html.py 报告转换的峰值内存
+对比整篇读入、拼接后再套模板（旧实现）与逐行流式写出，报告大小 5 ~ 50 MB；
+峰值内存用 tracemalloc 统计 Python 对象分配
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'skills' / 'usage-analyst' / 'scripts'))
+
+from bench_inline_format import make_report  # noqa: E402
+from md_to_html import (  # noqa: E402
+    convert_markdown_to_html, extract_title, load_html_template, parse_markdown_simple
+)
+
+SIZES_MB = [5, 20, 50]
+
+
+def convert_in_memory(input_file, output_file):
+    """旧实现：整篇读入，生成完整 HTML 字符串后一次写出"""
+    md_content = input_file.read_text(encoding='utf-8')
+    html_content = parse_markdown_simple(md_content)
+    title = extract_title(md_content.split('\n'))
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    head, tail = load_html_template()
+    full_html = (head.substitute(title=title, timestamp=timestamp) + html_content
+                 + tail.substitute(title=title, timestamp=timestamp))
+    output_file.write_text(full_html, encoding='utf-8')
+
+
+def convert_streaming(input_file, output_file):
+    with contextlib.redirect_stdout(io.StringIO()):
+        convert_markdown_to_html(input_file, output_file)
+
+
+def measure(convert, input_file, output_file):
+    """返回 (耗时秒, 峰值 MB)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    convert(input_file, output_file)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1 << 20)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='报告转换峰值内存基准测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES_MB, help='报告大小（MB）')
+    args = parser.parse_args()
+
+    print(f"{'大小(MB)':>8} {'整篇(s)':>10} {'整篇峰值(MB)':>14} {'流式(s)':>10} {'流式峰值(MB)':>14}")
+    print('-' * 64)
+    with tempfile.TemporaryDirectory() as tmp:
+        input_file = Path(tmp) / 'report.md'
+        output_file = Path(tmp) / 'report.html'
+        for size in args.sizes:
+            input_file.write_text(make_report(size << 20), encoding='utf-8')
+            mem_time, mem_peak = measure(convert_in_memory, input_file, output_file)
+            stream_time, stream_peak = measure(convert_streaming, input_file, output_file)
+            print(f"{size:>8} {mem_time:>10.2f} {mem_peak:>14.1f} {stream_time:>10.2f} {stream_peak:>14.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
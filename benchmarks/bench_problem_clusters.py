@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark - 高频问题聚类：逐对比较 vs MinHash/LSH
+生成成组的近似重复问题描述，比较逐对计算 Jaccard 相似度（每个描述归入之前最相似描述的问题簇）
+与 LSH 聚类的耗时和问题簇数；
+再在 3 年合成日文件上测量首次聚类、缓存已是最新、以及今天新增一条记录后增量聚类的耗时
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'skills' / 'usage-analyst' / 'scripts'))
+
+from problem_clusters import ProblemClusters, load_clusters  # noqa: E402
+from tracker_core.minhash import SIMILARITY_THRESHOLD  # noqa: E402
+from tracker_core.records import SUMMARY_TYPES  # noqa: E402
+from tracker_core.text import shingles  # noqa: E402
+from tracker_core.writer import render_markdown, write_records  # noqa: E402
+
+CHARS = '构建失败依赖冲突测试超时权限不足路径错误编码异常内存溢出接口返回数据配置缺失类型检查缓存命中连接中断部署迁移'
+ENGLISH = ['npm', 'pytest', 'docker', 'git', 'webpack', 'timeout', 'import', 'module', 'read', 'tool',
+           'large', 'file', 'lock', 'merge', 'rebase', 'deploy', 'schema', 'migration', 'token', 'quota']
+# 中文双字词（各自一个二元组）与英文单词组成的词表
+WORDS = [a + b for a in CHARS for b in CHARS if a != b][::7] + ENGLISH
+
+
+def make_families(count, rng):
+    """生成 count 组问题描述的基础词序列"""
+    return [rng.sample(WORDS, rng.randint(5, 8)) for _ in range(count)]
+
+
+def variant(words, rng):
+    """基础描述的变体：随机替换一个词，或追加一个编号"""
+    words = list(words)
+    roll = rng.random()
+    if roll < 0.4:
+        words[rng.randrange(len(words))] = rng.choice(WORDS)
+    elif roll < 0.7:
+        words.append(str(rng.randrange(1000)))
+    return ' '.join(words)
+
+
+def make_texts(count, rng):
+    """count 条去重后的问题描述，约 10 条一组近似重复"""
+    families = make_families(max(1, count // 10), rng)
+    texts = set()
+    while len(texts) < count:
+        texts.add(variant(rng.choice(families), rng) + f' #{len(texts)}')
+    return list(texts)
+
+
+def pairwise_clusters(texts):
+    """逐个描述与之前所有描述计算 Jaccard 相似度，归入最相似描述的问题簇，返回问题簇数"""
+    sets = [shingles(text) for text in texts]
+    clusters = []
+    for i, a in enumerate(sets):
+        best, best_score = i, 0.0
+        for j in range(i):
+            b = sets[j]
+            score = len(a & b) / len(a | b)
+            if score >= SIMILARITY_THRESHOLD and score > best_score:
+                best, best_score = clusters[j], score
+        clusters.append(best)
+    return len(set(clusters))
+
+
+def lsh_clusters(texts):
+    clusters = ProblemClusters()
+    for text in texts:
+        clusters._text_id(text)
+    return len(set(clusters.node_clusters))
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def generate_history(storage_path, days, per_day, rng):
+    """截至今天的 days 天历史，问题描述来自成组的近似重复描述"""
+    families = make_families(200, rng)
+    today = datetime.now()
+    for d in range(days):
+        date_str = (today - timedelta(days=d)).strftime('%Y-%m-%d')
+        records = [{
+            'timestamp': '10:00', 'stage': '调试', 'step': '-', 'problem': variant(rng.choice(families), rng),
+            'type': SUMMARY_TYPES[i % len(SUMMARY_TYPES)], 'solution': '-', 'docs': '-', 'session': '-',
+            'time': str(rng.randrange(1, 60)), 'priority': '中', 'status': rng.choice(['已解决', '待解决']),
+            'note': '',
+        } for i in range(per_day)]
+        (storage_path / f'{date_str}.md').write_text(render_markdown(date_str, records), encoding='utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='高频问题聚类基准测试')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 3000, 10000, 100000],
+                        help='去重后的描述条数')
+    parser.add_argument('--pairwise-max', type=int, default=3000, help='逐对比较的最大条数（更大时跳过）')
+    parser.add_argument('--days', type=int, default=3 * 365, help='日文件历史天数')
+    parser.add_argument('--per-day', type=int, default=20, help='每天记录数')
+    args = parser.parse_args()
+    rng = random.Random(7)
+
+    print(f"{'描述数':>8} {'逐对(ms)':>12} {'LSH(ms)':>10} {'簇数(逐对)':>12} {'簇数(LSH)':>10}")
+    print('-' * 58)
+    for size in args.sizes:
+        texts = make_texts(size, rng)
+        lsh_ms, lsh_count = timed(lsh_clusters, texts)
+        if size <= args.pairwise_max:
+            pair_ms, pair_count = timed(pairwise_clusters, texts)
+            print(f"{size:>8} {pair_ms:>12.0f} {lsh_ms:>10.0f} {pair_count:>12} {lsh_count:>10}")
+        else:
+            print(f"{size:>8} {'-':>12} {lsh_ms:>10.0f} {'-':>12} {lsh_count:>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage_path = Path(tmp)
+        generate_history(storage_path, args.days, args.per_day, rng)
+        print(f"\n{args.days} 天历史，每天 {args.per_day} 条记录")
+
+        cold_ms, clusters = timed(load_clusters, storage_path)
+        warm_ms, _ = timed(load_clusters, storage_path)
+        write_records(datetime.now().strftime('%Y-%m-%d'), [{
+            'stage': '调试', 'problem': 'npm install 构建失败 依赖冲突', 'type': '其他', 'solution': '-', 'time': '1',
+        }], storage_path, 'markdown')
+        changed_ms, changed = timed(load_clusters, storage_path)
+        report_ms, (results, total, count) = timed(clusters.top_clusters)
+
+        print(f"  首次聚类 {cold_ms:.0f} ms（{len(clusters.texts)} 种描述，{count} 个问题簇）")
+        print(f"  缓存已是最新 {warm_ms:.0f} ms")
+        print(f"  新增一条记录后 {changed_ms:.0f} ms（重新解析 {changed.days_parsed} 个日文件，"
+              f"新增 {changed.texts_added} 种描述）")
+        print(f"  生成 TOP 10 报告 {report_ms:.0f} ms（{total} 条记录）")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
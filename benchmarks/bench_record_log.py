@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark - 同一天追加 N 条记录：markdown 模式 vs 追加日志模式
+markdown 模式由 .counters sidecar 增量维护概览并在文件末尾追加行，
+日志模式每条记录只追加一行并 fsync，markdown 视图最后一次性渲染；
+按每 1000 条分段输出耗时，用于确认单条记录延迟不随文件增长
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'skills' / 'usage-recorder' / 'scripts'))
+
+import record_session  # noqa: E402
+
+DATE = '2026-01-01'
+
+
+class Args:
+    def __init__(self, i, storage):
+        self.stage = '调试'
+        self.step = '运行测试'
+        self.problem = f'测试用例 {i} 失败'
+        self.type = ['工具错误', '理解偏差', '执行失败', '性能问题', '其他'][i % 5]
+        self.solution = '修改断言'
+        self.docs = 'tests/test_app.py'
+        self.session = f'session_{i % 7}'
+        self.time = str(i % 30)
+        self.priority = '中'
+        self.status = '已解决' if i % 3 else '待解决'
+        self.note = ''
+        self.date = DATE
+        self.storage = storage
+
+
+def run(storage, count):
+    """在临时目录中追加 count 条记录，返回 (总耗时, 每 1000 条的耗时列表)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ['CLAUDE_ANALYSIS_PATH'] = tmp
+        devnull = open(os.devnull, 'w')
+        stdout, sys.stdout = sys.stdout, devnull
+        marks = []
+        try:
+            start = last = time.perf_counter()
+            for i in range(count):
+                record_session.record_session(Args(i, storage))
+                if (i + 1) % 1000 == 0:
+                    now = time.perf_counter()
+                    marks.append(now - last)
+                    last = now
+            append_time = time.perf_counter() - start
+
+            render_time = 0.0
+            if storage == 'log':
+                start = time.perf_counter()
+                record_session.render_day(DATE)
+                render_time = time.perf_counter() - start
+        finally:
+            sys.stdout = stdout
+            devnull.close()
+
+        md = Path(tmp) / f'{DATE}.md'
+        rows = sum(1 for line in md.read_text(encoding='utf-8').split('\n') if line.startswith('| ') and ':' in line[:8])
+        assert rows == count, (storage, rows)
+        return append_time, render_time, marks
+
+
+def main():
+    parser = argparse.ArgumentParser(description='markdown 改写 vs 追加日志基准测试')
+    parser.add_argument('-n', '--count', type=int, default=10000, help='记录条数')
+    args = parser.parse_args()
+
+    print(f"同一天追加 {args.count} 条记录\n")
+    print(f"{'模式':<10} {'追加总耗时(s)':>14} {'渲染(s)':>10} {'平均每条(ms)':>14}")
+    print('-' * 52)
+    results = {}
+    for storage in ('markdown', 'log'):
+        append_time, render_time, marks = run(storage, args.count)
+        results[storage] = marks
+        print(f"{storage:<10} {append_time:>14.2f} {render_time:>10.2f} {append_time / args.count * 1000:>14.3f}")
+
+    print("\n每 1000 条耗时(s):")
+    print(f"{'区间':<12} {'markdown':>10} {'log':>10}")
+    for i, (md, log) in enumerate(zip(results['markdown'], results['log'])):
+        print(f"{i * 1000 + 1:>5}-{(i + 1) * 1000:<6} {md:>10.2f} {log:>10.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark - 解析后每条记录的内存占用：13 键 dict vs __slots__ Record（枚举字段编码为小整数）
+对同一批合成表格行分别构建两种表示并全部保留，用 tracemalloc 统计每条记录的字节数
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tracker_core.parser import split_table_row  # noqa: E402
+from tracker_core.records import SUMMARY_TYPES, Record  # noqa: E402
+
+STAGES = ['需求分析', '代码编写', '调试', '测试']
+STATUSES = ['已解决', '待解决', '需跟进']
+
+
+def iter_rows(count):
+    """逐行生成合成表格行（不保留）"""
+    for i in range(count):
+        yield (f"| {9 + i % 10:02d}:{i % 60:02d} | {STAGES[i % 4]} | 运行测试 | 测试用例 {i} 失败 | "
+               f"{SUMMARY_TYPES[i % 5]} | 修改断言 {i % 97} | tests/test_app.py | session_{i % 7} | "
+               f"{i % 30} | 中 | {STATUSES[i % 3]} | - |")
+
+
+def legacy_record(date_str, parts):
+    """旧实现：每行一个 13 键 dict"""
+    return {
+        'date': date_str,
+        'timestamp': parts[0],
+        'stage': parts[1] if len(parts) > 1 else '',
+        'step': parts[2] if len(parts) > 2 else '',
+        'problem': parts[3] if len(parts) > 3 else '',
+        'type': parts[4] if len(parts) > 4 else '',
+        'solution': parts[5] if len(parts) > 5 else '',
+        'docs': parts[6] if len(parts) > 6 else '',
+        'session': parts[7] if len(parts) > 7 else '',
+        'time': parts[8] if len(parts) > 8 else '',
+        'priority': parts[9] if len(parts) > 9 else '',
+        'status': parts[10] if len(parts) > 10 else '',
+        'note': parts[11] if len(parts) > 11 else ''
+    }
+
+
+def measure(build, count):
+    """构建 count 条记录并保留，返回 (每条字节数, 耗时)"""
+    date_str = '2026-01-01'
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    records = [build(date_str, split_table_row(line)) for line in iter_rows(count)]
+    elapsed = time.perf_counter() - start
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    assert len(records) == count
+    del records
+    gc.collect()
+    return used / count, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='记录内存占用基准测试')
+    parser.add_argument('-n', '--count', type=int, default=1000000, help='记录条数')
+    args = parser.parse_args()
+
+    print(f"保留 {args.count} 条解析后的记录\n")
+    print(f"{'表示':<22} {'每条(字节)':>12} {'总计(MB)':>10} {'构建(s)':>10}")
+    print('-' * 58)
+    results = {}
+    for name, build in (('dict (13 键)', legacy_record), ('Record (__slots__)', Record.from_parts)):
+        per_record, elapsed = measure(build, args.count)
+        results[name] = per_record
+        print(f"{name:<22} {per_record:>12.0f} {per_record * args.count / 1024 / 1024:>10.1f} {elapsed:>10.2f}")
+
+    legacy, compact = results.values()
+    print(f"\n每条记录节省 {legacy - compact:.0f} 字节（{(1 - compact / legacy) * 100:.0f}%）")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark - 周报/月报/季报/全部统计：逐条解析日文件 vs 读取预聚合汇总
+在临时目录生成截至今天的 3 年合成历史，分别测量逐条统计（不使用解析缓存）、
+汇总首次构建、汇总已是最新时读取，以及今天的日文件改动后增量更新的耗时
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import date, datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from bench_view_range import generate_history  # noqa: E402
+from tracker_core.history import iter_records  # noqa: E402
+from tracker_core.rollup import Rollups, period_key, period_range  # noqa: E402
+from tracker_core.stats import calculate_stats, stats_from_aggregate  # noqa: E402
+from tracker_core.writer import write_records  # noqa: E402
+
+
+def make_cases():
+    today = date.today()
+    cases = []
+    for name, period in (('本周', 'week'), ('本月', 'month'), ('本季度', 'quarter')):
+        key = period_key(period, today)
+        first, last = period_range(period, key)
+        cases.append((name, (first.isoformat(), last.isoformat()), (period, key)))
+    cases.append(('全部', (None, None), None))
+    return cases
+
+
+def rollup_stats(storage_path, date_range, period):
+    rollups = Rollups(storage_path)
+    if period is not None:
+        aggregate = rollups.period(*period)
+    else:
+        aggregate = rollups.range(*date_range)
+    return stats_from_aggregate(aggregate), rollups.days_parsed
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='预聚合汇总基准测试')
+    parser.add_argument('--days', type=int, default=3 * 365, help='历史天数')
+    parser.add_argument('--per-day', type=int, default=20, help='每天记录数')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage_path = Path(tmp)
+        generate_history(storage_path, args.days, args.per_day)
+        print(f"{args.days} 天历史，每天 {args.per_day} 条记录\n")
+        print(f"{'范围':<8} {'逐条(ms)':>10} {'首次构建(ms)':>14} {'最新(ms)':>10} {'改动后(ms)':>12} {'重新解析':>8}")
+        print('-' * 70)
+
+        for name, date_range, period in make_cases():
+            raw_ms, raw = timed(lambda: calculate_stats(iter_records(storage_path, None, *date_range)))
+            build_ms, _ = timed(rollup_stats, storage_path, date_range, period)
+            fresh_ms, (stats, _) = timed(rollup_stats, storage_path, date_range, period)
+            assert stats['total_count'] == raw['total_count'] and stats['total_time'] == raw['total_time']
+
+            # 今天新增一条记录，只有今天的日文件需要重新解析
+            write_records(datetime.now().strftime('%Y-%m-%d'), [{
+                'stage': '调试', 'problem': '增量测试', 'type': '其他', 'solution': '-', 'time': '1',
+            }], storage_path, 'markdown')
+            changed_ms, (_, parsed) = timed(rollup_stats, storage_path, date_range, period)
+
+            print(f"{name:<6} {raw_ms:>10.1f} {build_ms:>14.1f} {fresh_ms:>10.1f} {changed_ms:>12.1f} {parsed:>8}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark - hook 启动/路由延迟：冷启动进程 vs 常驻守护进程
+  cold   : 每次启动 python keyword_router.py（原 hook 方式）
+  shim   : 每次启动 python router_client.py，由守护进程完成路由
+  socket : 进程内直接访问守护进程（仅 socket 往返，不含解释器启动）
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HOOKS_DIR = Path(__file__).resolve().parent.parent / 'hooks'
+sys.path.insert(0, str(HOOKS_DIR))
+
+from router_client import query_daemon  # noqa: E402
+
+PAYLOAD = json.dumps({
+    "prompt": "运行测试的时候报错了: TypeError: 'NoneType' object is not subscriptable",
+    "sessionId": "bench_session"
+}, ensure_ascii=False).encode('utf-8')
+
+
+def run_process(script, env):
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, str(HOOKS_DIR / script)], input=PAYLOAD,
+                          capture_output=True, env=env, check=True)
+    elapsed = time.perf_counter() - start
+    return elapsed, proc.stdout
+
+
+def summarize(label, samples):
+    samples = sorted(s * 1000 for s in samples)
+    p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+    print(f"{label:<8} {statistics.mean(samples):>10.2f} {samples[len(samples) // 2]:>10.2f} {p95:>10.2f}")
+
+
+def wait_for_socket(path, timeout=5.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if query_daemon(PAYLOAD, path) is not None:
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description='hook 冷启动 vs 守护进程延迟基准测试')
+    parser.add_argument('-n', '--runs', type=int, default=30, help='每种模式运行次数')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        socket_path = os.path.join(tmp, 'router.sock')
+        env = dict(os.environ, CLAUDE_ROUTER_SOCKET=socket_path)
+
+        cold = [run_process('keyword_router.py', env) for _ in range(args.runs)]
+        fallback = [run_process('router_client.py', env) for _ in range(args.runs)]
+
+        daemon = subprocess.Popen([sys.executable, str(HOOKS_DIR / 'router_daemon.py'),
+                                   '--socket', socket_path], stdout=subprocess.DEVNULL)
+        try:
+            if not wait_for_socket(socket_path):
+                print("错误: 守护进程未能启动")
+                return 1
+            shim = [run_process('router_client.py', env) for _ in range(args.runs)]
+
+            in_process = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                query_daemon(PAYLOAD, socket_path)
+                in_process.append(time.perf_counter() - start)
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+    # 三种模式输出必须一致
+    assert cold[0][1] == fallback[0][1] == shim[0][1]
+
+    print(f"{'模式':<8} {'mean(ms)':>10} {'p50(ms)':>10} {'p95(ms)':>10}")
+    print('-' * 42)
+    summarize('cold', [t for t, _ in cold])
+    summarize('fallback', [t for t, _ in fallback])
+    summarize('shim', [t for t, _ in shim])
+    summarize('socket', in_process)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
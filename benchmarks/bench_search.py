@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark - 全文检索：FTS5 倒排索引 vs LIKE 逐条匹配
+在临时数据库中生成合成记录（默认 100 万条，中英文混合），测量全文索引首次建立的耗时和大小，
+以及少见词、常见词、中文短语、多词、任一匹配、最近 30 天等查询的检索耗时中位数（--like 时对比 LIKE），
+任一查询超过预算时以状态 1 退出
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from tracker_core.records import SUMMARY_TYPES  # noqa: E402
+from tracker_core.store import RecordStore  # noqa: E402
+
+# 每个查询检索耗时中位数的预算
+SEARCH_BUDGET_MS = 50
+
+PROBLEMS_ZH = ['构建失败', '依赖冲突', '测试超时', '权限不足', '路径错误', '编码异常', '内存溢出',
+               '接口返回空数据', '配置文件缺失', '类型检查报错', '数据库连接中断', '缓存未命中']
+PROBLEMS_EN = ['npm install', 'pytest', 'Read tool', 'git rebase', 'docker build', 'webpack',
+               'timeout', 'ENOENT', 'permission denied', 'segfault', 'flaky test', 'race condition']
+SOLUTIONS = ['重新安装依赖', '增加超时时间', '修改断言', 'pin version', 'clear cache and retry',
+             '回滚提交', '拆分大文件分段读取', '加锁串行化', '-']
+STEPS = ['运行测试', '编译', '部署', '代码审查', '调试', 'refactor module']
+
+QUERIES = [
+    ('少见词', '第 123456 次', {}),
+    ('常见词', '失败', {}),
+    ('中文短语', '数据库连接中断', {}),
+    ('多词', 'docker build 内存溢出', {}),
+    ('英文', 'race condition', {}),
+    ('任一匹配', 'segfault 权限不足', {'any_term': True}),
+    ('最近 30 天', '测试超时', {'start_date': None}),
+]
+
+
+def generate_records(store, count, days):
+    """向数据库按日期顺序写入 count 条合成记录，均匀分布在截至今天的 days 天内"""
+    rng = random.Random(42)
+    first = date.today() - timedelta(days=days - 1)
+    per_day = -(-count // days)
+
+    def rows():
+        for i in range(count):
+            day = (first + timedelta(days=i // per_day)).isoformat()
+            problem = f'{rng.choice(PROBLEMS_EN)} {rng.choice(PROBLEMS_ZH)}，第 {i} 次'
+            if i % 7 == 0:
+                problem += f'，{rng.choice(PROBLEMS_ZH)}'
+            minutes = rng.randrange(1, 60)
+            yield [day, f'{9 + i % 10:02d}:{i % 60:02d}', '调试', rng.choice(STEPS), problem,
+                   SUMMARY_TYPES[i % len(SUMMARY_TYPES)], rng.choice(SOLUTIONS), '-',
+                   f'session_{i % 97}', str(minutes), '中', '已解决' if i % 3 else '待解决',
+                   rng.choice(['', '偶发', 'CI 上复现']), minutes]
+
+    with store.conn:
+        store._insert_rows(rows())
+
+
+def median_ms(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='全文检索基准测试')
+    parser.add_argument('--records', type=int, default=1_000_000, help='合成记录数')
+    parser.add_argument('--days', type=int, default=3 * 365, help='记录分布的天数')
+    parser.add_argument('--repeat', type=int, default=20, help='每个查询的重复次数')
+    parser.add_argument('--limit', type=int, default=10, help='每次检索返回的条数')
+    parser.add_argument('--like', action='store_true', help='同时测量没有 FTS5 时的 LIKE 逐条匹配')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / 'records.db'
+        with RecordStore(db_path) as store:
+            start = time.perf_counter()
+            generate_records(store, args.records, args.days)
+            print(f"{args.records} 条记录（{args.days} 天），写入 {time.perf_counter() - start:.1f} s")
+            size_before = os.path.getsize(db_path)
+
+            start = time.perf_counter()
+            if not store.ensure_fts():
+                print("当前 SQLite 未编译 FTS5，无法测量倒排索引")
+                return 1
+            build_s = time.perf_counter() - start
+            index_mb = (os.path.getsize(db_path) - size_before) / 1024 / 1024
+            print(f"全文索引首次建立 {build_s:.1f} s，约 {index_mb:.0f} MB\n")
+
+            month_ago = (date.today() - timedelta(days=30)).isoformat()
+            header = f"{'查询':<10} {'检索词':<24} {'FTS5(ms)':>10}"
+            if args.like:
+                header += f" {'LIKE(ms)':>10}"
+            print(header)
+            print('-' * 62)
+
+            over_budget = []
+            for name, query, options in QUERIES:
+                if 'start_date' in options:
+                    options = dict(options, start_date=month_ago)
+                fts_ms, results = median_ms(
+                    lambda: store.search(query, args.limit, **options), args.repeat)
+                line = f"{name:<8} {query:<22} {fts_ms:>10.2f}"
+                if args.like:
+                    like_ms, _ = median_ms(
+                        lambda: store._search_like(query, args.limit, options.get('start_date'), None,
+                                                   options.get('any_term', False)), 1)
+                    line += f" {like_ms:>10.1f}"
+                print(f"{line}   ({len(results)} 条)")
+                if fts_ms > SEARCH_BUDGET_MS:
+                    over_budget.append(name)
+
+    if over_budget:
+        print(f"\n[FAIL] 超过 {SEARCH_BUDGET_MS} ms 预算: {', '.join(over_budget)}")
+        return 1
+    print(f"\n[OK] 全部查询在 {SEARCH_BUDGET_MS} ms 预算内")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark - 二进制记录段 vs markdown 日文件解析
+在 3 年合成日文件上比较 parse_day_records 逐个解析日文件与 mmap 读取按月打包的段文件：
+  全部记录  取出全部 Record（段文件需解码文本）
+  全量统计  总数、耗时、类型/阶段/状态/优先级/日期分组（段文件只读定长列）
+  30 天统计 最近 30 天的同样统计（段文件按日期二分定位）
+并校验两种方式得到的记录和统计完全一致
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'skills' / 'usage-recorder' / 'scripts'))
+
+from record_segments import iter_segment_paths, pack_days, segment_stats  # noqa: E402
+from tracker_core.history import iter_day_files  # noqa: E402
+from tracker_core.parser import parse_day_records  # noqa: E402
+from tracker_core.records import SUMMARY_TYPES  # noqa: E402
+from tracker_core.segment import Segment  # noqa: E402
+from tracker_core.stats import calculate_stats  # noqa: E402
+from tracker_core.writer import render_markdown  # noqa: E402
+
+STAGES = ['需求分析', '代码编写', '调试', '测试', '部署']
+PROBLEMS = ['npm install 依赖冲突', 'pytest 测试超时', 'Read 工具读取大文件失败 | 分段', 'docker build 内存溢出',
+            'git rebase 冲突', '接口返回空数据', '配置文件缺失', '类型检查报错']
+SOLUTIONS = ['重新安装依赖', '增加超时时间', '拆分大文件分段读取', 'pin version', '-']
+
+
+def generate_history(storage_path, days, per_day, rng):
+    today = datetime.now()
+    for d in range(days):
+        date_str = (today - timedelta(days=d)).strftime('%Y-%m-%d')
+        records = [{
+            'timestamp': f'{9 + i % 10:02d}:{i % 60:02d}', 'stage': rng.choice(STAGES), 'step': '运行测试',
+            'problem': f'{rng.choice(PROBLEMS)} #{rng.randrange(1000)}', 'type': rng.choice(SUMMARY_TYPES),
+            'solution': rng.choice(SOLUTIONS), 'docs': rng.choice(['-', 'README.md']),
+            'session': f'session_{rng.randrange(300)}', 'time': str(rng.randrange(1, 60)),
+            'priority': rng.choice(['高', '中', '低']), 'status': rng.choice(['已解决', '待解决', '需跟进']),
+            'note': rng.choice(['', '偶发', 'CI 上复现']),
+        } for i in range(per_day)]
+        (storage_path / f'{date_str}.md').write_text(render_markdown(date_str, records), encoding='utf-8')
+
+
+def markdown_records(storage_path, start_date=None):
+    records = []
+    for md_file in iter_day_files(storage_path, start_date):
+        records.extend(parse_day_records(md_file, md_file.stem))
+    return records
+
+
+def segment_records(segment_dir):
+    records = []
+    for path in iter_segment_paths(segment_dir):
+        with Segment.open(path) as segment:
+            records.extend(segment.iter_records())
+    return records
+
+
+def markdown_stats(storage_path, start_date=None):
+    return calculate_stats(markdown_records(storage_path, start_date))
+
+
+def comparable(stats):
+    return {key: dict(value) if isinstance(value, dict) else value for key, value in stats.items()}
+
+
+def median_ms(func, *args, repeat=5):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='二进制记录段基准测试')
+    parser.add_argument('--days', type=int, default=3 * 365, help='日文件历史天数')
+    parser.add_argument('--per-day', type=int, default=20, help='每天记录数')
+    parser.add_argument('--repeat', type=int, default=5, help='每项的重复次数（取中位数）')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage_path = Path(tmp)
+        segment_dir = storage_path / 'segments'
+        generate_history(storage_path, args.days, args.per_day, random.Random(9))
+
+        start = time.perf_counter()
+        packed = pack_days(storage_path, segment_dir)
+        pack_s = time.perf_counter() - start
+        md_size = sum(f.stat().st_size for f in iter_day_files(storage_path))
+        seg_size = sum(path.stat().st_size for path, _, _ in packed)
+        total = sum(count for _, _, count in packed)
+        print(f"{args.days} 天历史，{total} 条记录；打包为 {len(packed)} 个段文件 {pack_s:.1f} s")
+        print(f"markdown {md_size / 1024 / 1024:.1f} MB，段文件 {seg_size / 1024 / 1024:.1f} MB\n")
+
+        assert segment_records(segment_dir) == markdown_records(storage_path), '段文件的记录与日文件不一致'
+        month_ago = (date.today() - timedelta(days=29)).isoformat()
+        for start_date in (None, month_ago):
+            assert comparable(segment_stats(segment_dir, start_date)[0]) == \
+                comparable(markdown_stats(storage_path, start_date)), '段文件的统计与日文件不一致'
+
+        cases = [
+            ('全部记录', (markdown_records, storage_path), (segment_records, segment_dir)),
+            ('全量统计', (markdown_stats, storage_path), (segment_stats, segment_dir)),
+            ('30 天统计', (markdown_stats, storage_path, month_ago), (segment_stats, segment_dir, month_ago)),
+        ]
+        print(f"{'场景':<10} {'markdown(ms)':>14} {'段文件(ms)':>12} {'加速比':>8}")
+        print('-' * 50)
+        for name, (md_func, *md_args), (seg_func, *seg_args) in cases:
+            md_ms = median_ms(md_func, *md_args, repeat=args.repeat)
+            seg_ms = median_ms(seg_func, *seg_args, repeat=args.repeat)
+            print(f"{name:<8} {md_ms:>14.1f} {seg_ms:>12.2f} {md_ms / seg_ms:>7.0f}x")
+        print("\n[OK] 段文件与日文件的记录和统计一致")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
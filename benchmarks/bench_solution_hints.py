@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark - hook 时的历史解决方案提示
+在 3 年合成日文件上测量提示索引首次生成、已是最新、今天新增一条记录后增量生成的耗时和索引大小，
+hook 进程加载索引的耗时，以及不同 prompt 的单次查询耗时 p50/p99（含 keyword_router 完整路由），
+查询 p99 超过预算时以状态 1 退出
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'hooks'))
+sys.path.insert(0, str(ROOT / 'skills' / 'usage-observer' / 'scripts'))
+
+from build_hints import build_hints  # noqa: E402
+from keyword_router import handle_request  # noqa: E402
+from tracker_core.hints import HintIndex, get_hint_index_path  # noqa: E402
+from tracker_core.records import SUMMARY_TYPES  # noqa: E402
+from tracker_core.writer import render_markdown, write_records  # noqa: E402
+
+# 单次查询耗时 p99 的预算
+HINT_BUDGET_MS = 5
+
+CHARS = '构建失败依赖冲突测试超时权限不足路径错误编码异常内存溢出接口返回数据配置缺失类型检查缓存命中连接中断部署迁移'
+ENGLISH = ['npm', 'pytest', 'docker', 'git', 'webpack', 'timeout', 'import', 'module', 'read', 'tool',
+           'large', 'file', 'lock', 'merge', 'rebase', 'deploy', 'schema', 'migration', 'token', 'quota']
+# 中文双字词与英文单词组成的词表
+WORDS = [a + b for a in CHARS for b in CHARS if a != b][::7] + ENGLISH
+SOLUTIONS = ['重新安装依赖', '增加超时时间', '修改断言', 'pin version', 'clear cache and retry',
+             '回滚提交', '拆分大文件分段读取', '加锁串行化']
+
+LOG_LINE = "INFO worker started pid=4312 module=loader status=200 TRACE request handled in 12ms\n"
+
+
+def problem_text(words, rng):
+    """问题描述：基础词序列随机替换一个词，或追加一个编号"""
+    words = list(words)
+    roll = rng.random()
+    if roll < 0.4:
+        words[rng.randrange(len(words))] = rng.choice(WORDS)
+    elif roll < 0.7:
+        words.append(str(rng.randrange(1000)))
+    return ' '.join(words)
+
+
+def generate_history(storage_path, days, per_day, families, rng):
+    """截至今天的 days 天历史，约三分之二的记录已解决且有解决方案"""
+    today = datetime.now()
+    for d in range(days):
+        date_str = (today - timedelta(days=d)).strftime('%Y-%m-%d')
+        records = []
+        for i in range(per_day):
+            resolved = rng.random() < 0.67
+            records.append({
+                'timestamp': '10:00', 'stage': '调试', 'step': '-',
+                'problem': problem_text(rng.choice(families), rng),
+                'type': SUMMARY_TYPES[i % len(SUMMARY_TYPES)],
+                'solution': rng.choice(SOLUTIONS) if resolved else '-', 'docs': '-', 'session': '-',
+                'time': str(rng.randrange(1, 60)), 'priority': '中',
+                'status': '已解决' if resolved else '待解决', 'note': '',
+            })
+        (storage_path / f'{date_str}.md').write_text(render_markdown(date_str, records), encoding='utf-8')
+
+
+def make_prompts(families, rng, count):
+    """各类 prompt：换种说法的历史问题、无关的问题、带长日志的问题"""
+    prompts = []
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            words = rng.sample(rng.choice(families), 4)
+            prompts.append(('相似问题', f"又遇到了 {' '.join(words)} 的报错，怎么办"))
+        elif kind == 1:
+            prompts.append(('无关问题', f"这个函数返回值不对，第 {i} 行有问题"))
+        else:
+            words = ' '.join(rng.choice(families))
+            prompts.append(('附带日志', f"{words} 失败了\n" + LOG_LINE * 200))
+    return prompts
+
+
+def percentile(samples, ratio):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * ratio))]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='历史解决方案提示基准测试')
+    parser.add_argument('--days', type=int, default=3 * 365, help='日文件历史天数')
+    parser.add_argument('--per-day', type=int, default=20, help='每天记录数')
+    parser.add_argument('--families', type=int, default=500, help='问题种类数（每种有多个近似描述）')
+    parser.add_argument('--queries', type=int, default=3000, help='查询次数')
+    args = parser.parse_args()
+    rng = random.Random(11)
+    families = [rng.sample(WORDS, rng.randint(4, 7)) for _ in range(args.families)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage_path = Path(tmp)
+        os.environ['CLAUDE_ANALYSIS_PATH'] = tmp
+        generate_history(storage_path, args.days, args.per_day, families, rng)
+        print(f"{args.days} 天历史，每天 {args.per_day} 条记录\n")
+
+        cold_ms, (_, index, _) = timed(build_hints, storage_path)
+        warm_ms, _ = timed(build_hints, storage_path)
+        write_records(datetime.now().strftime('%Y-%m-%d'), [{
+            'stage': '调试', 'problem': 'npm install 构建失败 依赖冲突', 'type': '其他',
+            'solution': 'npm install --legacy-peer-deps', 'time': '1', 'status': '已解决',
+        }], storage_path, 'markdown')
+        changed_ms, (history, _, _) = timed(build_hints, storage_path)
+
+        index_path = get_hint_index_path(storage_path)
+        load_ms, index = timed(HintIndex.load, index_path)
+        print(f"索引首次生成 {cold_ms:.0f} ms（{len(index)} 条已解决问题，{len(index.postings)} 个检索词，"
+              f"{os.path.getsize(index_path) / 1024:.0f} KB）")
+        print(f"索引已是最新 {warm_ms:.0f} ms")
+        print(f"新增一条记录后 {changed_ms:.0f} ms（重新解析 {history.days_parsed} 个日文件）")
+        print(f"hook 进程加载索引 {load_ms:.1f} ms\n")
+
+        samples = {}
+        hits = {}
+        for kind, prompt in make_prompts(families, rng, args.queries):
+            elapsed, hints = timed(index.lookup, prompt)
+            samples.setdefault(kind, []).append(elapsed)
+            hits[kind] = hits.get(kind, 0) + bool(hints)
+
+        route_samples = []
+        for _, prompt in make_prompts(families, rng, args.queries // 3):
+            raw = json.dumps({'prompt': prompt, 'sessionId': 'bench'}, ensure_ascii=False).encode('utf-8')
+            route_samples.append(timed(handle_request, raw)[0])
+
+    print(f"{'prompt':<10} {'p50(ms)':>10} {'p99(ms)':>10} {'有提示':>8}")
+    print('-' * 44)
+    over = False
+    for kind, kind_samples in samples.items():
+        p99 = percentile(kind_samples, 0.99)
+        over = over or p99 > HINT_BUDGET_MS
+        print(f"{kind:<8} {percentile(kind_samples, 0.5):>10.3f} {p99:>10.3f} "
+              f"{hits[kind] * 100 / len(kind_samples):>7.0f}%")
+    print(f"{'完整路由':<8} {percentile(route_samples, 0.5):>10.3f} {percentile(route_samples, 0.99):>10.3f}")
+
+    if over:
+        print(f"\n[FAIL] 查询 p99 超过 {HINT_BUDGET_MS} ms 预算")
+        return 1
+    print(f"\n[OK] 查询 p99 在 {HINT_BUDGET_MS} ms 预算内")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark - 命令行脚本启动时间预算
+用 python -X importtime 统计各脚本的导入耗时，并测量 view_records.py --today 到第一字节输出的时间；
+预算按扣除空解释器启动后的时间计算，减少机器快慢的影响，超出时以非零状态退出
+"""
+
+import argparse
+import compileall
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SKILLS = ROOT / 'skills'
+
+# view_records.py --today 到第一字节输出、扣除空解释器启动后的预算（毫秒，中位数）
+FIRST_OUTPUT_BUDGET_MS = 50
+
+# (名称, 脚本, 参数)
+SCRIPTS = [
+    ('recorder view --today', SKILLS / 'usage-recorder' / 'scripts' / 'view_records.py', ['--today']),
+    ('observer view --today', SKILLS / 'usage-observer' / 'scripts' / 'view_records.py', ['--today']),
+    ('recorder record --help', SKILLS / 'usage-recorder' / 'scripts' / 'record_session.py', ['--help']),
+    ('analyst md_to_html --help', SKILLS / 'usage-analyst' / 'scripts' / 'md_to_html.py', ['--help']),
+]
+
+FIRST_OUTPUT_SCRIPTS = SCRIPTS[:2]
+
+
+def seed_today(storage):
+    """写入几条今天的记录，使 --today 走完整的解析和输出路径"""
+    env = dict(os.environ, CLAUDE_ANALYSIS_PATH=storage, CLAUDE_ANALYSIS_STORAGE='markdown')
+    script = SKILLS / 'usage-recorder' / 'scripts' / 'record_session.py'
+    for i in range(5):
+        subprocess.run(
+            [sys.executable, str(script), '-s', '调试', '-p', f'启动测试 {i}', '-t', '工具错误',
+             '--solution', '-', '--time', str(i)],
+            env=env, stdout=subprocess.DEVNULL, check=True)
+
+
+def import_times(script, args, env):
+    """运行一次 -X importtime，返回 [(累计微秒, 模块名)]，只取顶层导入"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', str(script), *args],
+        env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if cumulative.strip().isdigit() and not name.startswith('  '):
+            modules.append((int(cumulative), name.strip()))
+    return modules
+
+
+def first_output_ms(command, env):
+    """启动进程到读到第一字节标准输出的时间（毫秒）"""
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, *command], env=env, stdout=subprocess.PIPE)
+    proc.stdout.read(1)
+    elapsed = (time.perf_counter() - start) * 1000
+    proc.stdout.read()
+    proc.wait()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description='启动时间基准测试')
+    parser.add_argument('--runs', type=int, default=15, help='每个脚本的运行次数（取中位数）')
+    parser.add_argument('--top', type=int, default=5, help='显示导入耗时最多的模块数')
+    parser.add_argument('--budget', type=float, default=FIRST_OUTPUT_BUDGET_MS,
+                        help=f'扣除空解释器启动后的第一字节输出预算（毫秒，默认 {FIRST_OUTPUT_BUDGET_MS}）')
+    args = parser.parse_args()
+
+    # 先生成字节码缓存，按正常安装后的情况测量（设置了 PYTHONDONTWRITEBYTECODE 时脚本自己不会写入）
+    for directory in (ROOT / 'tracker_core', SKILLS):
+        compileall.compile_dir(directory, quiet=1)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_today(tmp)
+        env = dict(os.environ, CLAUDE_ANALYSIS_PATH=tmp)
+
+        print(f"{'脚本':<28} {'导入(ms)':>10}  导入耗时最多的模块")
+        print('-' * 90)
+        for name, script, script_args in SCRIPTS:
+            modules = import_times(script, script_args, env)
+            total = sum(us for us, _ in modules) / 1000
+            top = sorted(modules, reverse=True)[:args.top]
+            print(f"{name:<28} {total:>10.1f}  " + ', '.join(f'{m} {us / 1000:.1f}' for us, m in top))
+
+        # 空解释器进程的启动和退出时间（print 保证有一字节输出）
+        baseline = statistics.median(
+            first_output_ms(['-c', 'print()'], env) for _ in range(args.runs))
+
+        print(f"\n空解释器启动: {baseline:.1f} ms\n")
+        print(f"{'脚本':<28} {'第一字节(ms)':>14} {'扣除后(ms)':>12} {'预算(ms)':>10}")
+        print('-' * 70)
+        over = False
+        for name, script, script_args in FIRST_OUTPUT_SCRIPTS:
+            median = statistics.median(
+                first_output_ms([str(script), *script_args], env) for _ in range(args.runs))
+            overhead = median - baseline
+            mark = 'OK' if overhead <= args.budget else '超出'
+            over = over or overhead > args.budget
+            print(f"{name:<28} {median:>14.1f} {overhead:>12.1f} {args.budget:>10.0f}  {mark}")
+
+    return 1 if over else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
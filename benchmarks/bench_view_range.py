@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark - 按日期范围查看记录：全量加载后过滤 vs 只加载范围内的日文件
+在临时目录生成截至今天的 3 年合成历史，对今天/本周/本月/本季度/全部分别计时，
+并统计每种方式实际解析的文件数（不使用解析缓存）
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'skills' / 'usage-recorder' / 'scripts'))
+
+import view_records  # noqa: E402
+from tracker_core import history  # noqa: E402
+from tracker_core.records import SUMMARY_TYPES  # noqa: E402
+from tracker_core.writer import render_markdown  # noqa: E402
+
+
+def generate_history(storage_path, days, per_day):
+    """生成截至今天的 days 天历史，每天 per_day 条记录"""
+    today = datetime.now()
+    types = SUMMARY_TYPES
+    for d in range(days):
+        date_str = (today - timedelta(days=d)).strftime('%Y-%m-%d')
+        records = [{
+            'timestamp': f'{9 + i % 10:02d}:{i % 60:02d}',
+            'stage': '调试',
+            'step': '运行测试',
+            'problem': f'{date_str} 测试用例 {i} 失败',
+            'type': types[i % len(types)],
+            'solution': '修改断言',
+            'docs': 'tests/test_app.py',
+            'session': f'session_{i % 7}',
+            'time': str(i % 30),
+            'priority': '中',
+            'status': '已解决' if i % 3 else '待解决',
+            'note': '',
+        } for i in range(per_day)]
+        (storage_path / f'{date_str}.md').write_text(
+            render_markdown(date_str, records), encoding='utf-8')
+
+
+def legacy_filter(records, start_date, end_date):
+    """旧实现：全量记录逐条 strptime 后比较"""
+    if start_date is None:
+        return records
+    first = datetime.strptime(start_date, '%Y-%m-%d')
+    last = datetime.strptime(end_date, '%Y-%m-%d')
+    return [r for r in records if first <= datetime.strptime(r.date, '%Y-%m-%d') <= last]
+
+
+class Args:
+    def __init__(self, **flags):
+        self.today = self.week = self.month = self.all = False
+        self.date = self.from_date = self.to_date = self.quarter = None
+        for name, value in flags.items():
+            setattr(self, name, value)
+
+
+CASES = [
+    ('今天', Args(today=True)),
+    ('本周', Args(week=True)),
+    ('本月', Args(month=True)),
+    ('本季度', Args(quarter=())),
+    ('全部', Args(all=True)),
+]
+
+
+def timed(func, repeat):
+    """重复 repeat 次取最快一次，同时返回结果与该次的解析文件数"""
+    best = None
+    for _ in range(repeat):
+        parsed = [0]
+        original = history.iter_day_records
+
+        def counting(md_path, date_str):
+            parsed[0] += 1
+            return original(md_path, date_str)
+
+        history.iter_day_records = counting
+        try:
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+        finally:
+            history.iter_day_records = original
+        if best is None or elapsed < best[0]:
+            best = (elapsed, result, parsed[0])
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description='按日期范围查看记录基准测试')
+    parser.add_argument('--days', type=int, default=3 * 365, help='历史天数')
+    parser.add_argument('--per-day', type=int, default=8, help='每天记录数')
+    parser.add_argument('-r', '--repeat', type=int, default=3, help='每项重复次数（取最快）')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage_path = Path(tmp)
+        os.environ['CLAUDE_ANALYSIS_PATH'] = tmp
+        generate_history(storage_path, args.days, args.per_day)
+
+        print(f"合成历史: {args.days} 个日文件，每天 {args.per_day} 条记录\n")
+        print(f"{'范围':<8} {'记录数':>8} {'全量(ms)':>10} {'解析文件':>8} {'按范围(ms)':>12} {'解析文件':>8} {'加速':>8}")
+        print('-' * 72)
+        for name, case in CASES:
+            start_date, end_date, _ = view_records.get_view_range(case)
+
+            legacy_time, legacy_records, legacy_files = timed(
+                lambda: legacy_filter(history.get_all_records(storage_path), start_date, end_date),
+                args.repeat)
+            pruned_time, pruned_records, pruned_files = timed(
+                lambda: history.get_all_records(storage_path, None, start_date, end_date),
+                args.repeat)
+            assert legacy_records == pruned_records, name
+
+            print(f"{name:<8} {len(pruned_records):>8} {legacy_time * 1000:>10.1f} {legacy_files:>8} "
+                  f"{pruned_time * 1000:>12.1f} {pruned_files:>8} {legacy_time / pruned_time:>7.1f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Stress - N 个并行 recorder 进程同时向同一天写入记录，检查没有记录丢失
+每个进程写入 M 条带唯一编号的记录，结束后核对 markdown 表格行、概览统计、sidecar
+（以及启用时的 SQLite 索引），并输出总吞吐量
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'skills' / 'usage-recorder' / 'scripts'))
+
+import record_session  # noqa: E402
+from tracker_core import store as record_store  # noqa: E402
+from tracker_core.parser import parse_existing_records  # noqa: E402
+from tracker_core.writer import load_counters, render_day, scan_summary  # noqa: E402
+
+DATE = '2026-01-01'
+
+
+class Args:
+    def __init__(self, worker, i, storage):
+        self.stage = '调试'
+        self.step = '并发写入'
+        self.problem = f'worker {worker} record {i}'
+        self.type = ['工具错误', '理解偏差', '执行失败', '性能问题', '其他'][i % 5]
+        self.solution = '-'
+        self.docs = ''
+        self.session = f'session_{worker}'
+        self.time = '1'
+        self.priority = '中'
+        self.status = '已解决' if i % 2 else '待解决'
+        self.note = ''
+        self.date = DATE
+        self.storage = storage
+
+
+def worker(worker_id, count, storage, start_event):
+    with open(os.devnull, 'w') as devnull:
+        sys.stdout = devnull
+        start_event.wait()
+        for i in range(count):
+            record_session.record_session(Args(worker_id, i, storage))
+
+
+def check(storage_path, processes, count):
+    """核对结果，返回问题列表（为空表示通过）"""
+    errors = []
+    md_path = storage_path / f'{DATE}.md'
+    content = md_path.read_bytes().decode('utf-8', errors='replace')
+
+    problems = [parts[3] for parts in parse_existing_records(content)]
+    expected = {f'worker {w} record {i}' for w in range(processes) for i in range(count)}
+    missing = expected - set(problems)
+    if missing:
+        errors.append(f"丢失 {len(missing)} 条记录，例如: {sorted(missing)[:3]}")
+    if len(problems) != len(set(problems)):
+        errors.append(f"重复记录 {len(problems) - len(set(problems))} 条")
+
+    summary = scan_summary(content)
+    if f"- 记录总数: {summary['total_records']}" not in content:
+        errors.append(f"概览区记录总数与表格行数 {summary['total_records']} 不一致")
+
+    counters = load_counters(md_path)
+    if counters is not None and counters['summary'] != summary:
+        errors.append("sidecar 统计与表格不一致")
+
+    if record_store.is_enabled(storage_path):
+        with record_store.RecordStore.open(storage_path) as store:
+            # 日志模式的索引在读取时按渲染出的日文件同步
+            store.sync(storage_path, DATE, DATE)
+            indexed = store.aggregate(DATE, DATE)['total']
+        if indexed != len(expected):
+            errors.append(f"SQLite 索引中有 {indexed} 条记录，应为 {len(expected)}")
+    return errors
+
+
+def run(storage, processes, count, use_store):
+    with tempfile.TemporaryDirectory() as tmp:
+        storage_path = Path(tmp)
+        os.environ['CLAUDE_ANALYSIS_PATH'] = tmp
+        if use_store:
+            record_store.RecordStore.open(storage_path).close()
+
+        start_event = multiprocessing.Event()
+        workers = [multiprocessing.Process(target=worker, args=(w, count, storage, start_event))
+                   for w in range(processes)]
+        for p in workers:
+            p.start()
+        start = time.perf_counter()
+        start_event.set()
+        for p in workers:
+            p.join()
+        elapsed = time.perf_counter() - start
+
+        if storage == 'log':
+            render_day(DATE)
+        errors = check(storage_path, processes, count)
+        failed = [p.exitcode for p in workers if p.exitcode]
+        if failed:
+            errors.append(f"{len(failed)} 个写入进程异常退出")
+        return elapsed, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description='并行记录压力测试')
+    parser.add_argument('-p', '--processes', type=int, default=8, help='并行进程数')
+    parser.add_argument('-n', '--count', type=int, default=200, help='每个进程写入的记录数')
+    parser.add_argument('--store', action='store_true', help='同时启用 SQLite 索引')
+    args = parser.parse_args()
+
+    total = args.processes * args.count
+    print(f"{args.processes} 个进程 × {args.count} 条 = {total} 条记录写入同一天\n")
+    print(f"{'模式':<10} {'耗时(s)':>10} {'吞吐(条/s)':>12}  结果")
+    print('-' * 50)
+    ok = True
+    for storage in ('markdown', 'log'):
+        elapsed, errors = run(storage, args.processes, args.count, args.store)
+        ok = ok and not errors
+        print(f"{storage:<10} {elapsed:>10.2f} {total / elapsed:>12.0f}  {'通过' if not errors else '失败'}")
+        for error in errors:
+            print(f"    - {error}")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Keyword Matcher - 预编译的多模式关键词匹配器
+基于 Aho-Corasick 自动机，一次扫描即可找出所有关键词（中英文，不区分大小写）及其位置
+"""
+
+import re
+from collections import deque, namedtuple
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+# 单个匹配结果：start/end 为原始文本中的位置
+KeywordMatch = namedtuple('KeywordMatch', ['keyword', 'group', 'start', 'end'])
+
+
+class KeywordMatcher:
+    """多组关键词的 Aho-Corasick 自动机
+
+    groups 为 {分组名: 关键词列表}，匹配结果会标注命中的分组。
+    纯 Python 逐字符推进自动机远慢于 C 层扫描，因此先用关键词前缀树展开的正则
+    做预筛，只在候选位置附近推进自动机；自动机保证重叠的关键词也能全部报告。
+    """
+
+    def __init__(self, groups: Dict[str, Sequence[str]]):
+        self.groups = {name: list(keywords) for name, keywords in groups.items()}
+
+        # goto 表：states[i] 为 {字符: 下一状态}
+        states: List[Dict[str, int]] = [{}]
+        outputs: List[List[Tuple[str, str]]] = [[]]
+        seen = set()
+        for group, keywords in self.groups.items():
+            for keyword in keywords:
+                folded = keyword.lower()
+                if not folded or (folded, group) in seen:
+                    continue
+                seen.add((folded, group))
+                state = 0
+                for ch in folded:
+                    nxt = states[state].get(ch)
+                    if nxt is None:
+                        states.append({})
+                        outputs.append([])
+                        nxt = len(states) - 1
+                        states[state][ch] = nxt
+                    state = nxt
+                outputs[state].append((folded, group))
+
+        # BFS 计算失败指针，并把 goto 表补全为确定性转移表
+        fail = [0] * len(states)
+        delta: List[Dict[str, int]] = [dict(s) for s in states]
+        queue = deque(states[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in states[state].items():
+                queue.append(nxt)
+                fail[nxt] = delta[fail[state]].get(ch, 0) if state else 0
+                outputs[nxt] = outputs[nxt] + outputs[fail[nxt]]
+            for ch, nxt in delta[fail[state]].items():
+                delta[state].setdefault(ch, nxt)
+
+        self._delta = delta
+        self._outputs = [tuple(out) for out in outputs]
+
+        # 预筛正则：由关键词前缀树展开，交给 re 引擎在 C 层扫描
+        self._prefilter = _compile_trie({kw for out in outputs for kw, _ in out})
+        self._group_keywords = {
+            group: tuple(dict.fromkeys(kw.lower() for kw in keywords if kw))
+            for group, keywords in self.groups.items()
+        }
+
+    @staticmethod
+    def _fold(text: str):
+        """整段文本只转小写一次；长度变化时（少数 Unicode 字符）建立位置映射"""
+        folded = text.lower()
+        if len(folded) == len(text):
+            return folded, None
+        index = []
+        for i, ch in enumerate(text):
+            index.extend([i] * len(ch.lower()))
+        index.append(len(text))
+        return folded, index
+
+    def iter_matches(self, text: str) -> Iterator[KeywordMatch]:
+        """按结束位置顺序惰性产出所有匹配（包含重叠匹配）"""
+        if not text or self._prefilter is None:
+            return
+        folded, index = self._fold(text)
+        delta = self._delta
+        outputs = self._outputs
+        length = len(folded)
+        state = 0
+        pos = 0
+
+        for hit in self._prefilter.finditer(folded):
+            if hit.start() >= pos:
+                state = 0
+                pos = hit.start()
+            stop = hit.end()
+            # 推进到预筛命中结束，且自动机回到根状态（没有未完成的前缀）
+            while pos < length and (pos < stop or state):
+                state = delta[state].get(folded[pos], 0)
+                pos += 1
+                for keyword, group in outputs[state]:
+                    start = pos - len(keyword)
+                    if index is None:
+                        yield KeywordMatch(keyword, group, start, pos)
+                    else:
+                        yield KeywordMatch(keyword, group, index[start], index[pos])
+
+    def find_all(self, text: str) -> List[KeywordMatch]:
+        """返回所有匹配的关键词及位置"""
+        return list(self.iter_matches(text))
+
+    def contains(self, text: str, group: Optional[str] = None) -> bool:
+        """检查文本中是否包含（指定分组的）任一关键词"""
+        for match in self.iter_matches(text):
+            if group is None or match.group == group:
+                return True
+        return False
+
+    def first_match(self, text: str, priority: Sequence[str]) -> Optional[KeywordMatch]:
+        """按分组优先级返回命中结果（用于路由判断）
+
+        路由只需要知道"是否命中"，因此按优先级逐组查找，组内命中第一个关键词即返回，
+        不必扫描完整文本；子串查找由 str.find 在 C 层完成，文本只转小写一次。
+        """
+        if not text:
+            return None
+        folded, index = self._fold(text)
+        for group in priority:
+            for keyword in self._group_keywords.get(group, ()):
+                start = folded.find(keyword)
+                if start >= 0:
+                    end = start + len(keyword)
+                    if index is not None:
+                        start, end = index[start], index[end]
+                    return KeywordMatch(keyword, group, start, end)
+        return None
+
+
+def _compile_trie(keywords):
+    """把关键词集合编译为按前缀树展开的正则（同一起点优先匹配最长关键词）"""
+    if not keywords:
+        return None
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def emit(node):
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            body = '(?:' + body + ')?'
+        return body
+
+    return re.compile(emit(trie))
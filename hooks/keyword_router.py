@@ -7,7 +7,8 @@ Keyword Router - UserPromptSubmit Hook 处理脚本
 
 import json
 import sys
-import re
+
+from keyword_matcher import KeywordMatcher
 
 # 问题关键词配置
 PROBLEM_KEYWORDS = [
@@ -30,19 +31,49 @@ RESOLUTION_KEYWORDS = [
     "working now", "resolved", "it works", "perfect"
 ]
 
-def contains_keywords(text, keywords):
-    """检查文本中是否包含任一关键词（不区分大小写）"""
-    text_lower = text.lower()
-    for keyword in keywords:
-        if keyword.lower() in text_lower:
-            return True
-    return False
+# 预编译的关键词匹配器：覆盖解决信号与问题关键词。路由用 first_match 按分组优先级逐个关键词查找
+# （str.find 在 C 层完成，命中即返回）；find_all 由自动机一次扫描报告全部命中及位置
+MATCHER = KeywordMatcher({
+    "resolution": RESOLUTION_KEYWORDS,
+    "problem": PROBLEM_KEYWORDS,
+})
 
-def process_input():
-    """处理从 stdin 接收的 JSON 输入"""
+# 历史解决方案提示索引（build_hints.py 离线生成）的加载器，首次路由到 usage-observer 时创建
+_hints = None
+
+
+def get_hints():
+    """提示索引加载器：每个进程只加载一次索引，router_daemon 常驻时索引重新生成后自动重新加载
+
+    tracker_core（pathlib、pickle）在这里才导入，不路由到 usage-observer 的 prompt 不必付出导入开销。
+    """
+    global _hints
+    if _hints is None:
+        from pathlib import Path
+        # 与 skills 共用插件根目录下 tracker_core 包的存储目录与提示索引
+        sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+        from tracker_core.hints import HintLoader, get_hint_index_path
+        from tracker_core.paths import get_storage_path
+        _hints = HintLoader(lambda: get_hint_index_path(get_storage_path()))
+    return _hints
+
+
+def similar_solutions(user_input):
+    """相似的已解决问题；导入、加载或查询索引出错时返回空列表，提示永远不影响路由结果"""
+    try:
+        return get_hints().lookup(user_input)
+    except Exception:
+        return []
+
+
+def handle_request(raw):
+    """处理一次 hook 请求（原始 stdin 字节），返回 (输出 JSON, 退出码)
+
+    进程内路由与 router_daemon 共用此函数，保证两种模式输出一致。
+    """
     try:
-        # 读取 stdin (使用 UTF-8 编码)
-        input_data = sys.stdin.buffer.read().decode('utf-8')
+        # 解码输入 (使用 UTF-8 编码)
+        input_data = raw.decode('utf-8')
         data = json.loads(input_data)
 
         # 获取用户输入
@@ -55,48 +86,66 @@ def process_input():
             "actions": []
         }
 
-        # 优先检测解决信号
-        if contains_keywords(user_input, RESOLUTION_KEYWORDS):
+        # 优先检测解决信号，其次问题关键词
+        match = MATCHER.first_match(user_input, ("resolution", "problem"))
+        matched = None
+        if match:
+            matched = {"keyword": match.keyword, "start": match.start, "end": match.end}
+
+        if match and match.group == "resolution":
             result["actions"].append({
                 "type": "invoke_skill",
                 "skill": "usage-analytics:usage-resolver",
                 "params": {
                     "user_input": user_input,
                     "session_id": session_id,
-                    "trigger_type": "resolution"
+                    "trigger_type": "resolution",
+                    "matched_keyword": matched
                 }
             })
 
         # 检测问题关键词
-        elif contains_keywords(user_input, PROBLEM_KEYWORDS):
+        elif match and match.group == "problem":
             result["actions"].append({
                 "type": "invoke_skill",
                 "skill": "usage-analytics:usage-observer",
                 "params": {
                     "user_input": user_input,
                     "session_id": session_id,
-                    "trigger_type": "problem"
+                    "trigger_type": "problem",
+                    "matched_keyword": matched,
+                    # 相似的已解决问题及其解决方案（没有索引或没有相似问题时为空列表）
+                    "similar_solutions": similar_solutions(user_input)
                 }
             })
 
-        # 输出结果
-        print(json.dumps(result, ensure_ascii=False))
-        return 0
+        return json.dumps(result, ensure_ascii=False), 0
 
     except json.JSONDecodeError as e:
         error_result = {
             "decision": "continue",
             "error": f"Invalid JSON input: {str(e)}"
         }
-        print(json.dumps(error_result, ensure_ascii=False))
-        return 1
+        return json.dumps(error_result, ensure_ascii=False), 1
     except Exception as e:
         error_result = {
             "decision": "continue",
             "error": str(e)
         }
-        print(json.dumps(error_result, ensure_ascii=False))
+        return json.dumps(error_result, ensure_ascii=False), 1
+
+def process_input():
+    """处理从 stdin 接收的 JSON 输入"""
+    try:
+        # 读取 stdin
+        raw = sys.stdin.buffer.read()
+    except Exception as e:
+        print(json.dumps({"decision": "continue", "error": str(e)}, ensure_ascii=False))
         return 1
 
+    output, code = handle_request(raw)
+    print(output)
+    return code
+
 if __name__ == "__main__":
     sys.exit(process_input())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Router Client - UserPromptSubmit Hook 入口
+轻量 shim：把 stdin 转发给常驻的 router_daemon；守护进程未运行时回退到进程内路由
+"""
+
+import os
+import sys
+
+# 使用 C 层的 _socket：完整的 socket 模块会连带导入 enum/selectors，启动开销是 shim 的数倍
+import _socket
+
+# 等待守护进程响应的上限（秒），超时后回退到进程内路由
+TIMEOUT = 2.0
+
+
+def get_socket_path():
+    """获取守护进程 socket 路径"""
+    custom_path = os.environ.get('CLAUDE_ROUTER_SOCKET')
+    if custom_path:
+        return custom_path
+    return os.path.join(os.path.expanduser('~'), '.claude', 'claude-analysis', 'router.sock')
+
+
+def query_daemon(raw, socket_path=None):
+    """把原始请求发送给守护进程，返回 (输出 JSON, 退出码)；守护进程不可用时返回 None"""
+    if not hasattr(_socket, 'AF_UNIX'):
+        return None
+
+    chunks = []
+    sock = _socket.socket(_socket.AF_UNIX, _socket.SOCK_STREAM)
+    try:
+        sock.settimeout(TIMEOUT)
+        sock.connect(socket_path or get_socket_path())
+        sock.sendall(raw)
+        sock.shutdown(_socket.SHUT_WR)
+        while True:
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+    except OSError:
+        return None
+    finally:
+        sock.close()
+
+    # 响应格式: "<退出码>\n<输出 JSON>"
+    code, sep, output = b''.join(chunks).partition(b'\n')
+    if not sep or not code.isdigit():
+        return None
+    return output.decode('utf-8'), int(code)
+
+
+def main():
+    raw = sys.stdin.buffer.read()
+
+    response = query_daemon(raw)
+    if response is None:
+        # 守护进程未运行：进程内路由
+        from keyword_router import handle_request
+        response = handle_request(raw)
+
+    output, code = response
+    print(output)
+    return code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Router Daemon - 常驻的关键词路由守护进程（可选）
+关键词自动机常驻内存，通过本地 Unix socket 为 router_client 提供路由，
+省去每次 prompt 的解释器启动与模块导入
+"""
+
+import argparse
+import os
+import signal
+import socket
+import socketserver
+import sys
+
+from keyword_router import get_hints, handle_request
+from router_client import get_socket_path
+
+
+class RouterHandler(socketserver.StreamRequestHandler):
+    """单次路由请求：读取到 EOF，返回 "<退出码>\\n<输出 JSON>" """
+
+    def handle(self):
+        raw = self.rfile.read()
+        output, code = handle_request(raw)
+        self.wfile.write(f'{code}\n'.encode('ascii') + output.encode('utf-8'))
+
+
+class RouterServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+def get_pid_path(socket_path):
+    """获取 pid 文件路径（与 socket 同目录）"""
+    return os.path.splitext(socket_path)[0] + '.pid'
+
+
+def is_running(socket_path):
+    """检查 socket 上是否有守护进程在监听"""
+    if not hasattr(socket, 'AF_UNIX') or not os.path.exists(socket_path):
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(0.5)
+            sock.connect(socket_path)
+        return True
+    except OSError:
+        return False
+
+
+def serve(socket_path, idle_timeout=0):
+    """启动守护进程（前台运行）"""
+    if not hasattr(socket, 'AF_UNIX'):
+        print("错误: 当前平台不支持 Unix socket，hook 将使用进程内路由", file=sys.stderr)
+        return 1
+
+    if is_running(socket_path):
+        print(f"守护进程已在运行: {socket_path}")
+        return 0
+
+    # 清理上次异常退出残留的 socket 文件
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+    os.makedirs(os.path.dirname(socket_path) or '.', exist_ok=True)
+
+    pid_path = get_pid_path(socket_path)
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    # 启动时预先加载提示索引，首个路由到 usage-observer 的请求不必等待加载；加载失败时查询会返回空提示
+    try:
+        get_hints().get()
+    except Exception:
+        pass
+
+    server = RouterServer(socket_path, RouterHandler)
+    try:
+        os.chmod(socket_path, 0o600)
+        with open(pid_path, 'w', encoding='utf-8') as f:
+            f.write(str(os.getpid()))
+
+        print(f"[OK] 路由守护进程已启动: {socket_path} (pid {os.getpid()})")
+        sys.stdout.flush()
+
+        if idle_timeout > 0:
+            # 空闲超时后自动退出
+            server.timeout = idle_timeout
+            idle = []
+            server.handle_timeout = lambda: idle.append(True)
+            while not idle:
+                server.handle_request()
+        else:
+            server.serve_forever()
+    finally:
+        server.server_close()
+        for path in (socket_path, pid_path):
+            if os.path.exists(path):
+                os.unlink(path)
+
+    return 0
+
+
+def stop(socket_path):
+    """停止守护进程"""
+    pid_path = get_pid_path(socket_path)
+    if not os.path.exists(pid_path):
+        print("守护进程未运行")
+        return 1
+
+    with open(pid_path, encoding='utf-8') as f:
+        pid = int(f.read().strip() or 0)
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except (OSError, ValueError):
+        os.unlink(pid_path)
+        print("守护进程未运行（已清理 pid 文件）")
+        return 1
+
+    print(f"[OK] 已停止守护进程 (pid {pid})")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='关键词路由守护进程',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  # 后台启动（hook 会自动通过 router_client.py 使用守护进程）
+  python hooks/router_daemon.py &
+
+  # 空闲 8 小时后自动退出
+  python hooks/router_daemon.py --idle-timeout 28800
+
+  # 查看状态 / 停止
+  python hooks/router_daemon.py --status
+  python hooks/router_daemon.py --stop
+        """
+    )
+    parser.add_argument('--socket', help='socket 路径（默认 ~/.claude/claude-analysis/router.sock）')
+    parser.add_argument('--idle-timeout', type=float, default=0,
+                        help='空闲多少秒后自动退出（默认不退出）')
+    parser.add_argument('--status', action='store_true', help='查看守护进程状态')
+    parser.add_argument('--stop', action='store_true', help='停止守护进程')
+
+    args = parser.parse_args()
+    socket_path = args.socket or get_socket_path()
+
+    if args.status:
+        running = is_running(socket_path)
+        print(f"守护进程{'运行中' if running else '未运行'}: {socket_path}")
+        return 0 if running else 1
+
+    if args.stop:
+        return stop(socket_path)
+
+    return serve(socket_path, args.idle_timeout)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,35 +5,333 @@ State Manager - 管理问题追踪状态
 持久化存储活动问题，支持跨 Hook 调用
 """
 
+import heapq
 import json
+import os
 import sys
-from datetime import datetime
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
+
+# 与 skills 共用插件根目录下 tracker_core 包的存储目录与文件锁
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from tracker_core.locks import file_lock  # noqa: E402
+from tracker_core.paths import get_storage_path  # noqa: E402
+
+# 日志累计到这么多条操作后合并进快照
+COMPACT_THRESHOLD = 200
+
+# 活动问题与会话历史的默认保留时长
+DEFAULT_MAX_AGE_HOURS = 24
 
 
 def get_state_path() -> Path:
     """获取状态文件路径"""
-    storage_path = Path.home() / '.claude' / 'claude-analysis'
+    storage_path = get_storage_path()
     storage_path.mkdir(parents=True, exist_ok=True)
     return storage_path / 'tracking_state.json'
 
 
+def get_archive_path(state_path: Path, when: datetime) -> Path:
+    """过期条目的归档文件（按月一个 JSONL）"""
+    return state_path.parent / 'archive' / f"tracking-{when.strftime('%Y-%m')}.jsonl"
+
+
+class StateStore:
+    """带索引的追踪状态存储
+
+    tracking_state.json 是快照（紧凑 JSON，结构与旧版相同），之后的修改作为操作追加到
+    tracking_state.journal，每次修改只追加几行；日志累计到 COMPACT_THRESHOLD 条后原子地
+    重写快照并清空日志。内存中按问题 id 和会话建立索引，查找、解决均为 O(1)。
+    所有读写都在 tracking_state.lock 文件锁内进行，并发的 Hook 调用不会丢失更新。
+
+    每次修改事务提交前都会淘汰超过 max_age_hours 的活动问题和不再活跃的会话历史：按开始时间
+    （ISO 字符串可直接比较，无需逐条解析）建最小堆，每淘汰一条 O(log n)；淘汰的条目追加到
+    archive/ 下按月的归档文件，状态文件大小和加载时间保持有界。
+    """
+
+    def __init__(self, state_path: Optional[Path] = None,
+                 max_age_hours: float = DEFAULT_MAX_AGE_HOURS):
+        self.state_path = state_path or get_state_path()
+        self.journal_path = self.state_path.with_suffix('.journal')
+        self.lock_path = self.state_path.with_suffix('.lock')
+        self.problems: Dict[str, Dict[str, Any]] = {}
+        self.by_session: Dict[str, Dict[str, None]] = {}
+        self.session_history: Dict[str, Dict[str, None]] = {}
+        self.session_last_active: Dict[str, str] = {}
+        self.max_age_hours = max_age_hours
+        self.problem_heap: Optional[List[tuple]] = None
+        self.session_heap: Optional[List[tuple]] = None
+        self.journal_ops = 0
+        self.pending: List[Dict[str, Any]] = []
+        # 待写入的归档条目（按归档文件分组），提交成功后才写入
+        self.pending_archive: Dict[Path, List[Dict[str, Any]]] = {}
+        self.rewrite = False
+
+    # ---- 加载 ----
+
+    @classmethod
+    @contextmanager
+    def transaction(cls, state_path: Optional[Path] = None,
+                    max_age_hours: float = DEFAULT_MAX_AGE_HOURS) -> Iterator['StateStore']:
+        """批量修改：一次加锁、一次加载，提交前淘汰过期条目，所有操作最后一次性追加到日志
+
+        淘汰放在事务体之后：解决一个已超过保留时长的问题时，问题仍在状态中，能正常算出耗时。
+        """
+        store = cls(state_path, max_age_hours)
+        with file_lock(store.lock_path):
+            store.load()
+            yield store
+            store.expire()
+            store.commit()
+
+    @classmethod
+    def read(cls, state_path: Optional[Path] = None) -> 'StateStore':
+        """只读加载（共享锁内读取快照和日志）"""
+        store = cls(state_path)
+        with file_lock(store.lock_path, shared=True):
+            store.load()
+        return store
+
+    def load(self) -> None:
+        """读取快照并重放日志"""
+        state = {}
+        if self.state_path.exists():
+            try:
+                state = json.loads(self.state_path.read_text(encoding='utf-8'))
+            except json.JSONDecodeError:
+                state = {}
+        self._reset(state)
+
+        if self.journal_path.exists():
+            with open(self.journal_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        op = json.loads(line)
+                    except json.JSONDecodeError:
+                        # 写入中断产生的残缺行
+                        continue
+                    self._apply(op)
+                    self.journal_ops += 1
+
+    def _reset(self, state: Dict[str, Any]) -> None:
+        self.problems = {}
+        self.by_session = {}
+        self.session_history = {
+            session_id: dict.fromkeys(ids)
+            for session_id, ids in state.get("session_history", {}).items()
+        }
+        self.session_last_active = dict.fromkeys(self.session_history, '')
+        self.session_last_active.update(state.get("session_last_active", {}))
+        self.problem_heap = self.session_heap = None
+        for problem in state.get("active_problems", []):
+            self._index(problem)
+            self._touch(problem["session_id"], problem["start_time"])
+
+    def _index(self, problem: Dict[str, Any]) -> None:
+        self.problems[problem["id"]] = problem
+        self.by_session.setdefault(problem["session_id"], {})[problem["id"]] = None
+        if self.problem_heap is not None:
+            heapq.heappush(self.problem_heap, (problem["start_time"], problem["id"]))
+
+    def _touch(self, session_id: str, when: str) -> None:
+        """更新会话最近活跃时间"""
+        if when > self.session_last_active.get(session_id, ''):
+            self.session_last_active[session_id] = when
+            if self.session_heap is not None:
+                heapq.heappush(self.session_heap, (when, session_id))
+
+    def _unindex(self, problem_id: str) -> Optional[Dict[str, Any]]:
+        problem = self.problems.pop(problem_id, None)
+        if problem is not None:
+            session = self.by_session.get(problem["session_id"])
+            if session is not None:
+                session.pop(problem_id, None)
+                if not session:
+                    del self.by_session[problem["session_id"]]
+        return problem
+
+    def _apply(self, op: Dict[str, Any]) -> None:
+        """执行一条操作；操作是幂等的，重复重放不会改变结果"""
+        if op["op"] == "add":
+            problem = op["problem"]
+            self._index(problem)
+            self.session_history.setdefault(problem["session_id"], {})[problem["id"]] = None
+            self._touch(problem["session_id"], problem["start_time"])
+        elif op["op"] == "remove":
+            for problem_id in op["ids"]:
+                self._unindex(problem_id)
+        elif op["op"] == "forget":
+            for session_id in op["sessions"]:
+                self.session_history.pop(session_id, None)
+                self.session_last_active.pop(session_id, None)
+
+    def _record(self, op: Dict[str, Any]) -> None:
+        self._apply(op)
+        self.pending.append(op)
+
+    # ---- 查询 ----
+
+    def get(self, problem_id: str) -> Optional[Dict[str, Any]]:
+        return self.problems.get(problem_id)
+
+    def active(self, session_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """活动问题，按添加顺序"""
+        if session_id:
+            return [self.problems[i] for i in self.by_session.get(session_id, ())]
+        return list(self.problems.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "active_problems": list(self.problems.values()),
+            "session_history": {s: list(ids) for s, ids in self.session_history.items()},
+            "session_last_active": self.session_last_active
+        }
+
+    # ---- 修改 ----
+
+    def add(self, problem_entry: Dict[str, Any]) -> str:
+        """添加活动问题，id 与已有问题冲突（同一秒内创建）时追加序号，返回最终 id"""
+        problem_id = base_id = problem_entry["id"]
+        history = self.session_history.get(problem_entry["session_id"], {})
+        n = 1
+        while problem_id in self.problems or problem_id in history:
+            n += 1
+            problem_id = f"{base_id}_{n}"
+        problem_entry["id"] = problem_id
+        self._record({"op": "add", "problem": problem_entry})
+        return problem_id
+
+    def remove(self, problem_ids: List[str]) -> None:
+        ids = [i for i in problem_ids if i in self.problems]
+        if ids:
+            self._record({"op": "remove", "ids": ids})
+
+    def resolve(self, problem_id: str, solution: str = "") -> Optional[Dict[str, Any]]:
+        """解决问题并计算耗时"""
+        problem = self.problems.get(problem_id)
+        if problem is None:
+            return None
+
+        start_time = datetime.fromisoformat(problem["start_time"])
+        end_time = datetime.now()
+
+        resolved_problem = problem.copy()
+        resolved_problem["end_time"] = end_time.isoformat()
+        resolved_problem["elapsed_minutes"] = int((end_time - start_time).total_seconds() / 60)
+        resolved_problem["solution"] = solution
+        resolved_problem["status"] = "resolved"
+
+        self.remove([problem_id])
+        return resolved_problem
+
+    def replace(self, state: Dict[str, Any]) -> None:
+        """整体替换状态（下次提交时重写快照）"""
+        self._reset(state)
+        self.pending = []
+        self.pending_archive = {}
+        self.rewrite = True
+
+    # ---- 过期淘汰 ----
+
+    def expire(self, max_age_hours: Optional[float] = None,
+               now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """淘汰开始时间早于 max_age_hours 的活动问题，以及没有活动问题且不再活跃的会话历史
+
+        淘汰的条目在提交成功后追加到归档文件，返回淘汰的活动问题。
+        """
+        now = now or datetime.now()
+        hours = self.max_age_hours if max_age_hours is None else max_age_hours
+        cutoff = (now - timedelta(hours=hours)).isoformat()
+
+        # 堆在首次淘汰时建立，之后随添加操作维护；已被移除的条目在弹出时跳过
+        if self.problem_heap is None:
+            self.problem_heap = [(p["start_time"], i) for i, p in self.problems.items()]
+            heapq.heapify(self.problem_heap)
+        if self.session_heap is None:
+            self.session_heap = [(t, s) for s, t in self.session_last_active.items()]
+            heapq.heapify(self.session_heap)
+
+        expired = []
+        while self.problem_heap and self.problem_heap[0][0] < cutoff:
+            start_time, problem_id = heapq.heappop(self.problem_heap)
+            problem = self.problems.get(problem_id)
+            if problem is not None and problem["start_time"] == start_time:
+                expired.append(problem)
+        if expired:
+            self.remove([p["id"] for p in expired])
+
+        stale_sessions = []
+        while self.session_heap and self.session_heap[0][0] < cutoff:
+            last_active, session_id = heapq.heappop(self.session_heap)
+            if (self.session_last_active.get(session_id) == last_active
+                    and session_id not in self.by_session):
+                stale_sessions.append(session_id)
+
+        archived = [dict(p, status="expired", expired_at=now.isoformat()) for p in expired]
+        archived += [
+            {"session_id": s, "problem_ids": list(self.session_history.get(s, ())),
+             "last_active": self.session_last_active.get(s, ''), "expired_at": now.isoformat()}
+            for s in stale_sessions
+        ]
+        if archived:
+            self._archive(archived, now)
+        if stale_sessions:
+            self._record({"op": "forget", "sessions": stale_sessions})
+        return expired
+
+    def _archive(self, entries: List[Dict[str, Any]], now: datetime) -> None:
+        self.pending_archive.setdefault(get_archive_path(self.state_path, now), []).extend(entries)
+
+    def _flush_archive(self) -> None:
+        """写入排队的归档条目（状态已提交，归档中不会出现仍在状态里的条目）"""
+        for archive_path, entries in self.pending_archive.items():
+            archive_path.parent.mkdir(parents=True, exist_ok=True)
+            data = ''.join(json.dumps(e, ensure_ascii=False) + '\n' for e in entries)
+            with open(archive_path, 'ab') as f:
+                f.write(data.encode('utf-8'))
+        self.pending_archive = {}
+
+    # ---- 持久化 ----
+
+    def commit(self) -> None:
+        """把本次的操作追加到日志；日志过长或整体替换过时重写快照"""
+        if self.rewrite or self.journal_ops + len(self.pending) > COMPACT_THRESHOLD:
+            self.compact()
+        elif self.pending:
+            data = ''.join(json.dumps(op, ensure_ascii=False) + '\n' for op in self.pending)
+            with open(self.journal_path, 'ab') as f:
+                f.write(data.encode('utf-8'))
+            self.journal_ops += len(self.pending)
+        self.pending = []
+        self._flush_archive()
+
+    def compact(self) -> None:
+        """原子地重写快照并清空日志"""
+        tmp_path = self.state_path.with_name(f'{self.state_path.name}.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.state_path)
+        # 快照已包含日志内容；日志中的操作幂等，即使这里中断，重放也不会出错
+        with open(self.journal_path, 'wb'):
+            pass
+        self.journal_ops = 0
+        self.rewrite = False
+
+
 def load_state() -> Dict[str, Any]:
     """加载当前状态"""
-    state_file = get_state_path()
-    if state_file.exists():
-        try:
-            return json.loads(state_file.read_text(encoding='utf-8'))
-        except json.JSONDecodeError:
-            return {"active_problems": [], "session_history": {}}
-    return {"active_problems": [], "session_history": {}}
+    return StateStore.read().to_dict()
 
 
 def save_state(state: Dict[str, Any]) -> None:
-    """保存状态"""
-    state_file = get_state_path()
-    state_file.write_text(json.dumps(state, ensure_ascii=False, indent=2), encoding='utf-8')
+    """保存状态（整体重写快照）"""
+    with StateStore.transaction() as store:
+        store.replace(state)
 
 
 def create_problem_entry(
@@ -58,68 +356,25 @@ def create_problem_entry(
 
 def add_active_problem(problem_entry: Dict[str, Any]) -> None:
     """添加活动问题"""
-    state = load_state()
-    state["active_problems"].append(problem_entry)
-
-    # 更新会话历史
-    session_id = problem_entry["session_id"]
-    if session_id not in state["session_history"]:
-        state["session_history"][session_id] = []
-    state["session_history"][session_id].append(problem_entry["id"])
-
-    save_state(state)
+    with StateStore.transaction() as store:
+        store.add(problem_entry)
 
 
 def get_active_problems(session_id: Optional[str] = None) -> List[Dict[str, Any]]:
     """获取活动问题"""
-    state = load_state()
-    if session_id:
-        return [p for p in state["active_problems"] if p["session_id"] == session_id]
-    return state["active_problems"]
+    return StateStore.read().active(session_id)
 
 
 def resolve_problem(problem_id: str, solution: str = "") -> Optional[Dict[str, Any]]:
     """解决问题并计算耗时"""
-    state = load_state()
-
-    for i, problem in enumerate(state["active_problems"]):
-        if problem["id"] == problem_id:
-            # 计算耗时
-            start_time = datetime.fromisoformat(problem["start_time"])
-            end_time = datetime.now()
-            elapsed_minutes = int((end_time - start_time).total_seconds() / 60)
-
-            # 更新问题状态
-            resolved_problem = problem.copy()
-            resolved_problem["end_time"] = end_time.isoformat()
-            resolved_problem["elapsed_minutes"] = elapsed_minutes
-            resolved_problem["solution"] = solution
-            resolved_problem["status"] = "resolved"
-
-            # 从活动列表移除
-            state["active_problems"].pop(i)
-            save_state(state)
-
-            return resolved_problem
-
-    return None
-
-
-def cleanup_old_problems(max_age_hours: int = 24) -> None:
-    """清理过期的活动问题（避免内存泄漏）"""
-    state = load_state()
-    current_time = datetime.now()
-
-    active_problems = []
-    for problem in state["active_problems"]:
-        start_time = datetime.fromisoformat(problem["start_time"])
-        age_hours = (current_time - start_time).total_seconds() / 3600
+    with StateStore.transaction() as store:
+        return store.resolve(problem_id, solution)
 
-        if age_hours < max_age_hours:
-            active_problems.append(problem)
 
-    state["active_problems"] = active_problems
-    save_state(state)
+def cleanup_old_problems(max_age_hours: int = DEFAULT_MAX_AGE_HOURS) -> None:
+    """淘汰过期的活动问题和会话历史（移入归档；修改操作也会自动淘汰）"""
+    with StateStore.transaction(max_age_hours=max_age_hours):
+        pass
 
 
 if __name__ == "__main__":
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Claude Session Tracker - 预聚合汇总构建
+为日文件生成日汇总，并组合为 ISO 周、月、季度汇总（summary/）；
+已有汇总只在组成它的日文件改动后重新计算，view_records.py --summary 读取这些汇总
+"""
+
+import argparse
+import shutil
+import sys
+from datetime import date
+from pathlib import Path
+
+# 共用插件根目录下的 tracker_core 包
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from tracker_core.cli import parse_date_arg  # noqa: E402
+from tracker_core.history import iter_day_files  # noqa: E402
+from tracker_core.paths import get_storage_path  # noqa: E402
+from tracker_core.rollup import PERIODS, Rollups, get_summary_dir, iter_period_keys  # noqa: E402
+
+PERIOD_NAMES = {'week': '周', 'month': '月', 'quarter': '季度'}
+
+
+def build_rollups(storage_path, start_date=None, end_date=None):
+    """构建范围内所有周期的汇总，返回 (Rollups, {周期: [(名称, 汇总)]})"""
+    rollups = Rollups(storage_path)
+    day_files = list(iter_day_files(storage_path, start_date, end_date))
+    if not day_files:
+        return rollups, {}
+
+    first = date.fromisoformat(day_files[0].stem)
+    last = date.fromisoformat(day_files[-1].stem)
+    for md_file in day_files:
+        rollups.day(md_file)
+    results = {
+        period: [(key, rollups.period(period, key)) for key in iter_period_keys(period, first, last)]
+        for period in PERIODS
+    }
+    return rollups, results
+
+
+def display_periods(period, rows):
+    """按周期列出记录数、耗时和解决率"""
+    print(f"\n{PERIOD_NAMES[period]}汇总:")
+    print(f"  {'周期':<10} {'记录数':>6} {'耗时(分钟)':>10} {'已解决':>6} {'解决率':>7}")
+    print('  ' + '-' * 46)
+    for key, aggregate in rows:
+        total = aggregate['total']
+        resolved = sum(aggregate['date_resolved'].values())
+        rate = f"{resolved / total * 100:.1f}%" if total else '-'
+        print(f"  {key:<10} {total:>6} {aggregate['total_time']:>10} {resolved:>6} {rate:>7}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='构建日、周、月、季度预聚合汇总',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  # 构建/更新全部汇总（只重新计算改动过的日文件）
+  python build_rollups.py
+
+  # 只处理指定范围，并列出各月汇总
+  python build_rollups.py --from 2024-01-01 --to 2024-06-30 --show month
+
+  # 删除已有汇总后全部重新构建
+  python build_rollups.py --rebuild
+        """
+    )
+    parser.add_argument('--from', dest='from_date', type=parse_date_arg, help='起始日期 (YYYY-MM-DD，含)')
+    parser.add_argument('--to', dest='to_date', type=parse_date_arg, help='结束日期 (YYYY-MM-DD，含)')
+    parser.add_argument('--show', choices=PERIODS, help='列出该周期的汇总')
+    parser.add_argument('--rebuild', action='store_true', help='删除已有汇总后重新构建')
+
+    args = parser.parse_args()
+    storage_path = get_storage_path()
+
+    if not storage_path.exists():
+        print(f"存储目录不存在: {storage_path}")
+        return 1
+
+    summary_dir = get_summary_dir(storage_path)
+    if args.rebuild and summary_dir.is_dir():
+        shutil.rmtree(summary_dir)
+
+    rollups, results = build_rollups(storage_path, args.from_date, args.to_date)
+    if not results:
+        print("没有找到日文件")
+        return 0
+
+    print(f"[OK] 汇总已更新：重新解析 {rollups.days_parsed} 个日文件，"
+          f"重新组合 {rollups.periods_composed} 个周期汇总")
+    print(f"     目录: {summary_dir}")
+
+    if args.show:
+        display_periods(args.show, results[args.show])
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -6,296 +6,94 @@ Markdown to HTML Converter - 将分析报告从 Markdown 转换为 HTML
 """
 
 import argparse
+import json
 import os
+import re
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 
+# 共用插件根目录下 tracker_core 包的存储目录配置（--batch 的默认目录）
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
 
-# HTML 模板
-HTML_TEMPLATE = """<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-    <style>
-        :root {{
-            --primary-color: #2563eb;
-            --secondary-color: #64748b;
-            --success-color: #10b981;
-            --warning-color: #f59e0b;
-            --danger-color: #ef4444;
-            --bg-color: #f8fafc;
-            --card-bg: #ffffff;
-            --text-primary: #1e293b;
-            --text-secondary: #64748b;
-            --border-color: #e2e8f0;
-        }}
-
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
-            background-color: var(--bg-color);
-            color: var(--text-primary);
-            line-height: 1.6;
-            padding: 20px;
-        }}
-
-        .container {{
-            max-width: 1200px;
-            margin: 0 auto;
-        }}
-
-        .header {{
-            background: linear-gradient(135deg, var(--primary-color), #3b82f6);
-            color: white;
-            padding: 40px;
-            border-radius: 12px;
-            margin-bottom: 30px;
-            box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
-        }}
-
-        .header h1 {{
-            font-size: 2.5em;
-            margin-bottom: 10px;
-        }}
-
-        .header .meta {{
-            opacity: 0.9;
-            font-size: 1.1em;
-        }}
-
-        .card {{
-            background: var(--card-bg);
-            border-radius: 12px;
-            padding: 24px;
-            margin-bottom: 20px;
-            box-shadow: 0 1px 3px rgba(0, 0, 0, 0.1);
-            border: 1px solid var(--border-color);
-        }}
-
-        .card h2 {{
-            color: var(--primary-color);
-            border-bottom: 2px solid var(--border-color);
-            padding-bottom: 10px;
-            margin-bottom: 20px;
-        }}
-
-        .card h3 {{
-            color: var(--text-primary);
-            margin: 20px 0 10px 0;
-        }}
-
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin: 20px 0;
-        }}
-
-        th, td {{
-            padding: 12px;
-            text-align: left;
-            border-bottom: 1px solid var(--border-color);
-        }}
-
-        th {{
-            background-color: var(--bg-color);
-            font-weight: 600;
-            color: var(--text-secondary);
-            text-transform: uppercase;
-            font-size: 0.85em;
-            letter-spacing: 0.5px;
-        }}
-
-        tr:hover {{
-            background-color: var(--bg-color);
-        }}
-
-        .metric-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            margin: 20px 0;
-        }}
-
-        .metric-card {{
-            background: linear-gradient(135deg, #f0f9ff, #e0f2fe);
-            padding: 20px;
-            border-radius: 8px;
-            text-align: center;
-        }}
-
-        .metric-value {{
-            font-size: 2em;
-            font-weight: bold;
-            color: var(--primary-color);
-        }}
-
-        .metric-label {{
-            color: var(--text-secondary);
-            font-size: 0.9em;
-            margin-top: 5px;
-        }}
-
-        .badge {{
-            display: inline-block;
-            padding: 4px 12px;
-            border-radius: 20px;
-            font-size: 0.85em;
-            font-weight: 500;
-        }}
-
-        .badge-success {{
-            background-color: #d1fae5;
-            color: #065f46;
-        }}
-
-        .badge-warning {{
-            background-color: #fef3c7;
-            color: #92400e;
-        }}
-
-        .badge-danger {{
-            background-color: #fee2e2;
-            color: #991b1b;
-        }}
-
-        pre {{
-            background-color: #1e293b;
-            color: #e2e8f0;
-            padding: 16px;
-            border-radius: 8px;
-            overflow-x: auto;
-            font-family: "Consolas", "Monaco", "Courier New", monospace;
-        }}
-
-        code {{
-            background-color: #f1f5f9;
-            padding: 2px 6px;
-            border-radius: 4px;
-            font-family: "Consolas", "Monaco", "Courier New", monospace;
-            font-size: 0.9em;
-        }}
-
-        blockquote {{
-            border-left: 4px solid var(--primary-color);
-            background-color: #f8fafc;
-            padding: 16px 20px;
-            margin: 20px 0;
-            border-radius: 0 8px 8px 0;
-        }}
-
-        ul, ol {{
-            margin: 15px 0;
-            padding-left: 30px;
-        }}
-
-        li {{
-            margin: 8px 0;
-        }}
-
-        a {{
-            color: var(--primary-color);
-            text-decoration: none;
-        }}
-
-        a:hover {{
-            text-decoration: underline;
-        }}
-
-        .footer {{
-            text-align: center;
-            padding: 40px;
-            color: var(--text-secondary);
-            font-size: 0.9em;
-        }}
-
-        .chart-bar {{
-            display: flex;
-            align-items: center;
-            margin: 10px 0;
-        }}
-
-        .chart-label {{
-            width: 120px;
-            font-size: 0.9em;
-        }}
-
-        .chart-progress {{
-            flex: 1;
-            height: 24px;
-            background-color: var(--bg-color);
-            border-radius: 12px;
-            overflow: hidden;
-        }}
-
-        .chart-fill {{
-            height: 100%;
-            background: linear-gradient(90deg, var(--primary-color), #60a5fa);
-            border-radius: 12px;
-            transition: width 0.3s ease;
-        }}
-
-        .chart-value {{
-            width: 60px;
-            text-align: right;
-            font-weight: 600;
-            color: var(--text-secondary);
-        }}
-
-        @media print {{
-            body {{
-                background: white;
-            }}
-            .card {{
-                break-inside: avoid;
-            }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        {content}
-        <div class="footer">
-            <p>Generated by Claude Usage Analysis Plugin</p>
-            <p>{timestamp}</p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+from tracker_core.paths import get_storage_path  # noqa: E402
 
 
-def parse_markdown_simple(md_content):
-    """简单的 Markdown 解析器"""
-    lines = md_content.split('\n')
-    html_lines = []
+# HTML 模板（assets/report_template.html，首次转换时才读取）
+TEMPLATE_PATH = Path(__file__).resolve().parent.parent / 'assets' / 'report_template.html'
+_html_template = None
+
+# 批量转换清单（输出目录下），记录每个 Markdown 文件转换时的大小、修改时间和内容哈希
+MANIFEST_NAME = '.manifest.json'
+
+# 转换结果格式变化时递增，使旧清单失效、全部重新转换
+MANIFEST_VERSION = 1
+
+# 行内格式：转义、行内代码、粗体、斜体合成一个正则，每行只扫描一遍
+# 粗体、斜体的内容中，行内代码和转义字符作为整体，其中的 * 或 _ 不会被当作闭合符号；
+# 每个字符只有一种匹配方式，匹配失败时不会指数回溯
+STAR_CONTENT = r'(?:[^*`\\]|\\.|`[^`]+`|`(?![^`]+`))'
+UNDERSCORE_CONTENT = r'(?:[^_`\\]|\\.|`[^`]+`|`(?![^`]+`))'
+
+# 粗体内部可以包含完整的同符号斜体（**a *b* c**），斜体内部可以包含完整的同符号粗体（*a **b** c*），
+# 斜体的闭合符号不能是粗体的开头
+INLINE_TOKEN = re.compile(
+    r'\\([\\`*_])'
+    r'|`([^`]+)`'
+    rf'|\*\*(?!\*)((?:{STAR_CONTENT}|\*{STAR_CONTENT}+\*)+)\*\*'
+    rf'|__(?!_)((?:{UNDERSCORE_CONTENT}|_{UNDERSCORE_CONTENT}+_)+)__'
+    rf'|\*((?:{STAR_CONTENT}|\*\*{STAR_CONTENT}+\*\*)+)\*(?!\*{STAR_CONTENT}+\*\*)'
+    rf'|_((?:{UNDERSCORE_CONTENT}|__{UNDERSCORE_CONTENT}+__)+)_(?!_{UNDERSCORE_CONTENT}+__)'
+)
+
+# 行内格式标记字符，不含这些字符的行直接返回
+INLINE_MARKERS = frozenset('\\`*_')
+
+
+def load_html_template():
+    """读取并缓存 HTML 模板，按 $content 拆为页头和页尾两个 Template（$title、$timestamp 占位）"""
+    global _html_template
+    if _html_template is None:
+        from string import Template
+
+        head, tail = TEMPLATE_PATH.read_text(encoding='utf-8').split('$content', 1)
+        _html_template = Template(head), Template(tail)
+    return _html_template
+
+
+def iter_html_lines(lines):
+    """简单的 Markdown 解析器：逐行读入 Markdown，逐行产出 HTML（生成器）
+
+    只保留当前所在的代码块、列表、表格和卡片状态，代码块也逐行输出，内存占用与文档大小无关。
+    """
     in_code_block = False
-    code_content = []
+    code_line = None
     in_list = False
     list_type = None
+    in_table = False
+    in_card = False
 
     for line in lines:
+        line = line.rstrip('\n')
         stripped = line.strip()
 
-        # 代码块处理
+        # 代码块处理（持有上一行，以便把结束标签接在最后一行之后）
         if stripped.startswith('```'):
             if in_code_block:
-                html_lines.append('<pre><code>' + '\n'.join(code_content) + '</code></pre>')
-                code_content = []
+                yield code_line + '</code></pre>'
                 in_code_block = False
             else:
                 in_code_block = True
+                code_line = '<pre><code>'
             continue
 
         if in_code_block:
-            code_content.append(line)
+            if code_line == '<pre><code>':
+                code_line += line
+            else:
+                yield code_line
+                code_line = line
             continue
 
         # 表格处理
@@ -306,131 +104,121 @@ def parse_markdown_simple(md_content):
 
             cells = [c.strip() for c in stripped.split('|') if c.strip()]
             if cells:
-                if not html_lines or not html_lines[-1].startswith('<table'):
-                    html_lines.append('<table>')
-                    html_lines.append('<thead><tr>' + ''.join(f'<th>{c}</th>' for c in cells) + '</tr></thead>')
-                    html_lines.append('<tbody>')
+                if not in_table:
+                    yield '<table>'
+                    yield '<thead><tr>' + ''.join(f'<th>{c}</th>' for c in cells) + '</tr></thead>'
+                    yield '<tbody>'
+                    in_table = True
                 else:
-                    html_lines.append('<tr>' + ''.join(f'<td>{c}</td>' for c in cells) + '</tr>')
+                    yield '<tr>' + ''.join(f'<td>{c}</td>' for c in cells) + '</tr>'
             continue
-        elif html_lines and html_lines[-1].startswith('<table'):
-            html_lines.append('</tbody></table>')
+        elif in_table:
+            yield '</tbody></table>'
+            in_table = False
 
         # 列表处理
         if stripped.startswith('- ') or stripped.startswith('* '):
             if not in_list or list_type != 'ul':
                 if in_list:
-                    html_lines.append(f'</{list_type}>')
-                html_lines.append('<ul>')
+                    yield f'</{list_type}>'
+                yield '<ul>'
                 in_list = True
                 list_type = 'ul'
             content = stripped[2:]
-            html_lines.append(f'<li>{parse_inline_formatting(content)}</li>')
+            yield f'<li>{parse_inline_formatting(content)}</li>'
             continue
         elif stripped.startswith(('1. ', '2. ', '3. ', '4. ', '5. ', '6. ', '7. ', '8. ', '9. ')):
             if not in_list or list_type != 'ol':
                 if in_list:
-                    html_lines.append(f'</{list_type}>')
-                html_lines.append('<ol>')
+                    yield f'</{list_type}>'
+                yield '<ol>'
                 in_list = True
                 list_type = 'ol'
             content = stripped[3:]
-            html_lines.append(f'<li>{parse_inline_formatting(content)}</li>')
+            yield f'<li>{parse_inline_formatting(content)}</li>'
             continue
         elif in_list and stripped == '':
-            html_lines.append(f'</{list_type}>')
+            yield f'</{list_type}>'
             in_list = False
             list_type = None
 
-        # 标题处理
+        # 标题处理（二级标题开始一个新卡片，先关闭上一个）
         if stripped.startswith('# '):
-            html_lines.append(f'<h1>{parse_inline_formatting(stripped[2:])}</h1>')
+            yield f'<h1>{parse_inline_formatting(stripped[2:])}</h1>'
         elif stripped.startswith('## '):
-            html_lines.append(f'<div class="card"><h2>{parse_inline_formatting(stripped[3:])}</h2>')
+            close = '</div>' if in_card else ''
+            yield f'{close}<div class="card"><h2>{parse_inline_formatting(stripped[3:])}</h2>'
+            in_card = True
         elif stripped.startswith('### '):
-            html_lines.append(f'<h3>{parse_inline_formatting(stripped[4:])}</h3>')
+            yield f'<h3>{parse_inline_formatting(stripped[4:])}</h3>'
         elif stripped.startswith('#### '):
-            html_lines.append(f'<h4>{parse_inline_formatting(stripped[5:])}</h4>')
+            yield f'<h4>{parse_inline_formatting(stripped[5:])}</h4>'
         # 引用块
         elif stripped.startswith('>'):
-            html_lines.append(f'<blockquote>{parse_inline_formatting(stripped[1:].strip())}</blockquote>')
+            yield f'<blockquote>{parse_inline_formatting(stripped[1:].strip())}</blockquote>'
         # 分隔线
         elif stripped == '---' or stripped == '***':
-            html_lines.append('</div><div class="card">')
+            close = '</div>' if in_card else ''
+            yield f'{close}<div class="card">'
+            in_card = True
         # 普通段落
         elif stripped:
-            html_lines.append(f'<p>{parse_inline_formatting(stripped)}</p>')
+            yield f'<p>{parse_inline_formatting(stripped)}</p>'
 
     # 关闭未关闭的标签
     if in_code_block:
-        html_lines.append('<pre><code>' + '\n'.join(code_content) + '</code></pre>')
+        yield code_line + '</code></pre>'
     if in_list:
-        html_lines.append(f'</{list_type}>')
-    if html_lines and html_lines[-1].startswith('<table'):
-        html_lines.append('</tbody></table>')
-
-    # 确保最后一个 card 被关闭
-    card_count = sum(1 for line in html_lines if '<div class="card">' in line)
-    close_count = sum(1 for line in html_lines if '</div>' in line and 'class=' not in line)
-    if card_count > close_count:
-        html_lines.append('</div>')
+        yield f'</{list_type}>'
+    if in_table:
+        yield '</tbody></table>'
+    if in_card:
+        yield '</div>'
 
-    return '\n'.join(html_lines)
 
+def parse_markdown_simple(md_content):
+    """把整段 Markdown 文本转为 HTML 片段"""
+    return '\n'.join(iter_html_lines(md_content.split('\n')))
 
-def parse_inline_formatting(text):
-    """解析行内格式：粗体、斜体、行内代码"""
-    import re
-
-    # 行内代码
-    text = re.sub(r'`([^`]+)`', r'<code>\1</code>', text)
 
-    # 粗体 (**text** 或 __text__)
-    text = re.sub(r'\*\*([^*]+)\*\*', r'<strong>\1</strong>', text)
-    text = re.sub(r'__([^_]+)__', r'<strong>\1</strong>', text)
+def render_inline_token(match):
+    """把一个行内格式标记转为 HTML；粗体、斜体的内容递归处理嵌套格式"""
+    escaped, code, bold_stars, bold_underscores, italic_star, italic_underscore = match.groups()
+    if escaped is not None:
+        return escaped
+    if code is not None:
+        # 行内代码的内容原样输出
+        return f'<code>{code}</code>'
+    bold = bold_stars if bold_stars is not None else bold_underscores
+    if bold is not None:
+        return f'<strong>{parse_inline_formatting(bold)}</strong>'
+    italic = italic_star if italic_star is not None else italic_underscore
+    return f'<em>{parse_inline_formatting(italic)}</em>'
 
-    # 斜体 (*text* 或 _text_)
-    text = re.sub(r'\*([^*]+)\*', r'<em>\1</em>', text)
-    text = re.sub(r'_([^_]+)_', r'<em>\1</em>', text)
 
-    return text
+def parse_inline_formatting(text):
+    """解析行内格式：粗体、斜体、行内代码，支持 \\* \\_ \\` 转义"""
+    if INLINE_MARKERS.isdisjoint(text):
+        return text
+    return INLINE_TOKEN.sub(render_inline_token, text)
 
 
-def extract_title(md_content):
-    """从 Markdown 中提取标题"""
-    for line in md_content.split('\n'):
+def extract_title(lines):
+    """从 Markdown 的行中提取标题（读到第一个一级标题即停止）"""
+    for line in lines:
         if line.startswith('# '):
             return line[2:].strip()
     return "Analysis Report"
 
 
-def convert_markdown_to_html(input_path, output_path=None):
-    """将 Markdown 文件转换为 HTML"""
+def convert_markdown_to_html(input_path, output_path=None, quiet=False):
+    """将 Markdown 文件流式转换为 HTML：先写页头，逐行写入正文，最后写页尾；quiet 时不输出转换信息"""
     input_file = Path(input_path)
 
     if not input_file.exists():
         print(f"错误: 文件不存在 {input_path}")
         return False
 
-    # 读取 Markdown 内容
-    md_content = input_file.read_text(encoding='utf-8')
-
-    # 解析 Markdown
-    html_content = parse_markdown_simple(md_content)
-
-    # 提取标题
-    title = extract_title(md_content)
-
-    # 生成时间戳
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-    # 组合完整 HTML
-    full_html = HTML_TEMPLATE.format(
-        title=title,
-        content=html_content,
-        timestamp=timestamp
-    )
-
     # 确定输出路径
     if output_path is None:
         output_file = input_file.with_suffix('.html')
@@ -440,32 +228,143 @@ def convert_markdown_to_html(input_path, output_path=None):
     # 确保输出目录存在
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
-    # 写入 HTML 文件
-    output_file.write_text(full_html, encoding='utf-8')
+    # 提取标题（页头需要）
+    with open(input_file, encoding='utf-8') as md:
+        title = extract_title(md)
+
+    # 生成时间戳
+    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    head, tail = load_html_template()
+    with open(input_file, encoding='utf-8') as md, open(output_file, 'w', encoding='utf-8') as out:
+        out.write(head.substitute(title=title, timestamp=timestamp))
+        separator = ''
+        for html_line in iter_html_lines(md):
+            out.write(separator)
+            out.write(html_line)
+            separator = '\n'
+        out.write(tail.substitute(title=title, timestamp=timestamp))
+
+    if quiet:
+        return True
 
     print(f"[OK] 已转换为 HTML: {output_file}")
     print(f"     原文件: {input_file}")
-    print(f"     文件大小: {len(full_html)} 字节")
+    print(f"     文件大小: {output_file.stat().st_size} 字节")
 
     return True
 
 
-def batch_convert(input_dir, output_dir=None):
-    """批量转换目录中的所有 Markdown 文件"""
+def file_digest(path):
+    """文件内容的 SHA-1，分块读取"""
+    # hashlib 会加载 OpenSSL，只有批量转换需要，按需导入
+    import hashlib
+
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(output_path, template_digest):
+    """读取转换清单 {文件名: {size, mtime_ns, sha1}}；不存在、损坏或版本、模板不符时返回空清单"""
+    try:
+        manifest = json.loads((output_path / MANIFEST_NAME).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if manifest.get('version') != MANIFEST_VERSION or manifest.get('template') != template_digest:
+        return {}
+    return manifest.get('files', {})
+
+
+def save_manifest(output_path, template_digest, files):
+    """原子写入转换清单"""
+    manifest_path = output_path / MANIFEST_NAME
+    tmp_path = manifest_path.with_name(f'{MANIFEST_NAME}.{os.getpid()}.tmp')
+    manifest = {'version': MANIFEST_VERSION, 'template': template_digest, 'files': files}
+    tmp_path.write_text(json.dumps(manifest, ensure_ascii=False, sort_keys=True), encoding='utf-8')
+    os.replace(tmp_path, manifest_path)
+
+
+def find_changed(md_files, output_path, manifest):
+    """找出需要重新转换的文件，返回 ([(md_file, output_file, 清单项)], 新清单)
+
+    大小和修改时间与清单一致时直接跳过，不读取文件；不一致时再比较内容哈希，
+    只是被 touch 过的文件更新清单中的修改时间后跳过。输出文件缺失时总是重新转换。
+    """
+    changed = []
+    files = {}
+    for md_file in md_files:
+        output_file = output_path / md_file.with_suffix('.html').name
+        stat = md_file.stat()
+        entry = manifest.get(md_file.name)
+        if entry and output_file.exists():
+            if entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                files[md_file.name] = entry
+                continue
+            digest = file_digest(md_file)
+            if digest == entry['sha1']:
+                files[md_file.name] = dict(entry, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+                continue
+        else:
+            digest = file_digest(md_file)
+        changed.append((md_file, output_file,
+                        {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha1': digest}))
+    return changed, files
+
+
+def convert_quietly(md_file, output_file):
+    """进程池中的转换任务"""
+    return convert_markdown_to_html(md_file, output_file, quiet=True)
+
+
+def convert_changed(changed, jobs):
+    """转换改动过的文件（jobs > 1 时使用进程池），逐个返回 (md_file, 清单项, 错误信息)"""
+    if jobs <= 1 or len(changed) <= 1:
+        for md_file, output_file, entry in changed:
+            try:
+                convert_quietly(md_file, output_file)
+            except (OSError, UnicodeDecodeError) as e:
+                yield md_file, entry, str(e)
+            else:
+                yield md_file, entry, None
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = {executor.submit(convert_quietly, md_file, output_file): (md_file, entry)
+                   for md_file, output_file, entry in changed}
+        for future in as_completed(futures):
+            md_file, entry = futures[future]
+            try:
+                future.result()
+            except (OSError, UnicodeDecodeError) as e:
+                yield md_file, entry, str(e)
+            else:
+                yield md_file, entry, None
+
+
+def batch_convert(input_dir, output_dir=None, jobs=1, force=False, quiet=False):
+    """批量转换目录中的 Markdown 文件，只转换相对清单有改动的文件
+
+    force 时忽略清单全部重新转换；quiet 时没有改动就不输出（--watch 使用）。
+    返回转换成功的文件数。
+    """
     input_path = Path(input_dir)
 
     if not input_path.exists():
         print(f"错误: 目录不存在 {input_dir}")
-        return
+        return 0
 
     # 查找所有 Markdown 文件
-    md_files = list(input_path.glob('*.md'))
+    md_files = sorted(input_path.glob('*.md'))
 
     if not md_files:
-        print(f"未在 {input_dir} 中找到 Markdown 文件")
-        return
-
-    print(f"找到 {len(md_files)} 个 Markdown 文件")
+        if not quiet:
+            print(f"未在 {input_dir} 中找到 Markdown 文件")
+        return 0
 
     # 确定输出目录
     if output_dir is None:
@@ -475,15 +374,51 @@ def batch_convert(input_dir, output_dir=None):
 
     output_path.mkdir(parents=True, exist_ok=True)
 
+    # 模板改动后所有文件都需要重新生成
+    template_digest = file_digest(TEMPLATE_PATH)
+    manifest = {} if force else load_manifest(output_path, template_digest)
+    changed, files = find_changed(md_files, output_path, manifest)
+
+    if not changed:
+        if not quiet:
+            print(f"找到 {len(md_files)} 个 Markdown 文件，均未改动，无需转换")
+            print(f"HTML 输出目录: {output_path}")
+        return 0
+
+    print(f"找到 {len(md_files)} 个 Markdown 文件，{len(changed)} 个需要转换")
+
     # 批量转换
     success_count = 0
-    for md_file in md_files:
-        output_file = output_path / md_file.with_suffix('.html').name
-        if convert_markdown_to_html(md_file, output_file):
+    failed_count = 0
+    start = time.perf_counter()
+    for md_file, entry, error in convert_changed(changed, jobs):
+        if error is None:
+            files[md_file.name] = entry
             success_count += 1
+            print(f"[OK] {md_file.name}")
+        else:
+            failed_count += 1
+            print(f"[失败] {md_file.name}: {error}")
+    elapsed = time.perf_counter() - start
+
+    save_manifest(output_path, template_digest, files)
 
-    print(f"\n批量转换完成: {success_count}/{len(md_files)} 个文件成功")
+    print(f"\n批量转换完成: 转换 {success_count} 个，跳过 {len(md_files) - len(changed)} 个未改动，"
+          f"失败 {failed_count} 个（{elapsed:.2f}s）")
     print(f"HTML 输出目录: {output_path}")
+    return success_count
+
+
+def watch_convert(input_dir, output_dir=None, jobs=1, interval=2.0):
+    """监视目录，定期重新转换改动过的 Markdown 文件，Ctrl+C 退出"""
+    batch_convert(input_dir, output_dir, jobs)
+    print(f"\n监视 {input_dir}，每 {interval:g} 秒检查一次改动（Ctrl+C 退出）")
+    try:
+        while True:
+            time.sleep(interval)
+            batch_convert(input_dir, output_dir, jobs, quiet=True)
+    except KeyboardInterrupt:
+        print("\n已停止监视")
 
 
 def main():
@@ -500,8 +435,11 @@ def main():
   python md_to_html.py -d ./reports
   python md_to_html.py -d ./reports -o ./html_output
 
-  # 转换分析数据目录
-  python md_to_html.py --batch
+  # 转换分析数据目录（只转换改动过的文件，4 个进程并行）
+  python md_to_html.py --batch -j 4
+
+  # 持续监视，日文件改动后自动重新转换
+  python md_to_html.py --batch --watch
         """
     )
 
@@ -509,25 +447,37 @@ def main():
     parser.add_argument('-o', '--output', help='输出 HTML 文件路径')
     parser.add_argument('-d', '--directory', help='批量转换目录中的所有 Markdown 文件')
     parser.add_argument('--batch', action='store_true',
-                        help='批量转换默认数据目录 (~/.claude/claude-analysis/)')
+                        help='批量转换默认数据目录（CLAUDE_ANALYSIS_PATH 或 ~/.claude/claude-analysis/）')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='批量转换的并行进程数（默认 1，0 表示 CPU 核数）')
+    parser.add_argument('--force', action='store_true', help='批量转换时忽略转换清单，全部重新转换')
+    parser.add_argument('--watch', action='store_true', help='批量转换后持续监视目录，只重新转换改动过的文件')
+    parser.add_argument('--interval', type=float, default=2.0, help='--watch 的检查间隔（秒，默认 2）')
 
     args = parser.parse_args()
+    jobs = args.jobs or os.cpu_count() or 1
 
-    # 批量转换默认目录
+    # 批量转换：默认数据目录或指定目录
+    directory = None
     if args.batch:
-        data_dir = Path.home() / '.claude' / 'claude-analysis'
-        if data_dir.exists():
-            batch_convert(data_dir)
-        else:
-            print(f"错误: 默认数据目录不存在 {data_dir}")
+        directory, output = get_storage_path(), None
+        if not directory.exists():
+            print(f"错误: 默认数据目录不存在 {directory}")
             print("请先使用 usage-observer 或 usage-recorder 记录一些数据")
-        return
+            return
+    elif args.directory:
+        directory, output = args.directory, args.output
 
-    # 批量转换指定目录
-    if args.directory:
-        batch_convert(args.directory, args.output)
+    if directory is not None:
+        if args.watch:
+            watch_convert(directory, output, jobs, args.interval)
+        else:
+            batch_convert(directory, output, jobs, args.force)
         return
 
+    if args.watch:
+        parser.error('--watch 需要与 -d 或 --batch 一起使用')
+
     # 转换单个文件
     if args.input:
         convert_markdown_to_html(args.input, args.output)
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Usage Analyst - 高频问题聚类
+问题描述按 MinHash 签名和 LSH 分桶找出近似重复（只与同桶的描述比较，时间随记录数近似线性增长），
+每个新描述归入与它最相似的已有描述所在的问题簇（没有相似描述时自成一簇），
+报告出现次数最多的问题簇及其耗时合计和解决率。签名、分桶和每个日文件的记录摘要缓存在
+.cache/problem_clusters.pickle，之后只处理新增或改动过的日文件，新的描述直接归入已有问题簇
+"""
+
+import argparse
+import json
+import sys
+from array import array
+from collections import Counter
+from pathlib import Path
+
+# 共用插件根目录下的 tracker_core 包
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from tracker_core.cache import CachedState, ParseCache, get_cache_dir  # noqa: E402
+from tracker_core.cli import parse_date_arg  # noqa: E402
+from tracker_core.history import iter_day_files  # noqa: E402
+from tracker_core.minhash import LSHIndex, signature  # noqa: E402
+from tracker_core.parser import parse_day_records  # noqa: E402
+from tracker_core.paths import get_storage_path  # noqa: E402
+from tracker_core.stats import classify_status  # noqa: E402
+from tracker_core.store import file_stamp, parse_minutes  # noqa: E402
+from tracker_core.text import shingles  # noqa: E402
+
+# 缓存格式或签名参数变化时递增，使旧缓存失效
+CLUSTER_VERSION = 1
+
+# 报告中每个问题簇列出的其他描述数
+EXAMPLE_COUNT = 3
+
+
+def get_cluster_cache_path(storage_path):
+    """获取聚类缓存路径"""
+    return get_cache_dir(storage_path) / 'problem_clusters.pickle'
+
+
+class ProblemClusters(CachedState):
+    """近似重复问题的聚类状态，可增量更新并缓存
+
+    texts 为去重后的问题描述，text_nodes 为每个描述的签名编号（没有可比较的词时为 -1），
+    node_clusters 为每个签名所属问题簇（以簇内第一个签名的编号表示）；
+    days 为每个日文件的 (描述编号列, 耗时列, 已解决标记)。问题簇只增不并，
+    已有的归属不会因后来的描述而改变。
+    """
+
+    STATE_VERSION = CLUSTER_VERSION
+    # text_ids 可由 texts 重建，其余只对本次运行有意义
+    TRANSIENT = ('text_ids', 'days_parsed', 'texts_added')
+
+    def __init__(self):
+        self.index = LSHIndex()
+        self.node_clusters = array('I')
+        self.texts = []
+        self.text_ids = {}
+        self.text_nodes = array('i')
+        self.sources = {}
+        self.days = {}
+        self.days_parsed = 0
+        self.texts_added = 0
+
+    # ---- 缓存 ----
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self.text_ids = {text: text_id for text_id, text in enumerate(self.texts)}
+
+    def save(self, path):
+        try:
+            super().save(path)
+        except OSError:
+            # 缓存写入失败不影响报告，下次重新计算
+            pass
+
+    # ---- 聚类 ----
+
+    def _node(self, text):
+        """描述的签名编号；新签名归入最相似签名的问题簇"""
+        sig = signature(shingles(text))
+        if sig is None:
+            return -1
+        node = self.index.find(sig)
+        if node is not None:
+            return node
+        similar = self.index.similar(sig)
+        node = self.index.add(sig)
+        self.node_clusters.append(self.node_clusters[similar[0][1]] if similar else node)
+        return node
+
+    def _text_id(self, text):
+        text_id = self.text_ids.get(text)
+        if text_id is None:
+            text_id = self.text_ids[text] = len(self.texts)
+            self.texts.append(text)
+            self.text_nodes.append(self._node(text))
+            self.texts_added += 1
+        return text_id
+
+    def update(self, storage_path, cache=None):
+        """处理新增和改动过的日文件，移除已删除的日期，返回重新解析的日文件数"""
+        seen = set()
+        for md_file in iter_day_files(storage_path):
+            date_str = md_file.stem
+            seen.add(date_str)
+            stamp = list(file_stamp(md_file))
+            if self.sources.get(date_str) == stamp:
+                continue
+
+            if cache is not None:
+                records = cache.load(md_file, date_str, parse_day_records)
+            else:
+                records = parse_day_records(md_file, date_str)
+            text_ids, minutes, resolved = array('I'), array('I'), bytearray()
+            for r in records:
+                text_ids.append(self._text_id(r.problem.strip()))
+                minutes.append(parse_minutes(r.time))
+                resolved.append(classify_status(r.status) == 'resolved')
+            self.days[date_str] = (text_ids, minutes, bytes(resolved))
+            self.sources[date_str] = stamp
+            self.days_parsed += 1
+
+        for date_str in [d for d in self.days if d not in seen]:
+            del self.days[date_str]
+            del self.sources[date_str]
+        return self.days_parsed
+
+    # ---- 报告 ----
+
+    def top_clusters(self, start_date=None, end_date=None, top=10, min_size=2):
+        """日期范围内（含两端）记录数最多的问题簇，按记录数、耗时降序
+
+        返回 (问题簇列表, 参与聚类的记录数, 问题簇总数)；每个问题簇含代表描述（出现最多的描述）、
+        记录数、描述种数、耗时合计、已解决数、解决率和其他常见描述。
+        """
+        text_counts = Counter()
+        text_minutes = Counter()
+        text_resolved = Counter()
+        for date_str, (text_ids, minutes, resolved) in self.days.items():
+            if (start_date and date_str < start_date) or (end_date and date_str > end_date):
+                continue
+            text_counts.update(text_ids)
+            for text_id, m, flag in zip(text_ids, minutes, resolved):
+                text_minutes[text_id] += m
+                text_resolved[text_id] += flag
+
+        clusters = {}
+        total = 0
+        for text_id, count in text_counts.items():
+            node = self.text_nodes[text_id]
+            if node < 0:
+                continue
+            total += count
+            cluster = clusters.setdefault(self.node_clusters[node], {
+                'count': 0, 'minutes': 0, 'resolved': 0, 'texts': []
+            })
+            cluster['count'] += count
+            cluster['minutes'] += text_minutes[text_id]
+            cluster['resolved'] += text_resolved[text_id]
+            cluster['texts'].append((count, text_id))
+
+        ranked = sorted((c for c in clusters.values() if c['count'] >= min_size),
+                        key=lambda c: (c['count'], c['minutes']), reverse=True)[:top]
+        results = []
+        for cluster in ranked:
+            texts = [self.texts[text_id] for _, text_id in
+                     sorted(cluster['texts'], key=lambda item: (-item[0], item[1]))]
+            results.append({
+                'problem': texts[0],
+                'count': cluster['count'],
+                'variants': len(texts),
+                'minutes': cluster['minutes'],
+                'resolved': cluster['resolved'],
+                'resolved_rate': cluster['resolved'] / cluster['count'],
+                'examples': texts[1:1 + EXAMPLE_COUNT],
+            })
+        return results, total, len(clusters)
+
+
+def load_clusters(storage_path, rebuild=False):
+    """读取聚类缓存并同步日文件的改动，有改动时写回缓存"""
+    cache_path = get_cluster_cache_path(storage_path)
+    clusters = ProblemClusters() if rebuild else ProblemClusters.load(cache_path)
+    known_days = len(clusters.days)
+    clusters.update(storage_path, ParseCache(storage_path))
+    if clusters.days_parsed or len(clusters.days) != known_days:
+        clusters.save(cache_path)
+    return clusters
+
+
+def display_clusters(results, total, cluster_count, title):
+    """显示高频问题报告"""
+    print(f"\n{title}")
+    print(f"  {total} 条记录聚为 {cluster_count} 个问题簇\n")
+    if not results:
+        print("  没有重复出现的问题")
+        return
+    for i, c in enumerate(results, 1):
+        print(f"{i:>2}. {c['problem']}")
+        print(f"    出现 {c['count']} 次（{c['variants']} 种描述）  耗时 {c['minutes']} 分钟  "
+              f"解决率 {c['resolved_rate'] * 100:.1f}%")
+        if c['examples']:
+            print(f"    相似描述: {' / '.join(c['examples'])}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='聚类近似重复的问题描述，报告高频问题',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  # 全部历史中出现最多的 10 个问题
+  python problem_clusters.py
+
+  # 指定范围的前 20 个问题，输出 JSON
+  python problem_clusters.py --from 2024-01-01 --to 2024-03-31 --top 20 --json
+
+  # 丢弃缓存后重新聚类
+  python problem_clusters.py --rebuild
+        """
+    )
+    parser.add_argument('--from', dest='from_date', type=parse_date_arg, help='起始日期 (YYYY-MM-DD，含)')
+    parser.add_argument('--to', dest='to_date', type=parse_date_arg, help='结束日期 (YYYY-MM-DD，含)')
+    parser.add_argument('--top', type=int, default=10, help='显示的问题簇数（默认 10）')
+    parser.add_argument('--min-size', type=int, default=2, help='问题簇至少包含的记录数（默认 2）')
+    parser.add_argument('--json', action='store_true', help='以 JSON 输出')
+    parser.add_argument('--rebuild', action='store_true', help='丢弃缓存后重新聚类')
+
+    args = parser.parse_args()
+    storage_path = get_storage_path()
+
+    if not storage_path.exists():
+        print(f"存储目录不存在: {storage_path}")
+        return 1
+
+    clusters = load_clusters(storage_path, args.rebuild)
+    results, total, cluster_count = clusters.top_clusters(
+        args.from_date, args.to_date, args.top, args.min_size)
+
+    if args.json:
+        print(json.dumps({'records': total, 'clusters': cluster_count, 'top': results},
+                         ensure_ascii=False, indent=2))
+        return 0
+
+    if args.from_date or args.to_date:
+        title = f"高频问题 TOP {args.top}（{args.from_date or '最早'} ~ {args.to_date or '今天'}）"
+    else:
+        title = f"高频问题 TOP {args.top}（全部历史）"
+    display_clusters(results, total, cluster_count, title)
+    print(f"\n（重新解析 {clusters.days_parsed} 个日文件，新增 {clusters.texts_added} 种描述）")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
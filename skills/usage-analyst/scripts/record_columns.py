@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Usage Analyst - 列式统计引擎
+把记录装入类型化数组（每个维度一列整数编码，耗时一列分钟数），按任意维度做计数、求和、解决率等分组聚合；
+安装了 NumPy 时用 bincount 向量化计算，否则使用标准库 array
+"""
+
+import sys
+from array import array
+from collections import Counter
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # 可选依赖
+    np = None
+
+# 共用插件根目录下 tracker_core 包的记录类型、加载逻辑与状态分类
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from tracker_core.cache import ParseCache  # noqa: E402
+from tracker_core.history import iter_records  # noqa: E402
+from tracker_core.records import PRIORITIES, STAGES, STATUSES, TYPES, CodeTable  # noqa: E402
+from tracker_core.stats import STATUS_CLASSES, classify_status  # noqa: E402
+
+# 可分组的维度
+DIMENSIONS = ('type', 'stage', 'priority', 'status', 'date')
+
+# array 类型码对应的 NumPy dtype
+NUMPY_DTYPES = {'B': 'uint8', 'I': 'uint32', 'q': 'int64'}
+
+
+class RecordColumns:
+    """列式存储的记录集合
+
+    各维度列保存 Record 的编码（日期使用本表自己的码表），同一维度的所有记录共用一个码表。
+    """
+
+    def __init__(self, use_numpy=None):
+        self.use_numpy = (np is not None) if use_numpy is None else (use_numpy and np is not None)
+        self.tables = {
+            'type': TYPES, 'stage': STAGES, 'priority': PRIORITIES, 'status': STATUSES,
+            'date': CodeTable()
+        }
+        self.columns = {dim: array('I') for dim in DIMENSIONS}
+        self.minutes = array('q')
+        self._flags = {}
+
+    @classmethod
+    def from_records(cls, records, use_numpy=None):
+        """由 Record 可迭代对象构建（单次遍历）"""
+        table = cls(use_numpy)
+        dates = table.tables['date']
+        type_col = table.columns['type']
+        stage_col = table.columns['stage']
+        priority_col = table.columns['priority']
+        status_col = table.columns['status']
+        date_col = table.columns['date']
+        minutes = table.minutes
+
+        last_date, last_code = None, None
+        for r in records:
+            type_col.append(r.type_code)
+            stage_col.append(r.stage_code)
+            priority_col.append(r.priority_code)
+            status_col.append(r.status_code)
+            # 记录按日期顺序到达，相邻记录通常同一天
+            if r.date != last_date:
+                last_date, last_code = r.date, dates.code(r.date)
+            date_col.append(last_code)
+            minutes.append(int(r.time) if r.time and r.time.isdigit() else 0)
+        return table
+
+    def __len__(self):
+        return len(self.minutes)
+
+    # ---- 基础聚合 ----
+
+    def _vector(self, column):
+        return np.frombuffer(column, dtype=NUMPY_DTYPES[column.typecode])
+
+    def _counts(self, dim, weights=None):
+        """按编码计数（或对 weights 列求和），返回与码表等长的列表"""
+        size = len(self.tables[dim])
+        column = self.columns[dim]
+        if self.use_numpy:
+            codes = self._vector(column)
+            if weights is None:
+                result = np.bincount(codes, minlength=size)
+            else:
+                result = np.bincount(codes, weights=self._vector(weights), minlength=size)
+            return [int(v) for v in result]
+
+        result = [0] * size
+        if weights is None:
+            for code, count in Counter(column).items():
+                result[code] = count
+        else:
+            for code, weight in zip(column, weights):
+                result[code] += weight
+        return result
+
+    def _status_flags(self, status_class):
+        """每条记录是否属于某类状态的 0/1 列（按状态类缓存）"""
+        flags = self._flags.get(status_class)
+        if flags is None:
+            matched = [int(classify_status(status) == status_class) for status in STATUSES.values]
+            flags = self._flags[status_class] = array('B', map(matched.__getitem__, self.columns['status']))
+        return flags
+
+    def _first_seen(self, dim):
+        """维度中出现过的编码，按首次出现的顺序（与逐行统计的字典顺序一致）"""
+        column = self.columns[dim]
+        if self.use_numpy:
+            codes, index = np.unique(self._vector(column), return_index=True)
+            return [int(c) for c in codes[np.argsort(index)]]
+        return list(dict.fromkeys(column))
+
+    def _by_value(self, dim, values):
+        table = self.tables[dim]
+        return {table.value(code): values[code] for code in self._first_seen(dim)}
+
+    def count_by(self, dim):
+        """按维度计数：{取值: 记录数}"""
+        return self._by_value(dim, self._counts(dim))
+
+    def sum_by(self, dim):
+        """按维度对耗时求和：{取值: 分钟数}"""
+        return self._by_value(dim, self._counts(dim, self.minutes))
+
+    def status_class_counts(self):
+        """resolved/pending/follow_up 各自的记录数"""
+        status_counts = self._counts('status')
+        result = {name: 0 for name, _ in STATUS_CLASSES}
+        for code, count in enumerate(status_counts):
+            name = classify_status(STATUSES.value(code)) if count else None
+            if name:
+                result[name] += count
+        return result
+
+    def rate_by(self, dim, status_class='resolved'):
+        """按维度计算某类状态（默认已解决）的占比：{取值: 0~1}"""
+        hits = self._counts(dim, self._status_flags(status_class))
+        totals = self._counts(dim)
+        return self._by_value(dim, [hits[c] / totals[c] if totals[c] else 0.0 for c in range(len(totals))])
+
+    def group_by(self, dim):
+        """按维度汇总：{取值: {'count', 'time', 'resolved', 'resolved_rate'}}"""
+        counts = self._counts(dim)
+        times = self._counts(dim, self.minutes)
+        resolved = self._counts(dim, self._status_flags('resolved'))
+        table = self.tables[dim]
+        return {
+            table.value(code): {
+                'count': counts[code],
+                'time': times[code],
+                'resolved': resolved[code],
+                'resolved_rate': resolved[code] / counts[code]
+            }
+            for code in self._first_seen(dim)
+        }
+
+    def total_time(self):
+        if self.use_numpy:
+            return int(self._vector(self.minutes).sum())
+        return sum(self.minutes)
+
+    # ---- 报告 ----
+
+    def stats(self):
+        """与 view_records.calculate_stats 相同结构和数值的统计结果"""
+        stats = {'total_count': len(self), 'total_time': self.total_time()}
+        stats.update(self.status_class_counts())
+        stats['type_distribution'] = self.count_by('type')
+        stats['stage_distribution'] = self.count_by('stage')
+        stats['priority_distribution'] = self.count_by('priority')
+        stats['daily_counts'] = self.count_by('date')
+        return stats
+
+
+def load_columns(storage_path, start_date=None, end_date=None, use_numpy=None):
+    """按日期范围（含两端）从记录目录加载列式数据（使用 recorder 的解析缓存）"""
+    cache = ParseCache(storage_path)
+    return RecordColumns.from_records(iter_records(storage_path, cache, start_date, end_date), use_numpy)
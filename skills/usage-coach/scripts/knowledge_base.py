@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Usage Coach - 教练知识库
+把已解决记录按问题类型和会话阶段提炼为知识库条目：常见问题、有效解决方案、相关文档和平均耗时，
+保存为可 mmap 读取的 knowledge/coach_kb.bin。每个日文件的已解决记录和全部日期的分组合计缓存在
+.cache/coach_knowledge_state.pickle，日文件改动时从合计中减去该日旧的统计再加上新的，
+只重新解析新增或改动过的日期；没有改动时不重写知识库
+"""
+
+import argparse
+import heapq
+import json
+import re
+import sys
+from collections import Counter
+from pathlib import Path
+
+# 共用插件根目录下的 tracker_core 包
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from tracker_core.cache import CachedState, ParseCache, get_cache_dir  # noqa: E402
+from tracker_core.history import iter_day_files  # noqa: E402
+from tracker_core.knowledge import KnowledgeBase, get_knowledge_path, write_knowledge  # noqa: E402
+from tracker_core.parser import parse_day_records  # noqa: E402
+from tracker_core.paths import get_storage_path  # noqa: E402
+from tracker_core.stats import classify_status  # noqa: E402
+from tracker_core.store import file_stamp, parse_minutes  # noqa: E402
+
+# 状态缓存格式变化时递增，使旧缓存失效
+KNOWLEDGE_STATE_VERSION = 1
+
+# 每个条目的常见问题、解决方案、相关文档各保存的项数
+TOP_ITEMS = 10
+
+# 表示"无"的单元格
+EMPTY_VALUES = ('', '-')
+
+# 相关文档单元格中多个文档的分隔符
+DOC_SEPARATORS = re.compile(r'\s*[,，、;；]\s*')
+
+
+def get_knowledge_state_path(storage_path):
+    """获取知识库构建状态的缓存路径"""
+    return get_cache_dir(storage_path) / 'coach_knowledge_state.pickle'
+
+
+def new_group():
+    """一个分组的统计: [已解决记录数, 耗时合计, 问题计数, 解决方案计数, 文档计数]"""
+    return [0, 0, Counter(), Counter(), Counter()]
+
+
+def resolved_rows(records):
+    """一个日文件中的已解决记录，每条为 (类型, 阶段, 问题描述, 解决方案, 相关文档元组, 耗时)"""
+    rows = []
+    for r in records:
+        if classify_status(r.status) != 'resolved':
+            continue
+        docs = tuple(doc for doc in DOC_SEPARATORS.split(r.docs.strip()) if doc not in EMPTY_VALUES)
+        rows.append((r.type, r.stage, r.problem.strip(), r.solution.strip(), docs, parse_minutes(r.time)))
+    return rows
+
+
+def day_groups(rows):
+    """已解决记录按 (维度, 取值) 分组的统计"""
+    groups = {}
+    for type_name, stage, problem, solution, docs, minutes in rows:
+        for key in (('type', type_name), ('stage', stage)):
+            if key[1] in EMPTY_VALUES:
+                continue
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = new_group()
+            group[0] += 1
+            group[1] += minutes
+            if problem not in EMPTY_VALUES:
+                group[2][problem] += 1
+            if solution not in EMPTY_VALUES:
+                group[3][solution] += 1
+            group[4].update(docs)
+    return groups
+
+
+def apply_groups(totals, groups, sign):
+    """把一天的分组统计加到合计（sign=1）或从合计中减去（sign=-1），计数归零的项随之删除"""
+    for key, (count, minutes, *counters) in groups.items():
+        total = totals.get(key)
+        if total is None:
+            total = totals[key] = new_group()
+        total[0] += sign * count
+        total[1] += sign * minutes
+        for total_counter, counter in zip(total[2:], counters):
+            if sign > 0:
+                total_counter.update(counter)
+            else:
+                total_counter.subtract(counter)
+                for text in [t for t in counter if total_counter[t] <= 0]:
+                    del total_counter[text]
+        if total[0] <= 0:
+            del totals[key]
+
+
+def top_items(counter):
+    """出现次数最多的 TOP_ITEMS 项 [(文本, 次数)]，次数相同时按文本排序，全量与增量构建结果一致"""
+    return heapq.nsmallest(TOP_ITEMS, counter.items(), key=lambda item: (-item[1], item[0]))
+
+
+class KnowledgeHistory(CachedState):
+    """各日文件的已解决记录及全部日期的分组合计，可增量更新并缓存
+
+    days 只保存已解决记录的精简元组（比每天一组 Counter 小得多，缓存读取更快），
+    日文件改动或删除时由它重新得到该日旧的分组统计，从 totals 中减去。
+    """
+
+    STATE_VERSION = KNOWLEDGE_STATE_VERSION
+    TRANSIENT = ('days_parsed', 'days_removed')
+
+    def __init__(self):
+        self.sources = {}
+        self.days = {}
+        self.totals = {}
+        self.generation = 0
+        self.days_parsed = 0
+        self.days_removed = 0
+
+    def update(self, storage_path, cache=None):
+        """处理新增和改动过的日文件，移除已删除的日期，返回是否有变化"""
+        seen = set()
+        for md_file in iter_day_files(storage_path):
+            date_str = md_file.stem
+            seen.add(date_str)
+            stamp = list(file_stamp(md_file))
+            if self.sources.get(date_str) == stamp:
+                continue
+
+            if cache is not None:
+                records = cache.load(md_file, date_str, parse_day_records)
+            else:
+                records = parse_day_records(md_file, date_str)
+            rows = resolved_rows(records)
+            if date_str in self.days:
+                apply_groups(self.totals, day_groups(self.days[date_str]), -1)
+            apply_groups(self.totals, day_groups(rows), 1)
+            self.days[date_str] = rows
+            self.sources[date_str] = stamp
+            self.days_parsed += 1
+
+        for date_str in [d for d in self.days if d not in seen]:
+            apply_groups(self.totals, day_groups(self.days.pop(date_str)), -1)
+            del self.sources[date_str]
+            self.days_removed += 1
+        return bool(self.days_parsed or self.days_removed)
+
+    def entries(self):
+        """知识库条目，按维度、取值排序"""
+        for (dimension, value), (count, minutes, problems, solutions, docs) in sorted(self.totals.items()):
+            yield dimension, value, count, minutes, top_items(problems), top_items(solutions), top_items(docs)
+
+
+def build_knowledge(storage_path, rebuild=False):
+    """同步日文件的改动，有变化（或知识库不存在、版本不符）时重写知识库，返回 (状态, 是否重写)"""
+    state_path = get_knowledge_state_path(storage_path)
+    kb_path = get_knowledge_path(storage_path)
+    kb = KnowledgeBase.open(kb_path)
+    generation = 0
+    if kb is not None:
+        generation = kb.generation
+        kb.close()
+
+    history = KnowledgeHistory() if rebuild else KnowledgeHistory.load(state_path)
+    if not history.update(storage_path, ParseCache(storage_path)) and kb is not None:
+        return history, False
+
+    # 重新构建时生成次数接着已有知识库递增，读取方据此判断知识库是否变化
+    history.generation = max(history.generation, generation) + 1
+
+    write_knowledge(kb_path, history.entries(), history.generation, len(history.days))
+    history.save(state_path)
+    return history, True
+
+
+def display_entry(entry, limit):
+    """显示一个知识库条目"""
+    print(f"\n【{entry['value']}】 已解决 {entry['count']} 次，平均耗时 {entry['avg_minutes']} 分钟")
+    for name, label in (('problems', '常见问题'), ('solutions', '有效方案'), ('docs', '相关文档')):
+        items = entry[name][:limit]
+        if items:
+            print(f"  {label}: " + ' / '.join(f"{item['text']} ({item['count']})" for item in items))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='从已解决记录提炼教练知识库（按问题类型、会话阶段）',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  # 增量更新知识库并显示全部条目
+  python knowledge_base.py
+
+  # 只读取已有知识库（不检查日文件），查看某个类型 / 阶段
+  python knowledge_base.py --no-update --type 工具错误
+  python knowledge_base.py --no-update --stage 调试 --json
+
+  # 丢弃缓存后重新构建
+  python knowledge_base.py --rebuild
+        """
+    )
+    parser.add_argument('--type', help='只显示该问题类型的条目')
+    parser.add_argument('--stage', help='只显示该会话阶段的条目')
+    parser.add_argument('--top', type=int, default=3, help='每个列表显示的项数（默认 3）')
+    parser.add_argument('--json', action='store_true', help='以 JSON 输出')
+    parser.add_argument('--no-update', action='store_true', help='直接读取已有知识库，不同步日文件')
+    parser.add_argument('--rebuild', action='store_true', help='丢弃缓存后重新构建')
+
+    args = parser.parse_args()
+    storage_path = get_storage_path()
+
+    if not storage_path.exists():
+        print(f"存储目录不存在: {storage_path}")
+        return 1
+
+    if not args.no_update:
+        history, written = build_knowledge(storage_path, args.rebuild)
+        if not args.json:
+            action = '已更新' if written else '已是最新'
+            print(f"[OK] 知识库{action}（第 {history.generation} 版，重新解析 {history.days_parsed} 个日文件）")
+
+    kb = KnowledgeBase.open(get_knowledge_path(storage_path))
+    if kb is None:
+        print("知识库不存在，请先运行 python knowledge_base.py 构建")
+        return 1
+
+    with kb:
+        if args.type or args.stage:
+            selected = [kb.entry(dim, value, args.top)
+                        for dim, value in (('type', args.type), ('stage', args.stage)) if value]
+            entries = {'selected': [entry for entry in selected if entry is not None]}
+        else:
+            entries = {dim: kb.entries(dim, args.top) for dim in ('type', 'stage')}
+
+        if args.json:
+            print(json.dumps({'generation': kb.generation, 'days': kb.day_count, **entries},
+                             ensure_ascii=False, indent=2))
+            return 0
+
+        titles = {'type': '按问题类型', 'stage': '按会话阶段', 'selected': '查询结果'}
+        for key, items in entries.items():
+            print(f"\n=== {titles[key]} ===")
+            if not items:
+                print("  （没有已解决的记录）")
+            for entry in items:
+                display_entry(entry, args.top)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Usage Observer - 生成历史解决方案提示索引
+从日文件中收集已解决且有解决方案的记录，生成 keyword_router 路由到 usage-observer 时查询的提示索引
+（.cache/solution_hints.pickle）。每个日文件的已解决记录和各问题的检索词缓存在
+.cache/solution_hints_state.pickle，之后只重新解析新增或改动过的日文件，没有改动时不重写索引
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# 与 hooks 共用插件根目录下的 tracker_core 包
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from tracker_core.cache import CachedState, ParseCache, get_cache_dir  # noqa: E402
+from tracker_core.hints import HINT_TOP_K, HintIndex, get_hint_index_path  # noqa: E402
+from tracker_core.history import iter_day_files  # noqa: E402
+from tracker_core.parser import parse_day_records  # noqa: E402
+from tracker_core.paths import get_storage_path  # noqa: E402
+from tracker_core.stats import classify_status  # noqa: E402
+from tracker_core.store import file_stamp  # noqa: E402
+from tracker_core.text import shingles  # noqa: E402
+
+# 状态缓存格式变化时递增，使旧缓存失效
+HINT_STATE_VERSION = 1
+
+# 表示"无"的单元格
+EMPTY_VALUES = ('', '-')
+
+
+def get_hint_state_path(storage_path):
+    """获取索引生成状态的缓存路径"""
+    return get_cache_dir(storage_path) / 'solution_hints_state.pickle'
+
+
+class SolvedHistory(CachedState):
+    """各日文件中已解决记录的 (问题描述, 解决方案, 相关文档)，可增量更新并缓存
+
+    terms 缓存各问题描述的检索词，重新生成索引时不必再次分词。
+    """
+
+    STATE_VERSION = HINT_STATE_VERSION
+    TRANSIENT = ('days_parsed', 'days_removed')
+
+    def __init__(self):
+        self.sources = {}
+        self.days = {}
+        self.terms = {}
+        self.days_parsed = 0
+        self.days_removed = 0
+
+    def update(self, storage_path, cache=None):
+        """处理新增和改动过的日文件，移除已删除的日期，返回是否有变化"""
+        seen = set()
+        for md_file in iter_day_files(storage_path):
+            date_str = md_file.stem
+            seen.add(date_str)
+            stamp = list(file_stamp(md_file))
+            if self.sources.get(date_str) == stamp:
+                continue
+
+            if cache is not None:
+                records = cache.load(md_file, date_str, parse_day_records)
+            else:
+                records = parse_day_records(md_file, date_str)
+            self.days[date_str] = [
+                (r.problem.strip(), r.solution.strip(), r.docs.strip()) for r in records
+                if classify_status(r.status) == 'resolved'
+                and r.problem.strip() not in EMPTY_VALUES and r.solution.strip() not in EMPTY_VALUES
+            ]
+            self.sources[date_str] = stamp
+            self.days_parsed += 1
+
+        for date_str in [d for d in self.days if d not in seen]:
+            del self.days[date_str]
+            del self.sources[date_str]
+            self.days_removed += 1
+        return bool(self.days_parsed or self.days_removed)
+
+    def build_index(self):
+        """按 (问题描述, 解决方案) 去重生成提示索引，相关文档和日期取最近一次"""
+        solved = {}
+        for date_str in sorted(self.days):
+            for problem, solution, doc_refs in self.days[date_str]:
+                entry = solved.get((problem, solution))
+                count = entry[4] if entry else 0
+                if doc_refs in EMPTY_VALUES:
+                    doc_refs = entry[2] if entry else ''
+                solved[(problem, solution)] = (problem, solution, doc_refs, date_str, count + 1)
+
+        terms = {}
+        doc_terms = []
+        for problem, _ in solved:
+            problem_terms = self.terms.get(problem)
+            if problem_terms is None:
+                problem_terms = tuple(shingles(problem))
+            terms[problem] = problem_terms
+            doc_terms.append(problem_terms)
+        # 只保留仍在使用的问题描述的检索词
+        self.terms = terms
+        return HintIndex.build(list(solved.values()), doc_terms)
+
+
+def build_hints(storage_path, rebuild=False):
+    """同步日文件的改动，有变化（或索引不存在）时重新生成提示索引，返回 (状态, 索引, 是否重新生成)"""
+    state_path = get_hint_state_path(storage_path)
+    index_path = get_hint_index_path(storage_path)
+    history = SolvedHistory() if rebuild else SolvedHistory.load(state_path)
+    changed = history.update(storage_path, ParseCache(storage_path))
+
+    index = None if changed else HintIndex.load(index_path)
+    if index is not None:
+        return history, index, False
+
+    index = history.build_index()
+    index.save(index_path)
+    history.save(state_path)
+    return history, index, True
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='生成历史解决方案提示索引（keyword_router 路由到 usage-observer 时附带相似问题的解决方案）',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  # 增量更新索引（只重新解析改动过的日文件）
+  python build_hints.py
+
+  # 丢弃缓存后重新生成
+  python build_hints.py --rebuild
+
+  # 查看某段描述会得到的提示
+  python build_hints.py --query "npm install 报错 依赖冲突"
+        """
+    )
+    parser.add_argument('--rebuild', action='store_true', help='丢弃缓存后重新生成')
+    parser.add_argument('--query', help='生成后用这段文本查询相似的已解决问题')
+    parser.add_argument('--top', type=int, default=HINT_TOP_K, help=f'查询返回的条数（默认 {HINT_TOP_K}）')
+    parser.add_argument('--json', action='store_true', help='查询结果以 JSON 输出')
+
+    args = parser.parse_args()
+    storage_path = get_storage_path()
+
+    if not storage_path.exists():
+        print(f"存储目录不存在: {storage_path}")
+        return 1
+
+    history, index, rebuilt = build_hints(storage_path, args.rebuild)
+
+    if args.query is None:
+        action = '已更新' if rebuilt else '已是最新'
+        print(f"[OK] 提示索引{action}: {len(index)} 条已解决问题，{len(index.postings)} 个检索词"
+              f"（重新解析 {history.days_parsed} 个日文件）")
+        return 0
+
+    hints = index.lookup(args.query, args.top)
+    if args.json:
+        print(json.dumps(hints, ensure_ascii=False, indent=2))
+        return 0
+
+    if not hints:
+        print("没有相似的已解决问题")
+        return 0
+    for i, hint in enumerate(hints, 1):
+        print(f"{i}. {hint['problem']}  (相似度 {hint['score']:.2f}，{hint['date']}，共 {hint['count']} 次)")
+        print(f"   解决方案: {hint['solution']}")
+        if hint['docs'] not in EMPTY_VALUES:
+            print(f"   相关文档: {hint['docs']}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,155 +5,63 @@ Claude Session Auto Tracker - 查看会话记录
 """
 
 import argparse
-import os
 import sys
+from collections import deque
 from datetime import datetime, timedelta
 from pathlib import Path
 
+# 与 usage-recorder 共用插件根目录下的 tracker_core 包（解析、解析缓存、SQLite 索引、统计）
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
 
-def get_storage_path():
-    """获取存储路径"""
-    custom_path = os.environ.get('CLAUDE_ANALYSIS_PATH')
-    if custom_path:
-        return Path(custom_path)
-
-    home = Path.home()
-    return home / '.claude' / 'claude-analysis'
-
-
-def parse_records_from_file(md_file):
-    """从 markdown 文件解析记录"""
-    if not md_file.exists():
-        return []
-
-    content = md_file.read_text(encoding='utf-8')
-    records = []
-    lines = content.split('\n')
-    in_table = False
-    date_str = md_file.stem  # 文件名即日期
-
-    for line in lines:
-        if line.startswith('| 时间戳 |'):
-            in_table = True
-            continue
-        if in_table and line.startswith('|') and '---' not in line:
-            parts = [p.strip() for p in line.split('|')[1:-1]]
-            if len(parts) >= 9 and parts[0] != '时间戳':
-                # 支持两种格式：旧版9列和完整12列
-                record = {
-                    'date': date_str,
-                    'timestamp': parts[0],
-                    'stage': parts[1],
-                    'step': parts[2],
-                    'problem': parts[3],
-                    'type': parts[4],
-                    'solution': parts[5],
-                    'time': parts[6] if len(parts) <= 9 else parts[8],
-                    'priority': parts[7] if len(parts) <= 9 else parts[9],
-                    'status': parts[8] if len(parts) <= 9 else parts[10],
-                    'docs': parts[6] if len(parts) > 9 else '-',
-                    'session': parts[7] if len(parts) > 9 else '-',
-                    'note': parts[11] if len(parts) > 11 else '-'
-                }
-                records.append(record)
-
-    return records
-
-
-def get_date_range(start_date, end_date):
-    """获取日期范围"""
-    dates = []
-    current = start_date
-    while current <= end_date:
-        dates.append(current)
-        current += timedelta(days=1)
-    return dates
-
-
-def view_today(storage_path):
-    """查看今天"""
-    today = datetime.now()
-    md_file = storage_path / f"{today.strftime('%Y-%m-%d')}.md"
-    return parse_records_from_file(md_file)
-
-
-def view_date(storage_path, date_str):
-    """查看指定日期"""
-    md_file = storage_path / f"{date_str}.md"
-    return parse_records_from_file(md_file)
-
+from tracker_core.cache import ParseCache  # noqa: E402
+from tracker_core.cli import parse_date_arg  # noqa: E402
+from tracker_core.history import iter_records  # noqa: E402
+from tracker_core.paths import get_log_dir, get_storage_path  # noqa: E402
+from tracker_core.stats import calculate_stats, stats_from_aggregate  # noqa: E402
+from tracker_core.store import RecordStore, is_enabled  # noqa: E402
 
-def view_week(storage_path):
-    """查看本周"""
-    today = datetime.now()
-    start_of_week = today - timedelta(days=today.weekday())
-    dates = get_date_range(start_of_week, today)
-
-    all_records = []
-    for date in dates:
-        md_file = storage_path / f"{date.strftime('%Y-%m-%d')}.md"
-        all_records.extend(parse_records_from_file(md_file))
+# 详细记录只显示最近的条数
+DISPLAY_LIMIT = 20
 
-    return all_records
-
-
-def view_month(storage_path):
-    """查看本月"""
-    today = datetime.now()
-    start_of_month = today.replace(day=1)
-    dates = get_date_range(start_of_month, today)
-
-    all_records = []
-    for date in dates:
-        md_file = storage_path / f"{date.strftime('%Y-%m-%d')}.md"
-        all_records.extend(parse_records_from_file(md_file))
-
-    return all_records
-
-
-def view_all(storage_path):
-    """查看所有"""
-    all_records = []
-    for md_file in sorted(storage_path.glob('*.md')):
-        all_records.extend(parse_records_from_file(md_file))
-    return all_records
 
+def keep_tail(records, tail):
+    """遍历记录的同时把最近的记录保留在定长 deque 中"""
+    for r in records:
+        tail.append(r)
+        yield r
 
-def calculate_stats(records):
-    """计算统计信息"""
-    total = len(records)
-    total_time = 0
-    solved = 0
-    pending = 0
-    type_counts = {}
-    stage_counts = {}
 
-    for r in records:
-        try:
-            if r['time'] and r['time'] != '-':
-                total_time += int(r['time'])
-        except (ValueError, TypeError):
-            pass
+def view_from_store(storage_path, start_date, end_date):
+    """从 SQLite 索引按日期范围逐条返回记录（生成器）"""
+    with RecordStore.open(storage_path) as store:
+        store.sync(storage_path, start_date, end_date)
+        yield from store.iter_query(start_date, end_date)
 
-        if r['status'] == '已解决':
-            solved += 1
-        elif r['status'] in ['待解决', '需跟进']:
-            pending += 1
 
-        ptype = r['type'] or '其他'
-        type_counts[ptype] = type_counts.get(ptype, 0) + 1
+def store_stats(storage_path, start_date, end_date):
+    """从 SQLite 索引按日期范围计算统计"""
+    with RecordStore.open(storage_path) as store:
+        store.sync(storage_path, start_date, end_date)
+        return stats_from_aggregate(store.aggregate(start_date, end_date))
 
-        stage = r['stage'] or '未分类'
-        stage_counts[stage] = stage_counts.get(stage, 0) + 1
 
-    return {
-        'total': total,
-        'total_time': total_time,
-        'solved': solved,
-        'pending': pending,
-        'type_counts': type_counts,
-        'stage_counts': stage_counts
-    }
+def get_view_range(args):
+    """根据参数确定查看的日期范围，返回 (开始日期, 结束日期, 标题)；None 表示不限"""
+    today = datetime.now()
+    today_str = today.strftime('%Y-%m-%d')
+    if args.today:
+        return today_str, today_str, "今日记录"
+    if args.date:
+        return args.date, args.date, f"{args.date} 记录"
+    if args.week:
+        start_of_week = today - timedelta(days=today.weekday())
+        return start_of_week.strftime('%Y-%m-%d'), today_str, "本周记录"
+    if args.month:
+        return today.replace(day=1).strftime('%Y-%m-%d'), today_str, "本月记录"
+    if args.all:
+        return None, None, "所有记录"
+    # 默认查看今天
+    return today_str, today_str, "今日记录"
 
 
 def format_output(records, stats, show_stats=False, title="记录"):
@@ -164,32 +72,74 @@ def format_output(records, stats, show_stats=False, title="记录"):
 
     if show_stats:
         print(f"\n【统计信息】")
-        print(f"  总记录数: {stats['total']}")
+        print(f"  总记录数: {stats['total_count']}")
         print(f"  总耗时: {stats['total_time']} 分钟")
-        print(f"  已解决: {stats['solved']} | 待解决: {stats['pending']}")
+        print(f"  已解决: {stats['resolved']} | 待解决: {stats['pending'] + stats['follow_up']}")
 
-        if stats['type_counts']:
+        if stats['type_distribution']:
             print(f"\n  问题类型分布:")
-            for ptype, count in sorted(stats['type_counts'].items(), key=lambda x: -x[1]):
-                print(f"    - {ptype}: {count}")
+            for ptype, count in sorted(stats['type_distribution'].items(), key=lambda x: -x[1]):
+                print(f"    - {ptype or '其他'}: {count}")
 
     print(f"\n【详细记录】")
     print("-" * 100)
     print(f"{'时间':<12} {'阶段':<10} {'问题':<30} {'类型':<10} {'状态':<8}")
     print("-" * 100)
 
-    for r in records[-20:]:  # 只显示最近20条
-        time_str = f"{r['date']} {r['timestamp']}" if 'date' in r else r['timestamp']
-        problem = r['problem'][:28] + '..' if len(r['problem']) > 30 else r['problem']
-        print(f"{time_str:<12} {r['stage']:<10} {problem:<30} {r['type']:<10} {r['status']:<8}")
+    for r in deque(records, maxlen=DISPLAY_LIMIT):  # 只显示最近20条
+        time_str = f"{r.date} {r.timestamp}"
+        problem = r.problem[:28] + '..' if len(r.problem) > 30 else r.problem
+        print(f"{time_str:<12} {r.stage:<10} {problem:<30} {r.type:<10} {r.status:<8}")
 
     print("-" * 100)
 
 
+def write_rows(records, f):
+    """把记录逐行写成表格行，并原样返回记录（生成器）"""
+    for r in records:
+        f.write(f"| {r.date} | {r.timestamp} | {r.stage} | {r.step or '-'} | "
+                f"{r.problem} | {r.type} | {r.solution} | "
+                f"{r.docs or '-'} | {r.session or '-'} | {r.time} | {r.status} |\n")
+        yield r
+
+
+def export_records(records, stats, title, output_path):
+    """导出到文件：记录先写入临时文件并同时统计，再在统计区之后拼接，records 只遍历一次"""
+    import shutil
+    import tempfile
+
+    with tempfile.TemporaryFile('w+', encoding='utf-8') as rows:
+        if stats is None:
+            stats = calculate_stats(write_rows(records, rows))
+        else:
+            deque(write_rows(records, rows), maxlen=0)
+
+        if stats['total_count'] == 0:
+            print(f"暂无 {title}")
+            return 0
+
+        rows.seek(0)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(f"# {title}\n\n")
+            f.write(f"## 统计\n\n")
+            f.write(f"- 总记录数: {stats['total_count']}\n")
+            f.write(f"- 总耗时: {stats['total_time']} 分钟\n")
+            f.write(f"- 已解决: {stats['resolved']}\n")
+            f.write(f"- 待解决: {stats['pending'] + stats['follow_up']}\n\n")
+
+            f.write("## 详细记录\n\n")
+            f.write("| 日期 | 时间 | 阶段 | 步骤 | 问题 | 类型 | 解决方案 | 相关文档 | Session ID | 耗时 | 状态 |\n")
+            f.write("|------|------|------|------|------|------|----------|----------|------------|------|------|\n")
+            shutil.copyfileobj(rows, f)
+
+    print(f"已导出到: {output_path}")
+    return 0
+
+
 def main():
     parser = argparse.ArgumentParser(description='查看 Claude Code 会话记录')
     parser.add_argument('--today', '-t', action='store_true', help='查看今天')
-    parser.add_argument('--date', '-d', help='指定日期（YYYY-MM-DD）')
+    parser.add_argument('--date', '-d', type=parse_date_arg, help='指定日期（YYYY-MM-DD）')
     parser.add_argument('--week', '-w', action='store_true', help='查看本周')
     parser.add_argument('--month', '-m', action='store_true', help='查看本月')
     parser.add_argument('--all', '-a', action='store_true', help='查看所有')
@@ -204,58 +154,39 @@ def main():
         print(f"存储目录不存在: {storage_path}")
         return 1
 
-    # 获取记录
-    if args.today:
-        records = view_today(storage_path)
-        title = "今日记录"
-    elif args.date:
-        records = view_date(storage_path, args.date)
-        title = f"{args.date} 记录"
-    elif args.week:
-        records = view_week(storage_path)
-        title = "本周记录"
-    elif args.month:
-        records = view_month(storage_path)
-        title = "本月记录"
-    elif args.all:
-        records = view_all(storage_path)
-        title = "所有记录"
+    # 日志模式下按需渲染落后于日志的 markdown 视图（没有日志时不加载写入模块）
+    if get_log_dir(storage_path).is_dir():
+        from tracker_core.writer import render_stale_days
+        render_stale_days(storage_path)
+
+    # 获取记录（生成器，逐条读取）
+    start_date, end_date, title = get_view_range(args)
+    stats = None
+    if is_enabled(storage_path):
+        # 启用了 SQLite 索引时直接查询索引，统计由 SQL 完成
+        stats = store_stats(storage_path, start_date, end_date)
+        records = view_from_store(storage_path, start_date, end_date)
     else:
-        # 默认查看今天
-        records = view_today(storage_path)
-        title = "今日记录"
-
-    if not records:
-        print(f"暂无 {title}")
-        return 0
-
-    # 计算统计
-    stats = calculate_stats(records)
+        # 只加载范围内的日文件，未改动的日文件使用解析缓存
+        records = iter_records(storage_path, ParseCache(storage_path), start_date, end_date)
 
     # 输出
     if args.output:
         # 保存到文件
-        content = f"# {title}\n\n"
-        content += f"## 统计\n\n"
-        content += f"- 总记录数: {stats['total']}\n"
-        content += f"- 总耗时: {stats['total_time']} 分钟\n"
-        content += f"- 已解决: {stats['solved']}\n"
-        content += f"- 待解决: {stats['pending']}\n\n"
-
-        content += "## 详细记录\n\n"
-        content += "| 日期 | 时间 | 阶段 | 步骤 | 问题 | 类型 | 解决方案 | 相关文档 | Session ID | 耗时 | 状态 |\n"
-        content += "|------|------|------|------|------|------|----------|----------|------------|------|------|\n"
-
-        for r in records:
-            content += f"| {r.get('date', '-')} | {r['timestamp']} | {r['stage']} | {r.get('step', '-')} | "
-            content += f"{r['problem']} | {r['type']} | {r['solution']} | "
-            content += f"{r.get('docs', '-')} | {r.get('session', '-')} | {r['time']} | {r['status']} |\n"
-
-        Path(args.output).write_text(content, encoding='utf-8')
-        print(f"已导出到: {args.output}")
+        return export_records(records, stats, title, args.output)
+
+    # 单次遍历：计算统计的同时保留最近的记录用于显示
+    tail = deque(maxlen=DISPLAY_LIMIT)
+    if stats is None:
+        stats = calculate_stats(keep_tail(records, tail))
     else:
-        format_output(records, stats, args.stats, title)
+        tail.extend(records)
+
+    if stats['total_count'] == 0:
+        print(f"暂无 {title}")
+        return 0
 
+    format_output(tail, stats, args.stats, title)
     return 0
 
 
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Claude Session Tracker - 二进制记录段（可选）
+markdown 日文件与二进制段文件互相转换：pack 把日文件按月打包为 segments/YYYY-MM.seg，
+unpack 由段文件重新生成 markdown 日文件；stats 直接在 mmap 的定长列上做范围统计，不解析任何文本
+"""
+
+import argparse
+import calendar
+import sys
+import time
+from pathlib import Path
+
+# 共用插件根目录下的 tracker_core 包
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from tracker_core.cli import parse_date_arg  # noqa: E402
+from tracker_core.history import iter_day_files  # noqa: E402
+from tracker_core.parser import parse_day_records  # noqa: E402
+from tracker_core.paths import get_storage_path  # noqa: E402
+from tracker_core.rollup import merge_aggregate, new_aggregate  # noqa: E402
+from tracker_core.segment import Segment, get_segment_dir, write_segment  # noqa: E402
+from tracker_core.stats import stats_from_aggregate  # noqa: E402
+from tracker_core.writer import render_markdown, write_text_atomic  # noqa: E402
+
+
+def pack_days(storage_path, segment_dir, start_date=None, end_date=None):
+    """范围内的日文件按月打包为段文件，返回 [(段文件, 日文件数, 记录数)]
+
+    每个段文件覆盖整月，范围两端所在月份扩展为整月，避免只用部分日期覆盖已有的段文件。
+    """
+    if start_date:
+        start_date = start_date[:8] + '01'
+    if end_date:
+        year, month = int(end_date[:4]), int(end_date[5:7])
+        end_date = f'{end_date[:8]}{calendar.monthrange(year, month)[1]:02d}'
+    months = {}
+    for md_file in iter_day_files(storage_path, start_date, end_date):
+        months.setdefault(md_file.stem[:7], []).append(md_file)
+
+    packed = []
+    for month, md_files in sorted(months.items()):
+        records = []
+        for md_file in md_files:
+            records.extend(parse_day_records(md_file, md_file.stem))
+        segment_path = segment_dir / f'{month}.seg'
+        packed.append((segment_path, len(md_files), write_segment(segment_path, records)))
+    return packed
+
+
+def unpack_segment(segment, output_dir, force=False):
+    """由段文件生成 markdown 日文件，返回 (写入的日期, 跳过的已存在日期)"""
+    days = {}
+    for r in segment.iter_records():
+        record = r.to_dict()
+        days.setdefault(record.pop('date'), []).append(record)
+
+    written, skipped = [], []
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for date_str, records in days.items():
+        md_path = output_dir / f'{date_str}.md'
+        if md_path.exists() and not force:
+            skipped.append(date_str)
+            continue
+        write_text_atomic(md_path, render_markdown(date_str, records))
+        written.append(date_str)
+    return written, skipped
+
+
+def iter_segment_paths(segment_dir, start_date=None, end_date=None):
+    """按月份顺序列出与日期范围相交的段文件"""
+    for path in sorted(segment_dir.glob('*.seg')):
+        month = path.stem
+        if (start_date and month < start_date[:7]) or (end_date and month > end_date[:7]):
+            continue
+        yield path
+
+
+def segment_stats(segment_dir, start_date=None, end_date=None):
+    """在段文件上做范围统计，返回 (统计, 读取的段文件数)"""
+    aggregate = new_aggregate()
+    opened = 0
+    for path in iter_segment_paths(segment_dir, start_date, end_date):
+        segment = Segment.open(path)
+        if segment is None:
+            print(f"跳过无法读取的段文件: {path}", file=sys.stderr)
+            continue
+        with segment:
+            merge_aggregate(aggregate, segment.aggregate(start_date, end_date))
+        opened += 1
+    return stats_from_aggregate(aggregate), opened
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='markdown 日文件与二进制记录段互相转换',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  # 全部历史按月打包为 segments/YYYY-MM.seg
+  python record_segments.py pack
+
+  # 只打包指定范围
+  python record_segments.py pack --from 2024-01-01 --to 2024-03-31
+
+  # 在段文件上统计（不解析 markdown）
+  python record_segments.py stats --from 2024-01-01
+
+  # 由段文件恢复 markdown 日文件（默认不覆盖已存在的日文件）
+  python record_segments.py unpack segments/2024-01.seg --output restored/
+        """
+    )
+    parser.add_argument('--segments', type=Path, help='段文件目录（默认为存储目录下的 segments/）')
+    subparsers = parser.add_subparsers(dest='command')
+
+    pack_parser = subparsers.add_parser('pack', help='markdown 日文件按月打包为段文件')
+    stats_parser = subparsers.add_parser('stats', help='在段文件上做范围统计')
+    for sub in (pack_parser, stats_parser):
+        sub.add_argument('--from', dest='from_date', type=parse_date_arg, help='起始日期 (YYYY-MM-DD，含)')
+        sub.add_argument('--to', dest='to_date', type=parse_date_arg, help='结束日期 (YYYY-MM-DD，含)')
+
+    unpack_parser = subparsers.add_parser('unpack', help='由段文件生成 markdown 日文件')
+    unpack_parser.add_argument('files', nargs='+', type=Path, help='段文件')
+    unpack_parser.add_argument('--output', type=Path, help='输出目录（默认为存储目录）')
+    unpack_parser.add_argument('--force', action='store_true', help='覆盖已存在的日文件')
+
+    args = parser.parse_args()
+    storage_path = get_storage_path()
+    segment_dir = args.segments or get_segment_dir(storage_path)
+
+    if args.command == 'pack':
+        if not storage_path.exists():
+            print(f"存储目录不存在: {storage_path}")
+            return 1
+        start = time.perf_counter()
+        packed = pack_days(storage_path, segment_dir, args.from_date, args.to_date)
+        for path, days, count in packed:
+            print(f"  {path.name}: {days} 个日文件，{count} 条记录，{path.stat().st_size / 1024:.1f} KB")
+        print(f"[OK] 已打包 {len(packed)} 个段文件（{time.perf_counter() - start:.2f} s）: {segment_dir}")
+        return 0
+
+    if args.command == 'unpack':
+        output_dir = args.output or storage_path
+        for path in args.files:
+            segment = Segment.open(path)
+            if segment is None:
+                print(f"错误: 无法读取段文件 {path}")
+                return 1
+            with segment:
+                written, skipped = unpack_segment(segment, output_dir, args.force)
+            print(f"  {path.name}: 写入 {len(written)} 个日文件")
+            if skipped:
+                print(f"    已存在未覆盖（--force 覆盖）: {', '.join(skipped)}")
+        print(f"[OK] 输出目录: {output_dir}")
+        return 0
+
+    if args.command == 'stats':
+        start = time.perf_counter()
+        stats, opened = segment_stats(segment_dir, args.from_date, args.to_date)
+        elapsed = (time.perf_counter() - start) * 1000
+        if not opened:
+            print(f"没有段文件，请先运行 python record_segments.py pack: {segment_dir}")
+            return 1
+        print(f"{args.from_date or '最早'} ~ {args.to_date or '最新'}（{opened} 个段文件，{elapsed:.1f} ms）")
+        print(f"  记录数: {stats['total_count']}  总耗时: {stats['total_time']} 分钟")
+        print(f"  已解决: {stats['resolved']}  待解决: {stats['pending']}  需跟进: {stats['follow_up']}")
+        types = ', '.join(f"{name} {count}" for name, count in
+                          sorted(stats['type_distribution'].items(), key=lambda item: -item[1]))
+        print(f"  类型分布: {types}")
+        return 0
+
+    parser.print_help()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -5,234 +5,30 @@ Claude Session Tracker - 记录会话数据到本地 markdown 文件
 """
 
 import argparse
-import os
+import io
+import json
 import sys
-from datetime import datetime
+import time
+from collections import defaultdict
+from datetime import date, datetime
 from pathlib import Path
 
+# 共用插件根目录下的 tracker_core 包
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
 
-def get_storage_path():
-    """获取存储路径"""
-    custom_path = os.environ.get('CLAUDE_ANALYSIS_PATH')
-    if custom_path:
-        return Path(custom_path)
-
-    # 默认路径：用户主目录/.claude/claude-analysis
-    home = Path.home()
-    return home / '.claude' / 'claude-analysis'
-
-
-def ensure_directory(path):
-    """确保目录存在"""
-    path.mkdir(parents=True, exist_ok=True)
-    return path
-
-
-def get_markdown_path(date_str=None):
-    """获取指定日期的 markdown 文件路径"""
-    if date_str is None:
-        date_str = datetime.now().strftime('%Y-%m-%d')
-
-    storage_path = ensure_directory(get_storage_path())
-    return storage_path / f'{date_str}.md'
-
-
-def parse_existing_records(content):
-    """解析已有的记录，提取表格数据"""
-    records = []
-    lines = content.split('\n')
-    in_table = False
-
-    for line in lines:
-        line = line.strip()
-        if line.startswith('| 时间戳 '):
-            in_table = True
-            continue
-        if in_table and line.startswith('|') and '---' in line:
-            continue
-        if in_table and line.startswith('|') and len(line) > 10:
-            # 解析表格行
-            parts = [p.strip() for p in line.split('|')[1:-1]]
-            if len(parts) >= 10 and parts[0] != '时间戳':
-                records.append(parts)
-
-    return records
-
-
-def generate_markdown_header(date_str):
-    """生成 markdown 文件头部"""
-    return f"""# Claude Code 会话记录 - {date_str}
-
-## 概览
-
-- 记录总数: 0
-- 总耗时: 0 分钟
-- 已解决问题: 0
-- 待解决问题: 0
-
-## 问题分布
-
-| 类型 | 数量 |
-|------|------|
-| 工具错误 | 0 |
-| 理解偏差 | 0 |
-| 执行失败 | 0 |
-| 性能问题 | 0 |
-| 其他 | 0 |
-
-## 详细记录
-
-| 时间戳 | 阶段 | 步骤 | 问题 | 类型 | 解决方案 | 相关文档 | Session ID | 耗时 | 优先级 | 状态 | 备注 |
-|--------|------|------|------|------|----------|----------|------------|------|--------|------|------|
-"""
-
-
-def update_summary(content, new_record, is_new_file=False):
-    """更新概览统计信息"""
-    lines = content.split('\n')
-    updated_lines = []
-
-    # 统计变量
-    total_records = 0
-    total_time = 0
-    resolved = 0
-    pending = 0
-    type_counts = {
-        '工具错误': 0,
-        '理解偏差': 0,
-        '执行失败': 0,
-        '性能问题': 0,
-        '其他': 0
-    }
-
-    # 解析现有记录并统计
-    in_table = False
-    for line in lines:
-        stripped = line.strip()
-        if stripped.startswith('| 时间戳 '):
-            in_table = True
-            continue
-        if in_table and stripped.startswith('|') and '---' not in stripped and '时间戳' not in stripped:
-            parts = [p.strip() for p in stripped.split('|')[1:-1]]
-            if len(parts) >= 11:
-                total_records += 1
-                try:
-                    time_val = int(parts[8]) if parts[8].isdigit() else 0
-                    total_time += time_val
-                except:
-                    pass
-
-                status = parts[10] if len(parts) > 10 else ''
-                if '已解决' in status:
-                    resolved += 1
-                elif '待解决' in status or '需跟进' in status:
-                    pending += 1
-
-                prob_type = parts[4] if len(parts) > 4 else '其他'
-                if prob_type in type_counts:
-                    type_counts[prob_type] += 1
-                else:
-                    type_counts['其他'] += 1
-
-    # 对于新文件，记录已经在表格中，不需要再加1
-    # 对于已有文件，需要加1
-    if not is_new_file:
-        total_records += 1
-        try:
-            total_time += int(new_record['time']) if new_record.get('time') else 0
-        except:
-            pass
-
-        if new_record.get('status'):
-            if '已解决' in new_record['status']:
-                resolved += 1
-            elif '待解决' in new_record['status'] or '需跟进' in new_record['status']:
-                pending += 1
-
-        if new_record.get('type'):
-            if new_record['type'] in type_counts:
-                type_counts[new_record['type']] += 1
-            else:
-                type_counts['其他'] += 1
-
-    # 更新概览行
-    for i, line in enumerate(lines):
-        if line.startswith('- 记录总数:'):
-            updated_lines.append(f'- 记录总数: {total_records}')
-        elif line.startswith('- 总耗时:'):
-            updated_lines.append(f'- 总耗时: {total_time} 分钟')
-        elif line.startswith('- 已解决问题:'):
-            updated_lines.append(f'- 已解决问题: {resolved}')
-        elif line.startswith('- 待解决问题:'):
-            updated_lines.append(f'- 待解决问题: {pending}')
-        elif line.startswith('| 工具错误 |'):
-            updated_lines.append(f"| 工具错误 | {type_counts['工具错误']} |")
-        elif line.startswith('| 理解偏差 |'):
-            updated_lines.append(f"| 理解偏差 | {type_counts['理解偏差']} |")
-        elif line.startswith('| 执行失败 |'):
-            updated_lines.append(f"| 执行失败 | {type_counts['执行失败']} |")
-        elif line.startswith('| 性能问题 |'):
-            updated_lines.append(f"| 性能问题 | {type_counts['性能问题']} |")
-        elif line.startswith('| 其他 |'):
-            updated_lines.append(f"| 其他 | {type_counts['其他']} |")
-        else:
-            updated_lines.append(line)
-
-    return '\n'.join(updated_lines)
-
-
-def append_record(content, record):
-    """追加新记录到表格"""
-    timestamp = datetime.now().strftime('%H:%M')
-
-    # 构建表格行
-    row = [
-        timestamp,
-        record.get('stage', ''),
-        record.get('step', ''),
-        record.get('problem', ''),
-        record.get('type', '其他'),
-        record.get('solution', ''),
-        record.get('docs', ''),
-        record.get('session', ''),
-        record.get('time', ''),
-        record.get('priority', '中'),
-        record.get('status', '待解决'),
-        record.get('note', '')
-    ]
-
-    # 转义表格中的特殊字符，将 None 替换为空字符串
-    row = [str(cell).replace('|', '\\|').replace('\n', ' ') if cell is not None else '' for cell in row]
-
-    table_row = '| ' + ' | '.join(row) + ' |'
-
-    # 找到表格结束位置并插入新行
-    lines = content.split('\n')
-    table_end = len(lines)
-
-    for i, line in enumerate(lines):
-        if line.strip().startswith('| 时间戳 '):
-            # 找到表头后的分隔行
-            if i + 1 < len(lines) and '---' in lines[i + 1]:
-                # 找到表格的最后一行
-                for j in range(i + 2, len(lines)):
-                    if not lines[j].strip().startswith('|'):
-                        table_end = j
-                        break
-                else:
-                    table_end = len(lines)
-
-    lines.insert(table_end, table_row)
-    return '\n'.join(lines)
+from tracker_core import log as record_log  # noqa: E402
+from tracker_core.cli import parse_date_arg  # noqa: E402
+from tracker_core.paths import get_storage_path  # noqa: E402
+from tracker_core.writer import RECORD_FIELDS, list_stale_days, render_day, write_records  # noqa: E402
 
 
 def record_session(args):
     """记录会话数据"""
     date_str = args.date or datetime.now().strftime('%Y-%m-%d')
-    md_path = get_markdown_path(date_str)
 
     # 构建记录数据
     record = {
+        'timestamp': datetime.now().strftime('%H:%M'),
         'stage': args.stage,
         'step': args.step,
         'problem': args.problem,
@@ -246,26 +42,120 @@ def record_session(args):
         'note': args.note
     }
 
-    # 读取或创建文件
-    if md_path.exists():
-        content = md_path.read_text(encoding='utf-8')
-        content = update_summary(content, record, is_new_file=False)
-        content = append_record(content, record)
-    else:
-        content = generate_markdown_header(date_str)
-        content = append_record(content, record)
-        content = update_summary(content, record, is_new_file=True)
-
-    # 写入文件
-    md_path.write_text(content, encoding='utf-8')
+    path = write_records(date_str, [record], storage_mode=getattr(args, 'storage', None))
 
-    print(f"[OK] 已记录到: {md_path}")
-    print(f"     时间: {datetime.now().strftime('%H:%M')}")
+    print(f"[OK] 已记录到: {path}")
+    print(f"     时间: {record['timestamp']}")
     print(f"     阶段: {record['stage']}")
     print(f"     问题: {record['problem']}")
     return 0
 
 
+# 批量导入时缺省字段的取值（与命令行参数默认值一致）
+BATCH_DEFAULTS = {'type': '其他', 'priority': '中', 'status': '待解决'}
+
+
+def iter_batch_rows(stream, fmt=None):
+    """逐行读取批量导入的原始记录（dict），返回 (行号, 记录) 或 (行号, None) 表示无法解析
+
+    fmt 为 None 时按首个非空字符判断：'{' 为 JSONL，否则为带表头的 CSV。
+    识别格式时跳过的开头空行计入行号，报告的行号与原始输入一致。
+    """
+    leading = 0
+    if fmt is None:
+        first = ''
+        for first in stream:
+            if first.strip():
+                break
+            leading += 1
+        fmt = 'jsonl' if first.lstrip().startswith('{') else 'csv'
+        lines = _chain_first(first, stream)
+    else:
+        lines = stream
+
+    if fmt == 'csv':
+        import csv
+
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield leading + reader.line_num, row
+        return
+
+    for line_num, line in enumerate(lines, leading + 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            row = None
+        yield line_num, row if isinstance(row, dict) else None
+
+
+def _chain_first(first, stream):
+    yield first
+    yield from stream
+
+
+def normalize_batch_record(row, default_date, default_timestamp):
+    """把一条原始记录整理为 (日期, 记录)；缺少阶段或问题、日期格式错误时返回 None"""
+    record = {}
+    for field in RECORD_FIELDS:
+        value = row.get(field)
+        value = '' if value is None else str(value).replace('\n', ' ').strip()
+        record[field] = value or BATCH_DEFAULTS.get(field, '')
+    if not record['stage'] or not record['problem']:
+        return None
+
+    # 日期即日文件名，统一为 YYYY-MM-DD，不会出现 2026-1-5.md 这样的文件
+    try:
+        date_str = date.fromisoformat(str(row.get('date') or default_date).strip()).isoformat()
+    except ValueError:
+        return None
+    record['timestamp'] = str(row.get('timestamp') or default_timestamp).strip()
+    return date_str, record
+
+
+def read_batch(stream, fmt=None, default_date=None):
+    """读取批量记录并按日期分组，返回 ({日期: [记录]}, 跳过的行号列表)"""
+    now = datetime.now()
+    default_date = default_date or now.strftime('%Y-%m-%d')
+    default_timestamp = now.strftime('%H:%M')
+
+    by_date = defaultdict(list)
+    skipped = []
+    for line_num, row in iter_batch_rows(stream, fmt):
+        item = normalize_batch_record(row, default_date, default_timestamp) if row else None
+        if item is None:
+            skipped.append(line_num)
+            continue
+        by_date[item[0]].append(item[1])
+    return by_date, skipped
+
+
+def record_batch(args):
+    """批量导入：从文件或标准输入读取 JSONL/CSV 记录"""
+    start = time.perf_counter()
+    if args.batch == '-':
+        # 与文件一致使用 utf-8-sig，带 BOM 的 CSV 表头不会变成 '\ufeffstage'
+        stream = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8-sig', newline='')
+        by_date, skipped = read_batch(stream, args.batch_format, args.date)
+    else:
+        with open(args.batch, encoding='utf-8-sig', newline='') as stream:
+            by_date, skipped = read_batch(stream, args.batch_format, args.date)
+
+    for date_str in sorted(by_date):
+        write_records(date_str, by_date[date_str], storage_mode=args.storage)
+    elapsed = time.perf_counter() - start
+
+    total = sum(len(records) for records in by_date.values())
+    print(f"[OK] 已导入 {total} 条记录到 {len(by_date)} 个日文件")
+    print(f"     耗时: {elapsed:.2f} 秒（{total / elapsed if elapsed else 0:.0f} 条/秒）")
+    if skipped:
+        preview = ', '.join(map(str, skipped[:10])) + (' ...' if len(skipped) > 10 else '')
+        print(f"[WARN] 跳过 {len(skipped)} 行（缺少阶段/问题或格式错误）: 第 {preview} 行", file=sys.stderr)
+    return 0 if total or not skipped else 1
+
+
 def interactive_record():
     """交互式记录模式"""
     print("=== Claude Session Tracker - 交互式记录 ===\n")
@@ -325,6 +215,7 @@ def interactive_record():
         for key, value in record.items():
             setattr(args, key, value)
         args.date = None
+        args.storage = None
 
         return record_session(args)
     else:
@@ -341,9 +232,17 @@ def main():
   # 交互式记录
   python record_session.py --interactive
 
+  # 日志模式：追加写入 log/YYYY-MM-DD.jsonl，之后批量渲染 markdown
+  python record_session.py --storage log -s "调试" -p "测试失败"
+  python record_session.py --render
+
   # 命令行记录
   python record_session.py -s "代码编写" -p "Skill 未触发" -t "工具错误"
 
+  # 批量导入 JSONL/CSV（字段名同长参数，可含 date、timestamp 列），- 表示标准输入
+  python record_session.py --batch records.jsonl
+  cat records.csv | python record_session.py --batch - --batch-format csv
+
   # 完整记录
   python record_session.py \\
     --stage "调试" \\
@@ -376,10 +275,36 @@ def main():
     parser.add_argument('--status', default='待解决', choices=['已解决', '待解决', '需跟进'],
                         help='状态')
     parser.add_argument('--note', help='备注')
-    parser.add_argument('--date', help='指定日期 (格式: YYYY-MM-DD，默认为今天)')
+    parser.add_argument('--date', type=parse_date_arg, help='指定日期 (格式: YYYY-MM-DD，默认为今天)')
+    parser.add_argument('--storage', choices=['markdown', 'log'],
+                        help='存储模式（默认取环境变量 CLAUDE_ANALYSIS_STORAGE，否则为 markdown）')
+    parser.add_argument('--render', action='store_true',
+                        help='由追加日志渲染 markdown 视图（配合 --date 只渲染指定日期）')
+    parser.add_argument('--batch', metavar='FILE',
+                        help='从 JSONL/CSV 文件批量导入记录（- 表示标准输入），按日期分组写入')
+    parser.add_argument('--batch-format', choices=['jsonl', 'csv'],
+                        help='批量导入格式（默认按内容自动识别）')
 
     args = parser.parse_args()
 
+    if args.batch:
+        return record_batch(args)
+
+    if args.render:
+        storage_path = get_storage_path()
+        if args.date:
+            # 只有 markdown 的日期没有可渲染的日志，渲染会用空视图覆盖已有记录
+            if not record_log.get_log_path(storage_path, args.date).exists():
+                print(f"错误: {args.date} 没有追加日志，无需渲染")
+                return 1
+            dates = [args.date]
+        else:
+            dates = list_stale_days(storage_path)
+        for date_str in dates:
+            render_day(date_str, storage_path)
+        print(f"[OK] 已渲染 {len(dates)} 个 markdown 文件")
+        return 0
+
     if args.interactive or (not args.stage and not args.problem):
         return interactive_record()
 
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Claude Session Tracker - SQLite 记录索引（可选）
+markdown 日文件仍是数据源，records.db 是带索引的派生副本：
+存在 records.db 时，查看脚本用 SQL 做日期范围查询和分组统计，不再逐个解析 markdown 文件；
+search 子命令在问题、解决方案、步骤、备注中全文检索（中文按二元组、英文按单词），按相关度排列
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# 共用插件根目录下的 tracker_core 包
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
+
+from tracker_core.cli import parse_date_arg  # noqa: E402
+from tracker_core.paths import get_log_dir, get_storage_path  # noqa: E402
+from tracker_core.store import RecordStore, get_db_path, is_enabled  # noqa: E402
+
+# 检索结果中每个字段最多显示的字符数
+SNIPPET_WIDTH = 80
+
+
+def shorten(text, width=SNIPPET_WIDTH):
+    """过长的字段截断显示"""
+    return text if len(text) <= width else text[:width - 1] + '…'
+
+
+def sync_store(store, storage_path):
+    """日志模式下先渲染落后于日志的 markdown 视图，再把改动过的日文件同步到索引，返回同步的日文件数"""
+    if get_log_dir(storage_path).is_dir():
+        from tracker_core.writer import render_stale_days
+        render_stale_days(storage_path)
+    return store.sync(storage_path)
+
+
+def search_records(args, storage_path):
+    """同步索引后全文检索并显示结果
+
+    records.db 存在即表示启用了索引（查看脚本随之改用 SQL），检索不自行创建它，需先 --import。
+    """
+    if not is_enabled(storage_path):
+        print("尚未建立索引，请先运行 python record_store.py --import")
+        return 1
+    query = ' '.join(args.query)
+    with RecordStore.open(storage_path) as store:
+        sync_store(store, storage_path)
+        start = time.perf_counter()
+        results = store.search(query, args.limit, args.from_date, args.to_date, args.any)
+        elapsed = (time.perf_counter() - start) * 1000
+
+    if not results:
+        print(f"没有找到与「{query}」相关的记录")
+        return 0
+
+    print(f"「{query}」的检索结果（前 {len(results)} 条，{elapsed:.1f} ms）:\n")
+    for i, (score, r) in enumerate(results, 1):
+        print(f"{i:>2}. {r.date} {r.timestamp}  [{r.type}] {r.status}  相关度 {score:.2f}")
+        print(f"    问题: {shorten(r.problem)}")
+        if r.solution and r.solution != '-':
+            print(f"    解决: {shorten(r.solution)}")
+        if r.note and r.note != '-':
+            print(f"    备注: {shorten(r.note)}")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='SQLite 记录索引',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  # 从已有 markdown 历史导入（创建 records.db 后查看脚本自动使用索引）
+  python record_store.py --import
+
+  # 删除索引，回到逐文件解析
+  python record_store.py --drop
+
+  # 全文检索（需先 --import；首次检索时建立全文索引）
+  python record_store.py search 构建失败
+  python record_store.py search npm timeout --any -n 20 --from 2024-01-01
+        """
+    )
+    parser.add_argument('--import', dest='do_import', action='store_true',
+                        help='从 markdown 历史导入/同步索引')
+    parser.add_argument('--drop', action='store_true', help='删除索引数据库')
+
+    subparsers = parser.add_subparsers(dest='command')
+    search_parser = subparsers.add_parser('search', help='全文检索历史记录')
+    search_parser.add_argument('query', nargs='+', help='检索词（多个词默认需全部匹配）')
+    search_parser.add_argument('-n', '--limit', type=int, default=10, help='最多显示条数（默认 10）')
+    search_parser.add_argument('--any', action='store_true', help='匹配任一检索词即可')
+    search_parser.add_argument('--from', dest='from_date', type=parse_date_arg, help='起始日期 (YYYY-MM-DD，含)')
+    search_parser.add_argument('--to', dest='to_date', type=parse_date_arg, help='结束日期 (YYYY-MM-DD，含)')
+
+    args = parser.parse_args()
+    storage_path = get_storage_path()
+
+    if args.command == 'search':
+        if not storage_path.exists():
+            print(f"存储目录不存在: {storage_path}")
+            return 1
+        return search_records(args, storage_path)
+
+    if args.drop:
+        db_path = get_db_path(storage_path)
+        if db_path.exists():
+            os.remove(db_path)
+        print(f"[OK] 已删除索引: {db_path}")
+        return 0
+
+    if args.do_import:
+        if not storage_path.exists():
+            print(f"存储目录不存在: {storage_path}")
+            return 1
+        with RecordStore.open(storage_path) as store:
+            imported = sync_store(store, storage_path)
+            total = store.aggregate()['total']
+        print(f"[OK] 已导入 {imported} 个日文件，索引共 {total} 条记录")
+        print(f"     数据库: {get_db_path(storage_path)}")
+        return 0
+
+    parser.print_help()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
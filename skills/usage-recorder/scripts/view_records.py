@@ -5,189 +5,172 @@ Claude Session Tracker - 查看会话记录
 """
 
 import argparse
-import os
 import re
 import sys
 from collections import defaultdict
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
+# 共用插件根目录下的 tracker_core 包
+sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
 
-def get_storage_path():
-    """获取存储路径"""
-    custom_path = os.environ.get('CLAUDE_ANALYSIS_PATH')
-    if custom_path:
-        return Path(custom_path)
-    return Path.home() / '.claude' / 'claude-analysis'
+from tracker_core.cache import ParseCache  # noqa: E402
+from tracker_core.cli import parse_date_arg  # noqa: E402
+from tracker_core.history import iter_records  # noqa: E402
+from tracker_core.paths import get_log_dir, get_storage_path  # noqa: E402
+from tracker_core.stats import add_to_stats, new_stats, stats_from_aggregate  # noqa: E402
+from tracker_core.store import RecordStore, is_enabled  # noqa: E402
 
 
-def get_all_records(storage_path=None):
-    """获取所有记录文件"""
-    if storage_path is None:
-        storage_path = get_storage_path()
+# --quarter 参数格式 YYYY-Qn
+QUARTER_ARG = re.compile(r'(\d{4})-?[Qq]([1-4])')
 
-    if not storage_path.exists():
-        return []
-
-    records = []
-    for md_file in sorted(storage_path.glob('*.md')):
-        if md_file.name.startswith('summary'):
-            continue
-        date_str = md_file.stem
-        records.extend(parse_markdown_file(md_file, date_str))
-
-    return records
-
-
-def parse_markdown_file(md_path, date_str):
-    """解析 markdown 文件提取记录"""
-    records = []
-    content = md_path.read_text(encoding='utf-8')
-    lines = content.split('\n')
-
-    in_table = False
-    for line in lines:
-        line = line.strip()
-
-        # 检测表格开始
-        if line.startswith('| 时间戳 '):
-            in_table = True
-            continue
-
-        # 跳过表头分隔行
-        if in_table and '---' in line and line.startswith('|'):
-            continue
-
-        # 解析表格行
-        if in_table and line.startswith('|') and len(line) > 10:
-            parts = [p.strip() for p in line.split('|')[1:-1]]
-            # 确保是数据行而不是表头
-            if len(parts) >= 11 and parts[0] != '时间戳':
-                record = {
-                    'date': date_str,
-                    'timestamp': parts[0],
-                    'stage': parts[1] if len(parts) > 1 else '',
-                    'step': parts[2] if len(parts) > 2 else '',
-                    'problem': parts[3] if len(parts) > 3 else '',
-                    'type': parts[4] if len(parts) > 4 else '',
-                    'solution': parts[5] if len(parts) > 5 else '',
-                    'docs': parts[6] if len(parts) > 6 else '',
-                    'session': parts[7] if len(parts) > 7 else '',
-                    'time': parts[8] if len(parts) > 8 else '',
-                    'priority': parts[9] if len(parts) > 9 else '',
-                    'status': parts[10] if len(parts) > 10 else '',
-                    'note': parts[11] if len(parts) > 11 else ''
-                }
-                records.append(record)
-
-    return records
-
-
-def filter_by_date(records, date_str):
-    """按日期过滤记录"""
-    return [r for r in records if r['date'] == date_str]
-
-
-def filter_by_week(records, year, week):
-    """按周过滤记录"""
-    filtered = []
-    for r in records:
-        try:
-            record_date = datetime.strptime(r['date'], '%Y-%m-%d')
-            if record_date.isocalendar()[0] == year and record_date.isocalendar()[1] == week:
-                filtered.append(r)
-        except:
-            pass
-    return filtered
-
-
-def filter_by_month(records, year, month):
-    """按月过滤记录"""
-    filtered = []
-    for r in records:
-        try:
-            record_date = datetime.strptime(r['date'], '%Y-%m-%d')
-            if record_date.year == year and record_date.month == month:
-                filtered.append(r)
-        except:
-            pass
-    return filtered
-
-
-def calculate_stats(records):
-    """计算统计数据"""
-    stats = {
-        'total_count': len(records),
-        'total_time': 0,
-        'resolved': 0,
-        'pending': 0,
-        'follow_up': 0,
-        'type_distribution': defaultdict(int),
-        'stage_distribution': defaultdict(int),
-        'priority_distribution': defaultdict(int),
-        'daily_counts': defaultdict(int)
-    }
 
-    for r in records:
-        # 时间统计
-        try:
-            time_val = int(r['time']) if r['time'] and r['time'].isdigit() else 0
-            stats['total_time'] += time_val
-        except:
-            pass
+def get_view_range(args):
+    """根据参数确定查看的日期范围，返回 (开始日期, 结束日期, 标题)；None 表示不限"""
+    now = datetime.now()
+    today = now.strftime('%Y-%m-%d')
+    if args.today:
+        return today, today, f"今日记录 ({today})"
+    if args.date:
+        return args.date, args.date, f"{args.date} 的记录"
+    if args.from_date or args.to_date:
+        start_date, end_date = args.from_date, args.to_date
+        return start_date, end_date, f"{start_date or '最早'} ~ {end_date or '最新'} 的记录"
+    if args.week:
+        year, week = now.isocalendar()[:2]
+        monday = now - timedelta(days=now.weekday())
+        sunday = monday + timedelta(days=6)
+        return monday.strftime('%Y-%m-%d'), sunday.strftime('%Y-%m-%d'), f"本周记录 ({year}-W{week:02d})"
+    if args.month:
+        first = now.replace(day=1)
+        last = (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        return first.strftime('%Y-%m-%d'), last.strftime('%Y-%m-%d'), f"本月记录 ({now.year}-{now.month:02d})"
+    if args.quarter is not None:
+        year, quarter = args.quarter or (now.year, (now.month - 1) // 3 + 1)
+        first = datetime(year, quarter * 3 - 2, 1)
+        last = (datetime(year, quarter * 3, 1) + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        return first.strftime('%Y-%m-%d'), last.strftime('%Y-%m-%d'), f"季度记录 ({year}-Q{quarter})"
+    if args.all:
+        return None, None, "所有记录"
+
+    # 默认显示今天
+    return today, today, f"今日记录 ({today})"
+
+
+def get_view_period(args):
+    """--week/--month/--quarter 对应的汇总周期，返回 (周期, 名称)；其他范围返回 None"""
+    from tracker_core.rollup import period_key
+
+    today = date.today()
+    if args.week:
+        return 'week', period_key('week', today)
+    if args.month:
+        return 'month', period_key('month', today)
+    if args.quarter is not None:
+        year, quarter = args.quarter or (today.year, (today.month - 1) // 3 + 1)
+        return 'quarter', f'{year}-Q{quarter}'
+    return None
+
+
+def view_summary(args, storage_path):
+    """只显示统计：读取 summary/ 下的预聚合汇总，不逐条读取记录
+
+    周报、月报、季报各读取一个周期汇总；其他范围由整月的月汇总和首尾的日汇总组合。
+    """
+    # 只在 --summary 时加载汇总模块
+    from tracker_core.rollup import Rollups
+
+    start_date, end_date, title = get_view_range(args)
+    rollups = Rollups(storage_path)
+    view_period = get_view_period(args)
+    if view_period is not None:
+        aggregate = rollups.period(*view_period)
+    else:
+        aggregate = rollups.range(start_date, end_date)
 
-        # 状态统计
-        status = r.get('status', '')
-        if '已解决' in status:
-            stats['resolved'] += 1
-        elif '待解决' in status:
-            stats['pending'] += 1
-        elif '需跟进' in status:
-            stats['follow_up'] += 1
+    if args.verbose:
+        print(f"[汇总] 重新解析 {rollups.days_parsed} 个日文件，"
+              f"重新组合 {rollups.periods_composed} 个周期汇总", file=sys.stderr)
 
-        # 类型分布
-        prob_type = r.get('type', '其他')
-        stats['type_distribution'][prob_type] += 1
+    if aggregate['total'] == 0:
+        print("没有找到记录")
+        return 0
 
-        # 阶段分布
-        stage = r.get('stage', '未分类')
-        stats['stage_distribution'][stage] += 1
+    print(f"\n{'=' * 80}")
+    print(f"  {title}")
+    print(f"{'=' * 80}")
+    display_stats(stats_from_aggregate(aggregate))
+    if args.daily:
+        display_daily_summary({
+            day: {'count': count, 'time': aggregate['date_time'][day],
+                  'resolved': aggregate['date_resolved'][day]}
+            for day, count in aggregate['date'].items()
+        })
+    return 0
 
-        # 优先级分布
-        priority = r.get('priority', '中')
-        stats['priority_distribution'][priority] += 1
 
-        # 每日计数
-        stats['daily_counts'][r['date']] += 1
+def view_from_store(args, storage_path):
+    """使用 SQLite 索引：范围查询和统计都由带索引的 SQL 完成"""
+    start_date, end_date, title = get_view_range(args)
 
-    return stats
+    with RecordStore.open(storage_path) as store:
+        imported = store.sync(storage_path, start_date, end_date)
+        if args.verbose:
+            print(f"[索引] 重新导入 {imported} 个日文件", file=sys.stderr)
 
+        records = store.iter_query(start_date, end_date)
+        if args.output:
+            export_to_file(records, args.output)
+            return 0
 
-def display_records(records, title="记录列表"):
-    """显示记录列表"""
-    if not records:
-        print("没有找到记录")
-        return
+        daily = new_daily() if args.daily else None
+        display_records(tap_records(records, daily=daily), title)
+        if args.stats:
+            display_stats(stats_from_aggregate(store.aggregate(start_date, end_date)))
+        if daily is not None:
+            display_daily_summary(daily)
+    return 0
 
-    print(f"\n{'=' * 80}")
-    print(f"  {title}")
-    print(f"{'=' * 80}")
 
-    # 表格头部
-    print(f"\n{'时间':<12} {'阶段':<10} {'问题':<30} {'类型':<10} {'耗时':<6} {'状态':<8}")
-    print('-' * 80)
+def tap_records(records, stats=None, daily=None):
+    """在遍历记录的同时累加统计和每日汇总，显示与统计只需遍历一次"""
+    for r in records:
+        if stats is not None:
+            add_to_stats(stats, r)
+        if daily is not None:
+            add_to_daily(daily, r)
+        yield r
+
 
+def display_records(records, title="记录列表"):
+    """边遍历边显示记录列表，返回记录数"""
+    count = 0
     for r in records:
-        time_str = f"{r['date']} {r['timestamp']}"[:16]
-        stage = r['stage'][:8] if r['stage'] else '-'
-        problem = r['problem'][:28] if r['problem'] else '-'
-        prob_type = r['type'][:8] if r['type'] else '-'
-        time_cost = r['time'] if r['time'] else '-'
-        status = r['status'][:6] if r['status'] else '-'
+        if count == 0:
+            print(f"\n{'=' * 80}")
+            print(f"  {title}")
+            print(f"{'=' * 80}")
+
+            # 表格头部
+            print(f"\n{'时间':<12} {'阶段':<10} {'问题':<30} {'类型':<10} {'耗时':<6} {'状态':<8}")
+            print('-' * 80)
+        count += 1
+
+        time_str = f"{r.date} {r.timestamp}"[:16]
+        stage = r.stage[:8] if r.stage else '-'
+        problem = r.problem[:28] if r.problem else '-'
+        prob_type = r.type[:8] if r.type else '-'
+        time_cost = r.time if r.time else '-'
+        status = r.status[:6] if r.status else '-'
 
         print(f"{time_str:<12} {stage:<10} {problem:<30} {prob_type:<10} {time_cost:<6} {status:<8}")
 
-    print(f"\n共 {len(records)} 条记录")
+    if count == 0:
+        print("没有找到记录")
+    else:
+        print(f"\n共 {count} 条记录")
+    return count
 
 
 def display_stats(stats):
@@ -223,53 +206,73 @@ def display_stats(stats):
             print(f"  {priority}: {count}")
 
 
-def display_daily_summary(records):
-    """显示每日汇总"""
-    if not records:
+def new_daily():
+    """空的每日汇总"""
+    return defaultdict(lambda: {'count': 0, 'time': 0, 'resolved': 0})
+
+
+def add_to_daily(daily, r):
+    """把一条记录累加到每日汇总"""
+    data = daily[r.date]
+    data['count'] += 1
+    if r.time and r.time.isdigit():
+        data['time'] += int(r.time)
+    if '已解决' in r.status:
+        data['resolved'] += 1
+
+
+def display_daily_summary(daily):
+    """显示每日汇总（new_daily/add_to_daily 累加的结果）"""
+    if not daily:
         return
 
     print(f"\n{'=' * 80}")
     print("  每日汇总")
     print(f"{'=' * 80}")
 
-    daily = defaultdict(lambda: {'count': 0, 'time': 0, 'resolved': 0})
-
-    for r in records:
-        date = r['date']
-        daily[date]['count'] += 1
-        try:
-            time_val = int(r['time']) if r['time'] and r['time'].isdigit() else 0
-            daily[date]['time'] += time_val
-        except:
-            pass
-
-        if '已解决' in r.get('status', ''):
-            daily[date]['resolved'] += 1
-
-    for date in sorted(daily.keys()):
-        data = daily[date]
-        print(f"  {date}: {data['count']} 条记录, {data['time']} 分钟, {data['resolved']} 已解决")
+    for day in sorted(daily.keys()):
+        data = daily[day]
+        print(f"  {day}: {data['count']} 条记录, {data['time']} 分钟, {data['resolved']} 已解决")
 
 
 def export_to_file(records, output_path):
-    """导出记录到文件"""
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write("# Claude Code 会话记录导出\n\n")
-        f.write(f"导出时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"记录总数: {len(records)}\n\n")
+    """导出记录到文件
 
-        f.write("## 详细记录\n\n")
-        f.write("| 日期 | 时间 | 阶段 | 步骤 | 问题 | 类型 | 解决方案 | 耗时 | 优先级 | 状态 |\n")
-        f.write("|------|------|------|------|------|------|----------|------|--------|------|\n")
+    记录先逐行写入临时文件并计数，再在记录总数之后拼接，records 只遍历一次。
+    """
+    import shutil
+    import tempfile
 
+    with tempfile.TemporaryFile('w+', encoding='utf-8') as rows:
+        count = 0
         for r in records:
-            f.write(f"| {r['date']} | {r['timestamp']} | {r['stage']} | {r['step']} | "
-                    f"{r['problem']} | {r['type']} | {r['solution']} | {r['time']} | "
-                    f"{r['priority']} | {r['status']} |\n")
+            rows.write(f"| {r.date} | {r.timestamp} | {r.stage} | {r.step} | "
+                       f"{r.problem} | {r.type} | {r.solution} | {r.time} | "
+                       f"{r.priority} | {r.status} |\n")
+            count += 1
+        rows.seek(0)
+
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write("# Claude Code 会话记录导出\n\n")
+            f.write(f"导出时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+            f.write(f"记录总数: {count}\n\n")
+
+            f.write("## 详细记录\n\n")
+            f.write("| 日期 | 时间 | 阶段 | 步骤 | 问题 | 类型 | 解决方案 | 耗时 | 优先级 | 状态 |\n")
+            f.write("|------|------|------|------|------|------|----------|------|--------|------|\n")
+            shutil.copyfileobj(rows, f)
 
     print(f"\n已导出到: {output_path}")
 
 
+def parse_quarter_arg(value):
+    """解析 YYYY-Qn 格式的季度参数，返回 (年, 季度)"""
+    match = QUARTER_ARG.fullmatch(value)
+    if not match:
+        raise argparse.ArgumentTypeError(f"季度格式应为 YYYY-Qn: {value}")
+    return int(match.group(1)), int(match.group(2))
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='查看 Claude Code 会话记录',
@@ -288,6 +291,17 @@ def main():
   # 查看本月并导出
   python view_records.py --month --output report.md
 
+  # 查看任意日期范围
+  python view_records.py --from 2024-01-01 --to 2024-03-15
+
+  # 查看本季度 / 指定季度
+  python view_records.py --quarter
+  python view_records.py --quarter 2024-Q3
+
+  # 只看统计（读取 summary/ 预聚合汇总，不逐条读取记录）
+  python view_records.py --month --summary --daily
+  python view_records.py --all --summary
+
   # 查看所有记录
   python view_records.py --all
         """
@@ -295,17 +309,26 @@ def main():
 
     # 时间范围选项
     parser.add_argument('-t', '--today', action='store_true', help='查看今天')
-    parser.add_argument('-d', '--date', help='指定日期 (YYYY-MM-DD)')
+    parser.add_argument('-d', '--date', type=parse_date_arg, help='指定日期 (YYYY-MM-DD)')
+    parser.add_argument('--from', dest='from_date', type=parse_date_arg, help='起始日期 (YYYY-MM-DD，含)')
+    parser.add_argument('--to', dest='to_date', type=parse_date_arg, help='结束日期 (YYYY-MM-DD，含)')
     parser.add_argument('-w', '--week', action='store_true', help='查看本周')
     parser.add_argument('-m', '--month', action='store_true', help='查看本月')
+    parser.add_argument('-q', '--quarter', nargs='?', const=(), type=parse_quarter_arg,
+                        help='查看季度 (YYYY-Qn，省略为本季度)')
     parser.add_argument('-a', '--all', action='store_true', help='查看所有历史')
 
     # 其他选项
     parser.add_argument('--stats', action='store_true', help='显示统计信息')
     parser.add_argument('--daily', action='store_true', help='显示每日汇总')
+    parser.add_argument('-s', '--summary', action='store_true',
+                        help='只显示统计（读取 summary/ 预聚合汇总，不列出记录）')
     parser.add_argument('-o', '--output', help='导出到文件')
+    parser.add_argument('-v', '--verbose', action='store_true', help='显示解析缓存命中情况')
 
     args = parser.parse_args()
+    if args.summary and args.output:
+        parser.error('--summary 不能与 --output 同时使用')
 
     storage_path = get_storage_path()
 
@@ -314,54 +337,39 @@ def main():
         print("还没有任何记录。使用 record_session.py 创建第一条记录。")
         return 1
 
-    # 获取所有记录
-    all_records = get_all_records(storage_path)
+    # 日志模式下按需渲染落后于日志的 markdown 视图（没有日志时不加载写入模块）
+    if get_log_dir(storage_path).is_dir():
+        from tracker_core.writer import render_stale_days
+        render_stale_days(storage_path)
 
-    if not all_records:
-        print("没有找到任何记录")
-        return 0
+    if args.summary:
+        return view_summary(args, storage_path)
 
-    # 根据参数过滤
-    filtered_records = all_records
+    # 启用了 SQLite 索引时直接查询索引
+    if is_enabled(storage_path):
+        return view_from_store(args, storage_path)
 
-    if args.today:
-        today = datetime.now().strftime('%Y-%m-%d')
-        filtered_records = filter_by_date(all_records, today)
-        title = f"今日记录 ({today})"
-    elif args.date:
-        filtered_records = filter_by_date(all_records, args.date)
-        title = f"{args.date} 的记录"
-    elif args.week:
-        now = datetime.now()
-        year, week = now.isocalendar()[:2]
-        filtered_records = filter_by_week(all_records, year, week)
-        title = f"本周记录 ({year}-W{week:02d})"
-    elif args.month:
-        now = datetime.now()
-        filtered_records = filter_by_month(all_records, now.year, now.month)
-        title = f"本月记录 ({now.year}-{now.month:02d})"
-    else:
-        # 默认显示今天
-        today = datetime.now().strftime('%Y-%m-%d')
-        filtered_records = filter_by_date(all_records, today)
-        title = f"今日记录 ({today})"
+    # 只加载范围内的日文件（未改动的日文件使用解析缓存），记录以生成器流式处理
+    start_date, end_date, title = get_view_range(args)
+    cache = ParseCache(storage_path)
+    records = iter_records(storage_path, cache, start_date, end_date)
 
-    # 导出模式
     if args.output:
-        export_to_file(filtered_records, args.output)
-        return 0
-
-    # 显示记录
-    display_records(filtered_records, title)
-
-    # 显示统计
-    if args.stats:
-        stats = calculate_stats(filtered_records)
-        display_stats(stats)
-
-    # 显示每日汇总
-    if args.daily:
-        display_daily_summary(filtered_records)
+        # 导出模式
+        export_to_file(records, args.output)
+    else:
+        # 显示记录，同时累加统计和每日汇总
+        stats = new_stats() if args.stats else None
+        daily = new_daily() if args.daily else None
+        display_records(tap_records(records, stats, daily), title)
+
+        if stats is not None:
+            display_stats(stats)
+        if daily is not None:
+            display_daily_summary(daily)
+
+    if args.verbose:
+        print(f"[缓存] 命中 {cache.hits}，未命中 {cache.misses}", file=sys.stderr)
 
     return 0
 
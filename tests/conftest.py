@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+"""
+测试公共设置：插件根目录（tracker_core）和 hooks/ 加入 sys.path，存储目录指向临时目录
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'hooks'))
+
+
+def load_script(skill, name):
+    """导入 skills/<skill>/scripts/ 下的脚本模块"""
+    scripts = str(ROOT / 'skills' / skill / 'scripts')
+    if scripts not in sys.path:
+        sys.path.insert(0, scripts)
+    return __import__(name)
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    """隔离的存储目录（CLAUDE_ANALYSIS_PATH），默认 markdown 存储模式"""
+    monkeypatch.setenv('CLAUDE_ANALYSIS_PATH', str(tmp_path))
+    monkeypatch.delenv('CLAUDE_ANALYSIS_STORAGE', raising=False)
+    return tmp_path
+
+
+def make_record(problem, **fields):
+    """一条写入用的记录（dict），未给出的字段取常用值"""
+    record = {
+        'timestamp': '10:00', 'stage': '调试', 'step': '运行测试', 'problem': problem, 'type': '执行失败',
+        'solution': '-', 'docs': '-', 'session': 's1', 'time': '5', 'priority': '中', 'status': '待解决',
+        'note': '',
+    }
+    record.update(fields)
+    return record
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+"""批量导入：按日期分组、跳过错误行并报告原始行号，日期统一为 YYYY-MM-DD"""
+
+import io
+import json
+import subprocess
+import sys
+
+from conftest import ROOT, load_script
+from tracker_core.history import get_all_records
+
+RECORD_SESSION = ROOT / 'skills' / 'usage-recorder' / 'scripts' / 'record_session.py'
+
+
+def run_batch(data, *extra):
+    return subprocess.run([sys.executable, str(RECORD_SESSION), '--batch', '-', *extra],
+                          input=data.encode('utf-8'), capture_output=True)
+
+
+def jsonl(*rows):
+    return ''.join((json.dumps(r, ensure_ascii=False) if isinstance(r, dict) else r) + '\n' for r in rows)
+
+
+def test_read_batch_groups_by_date_and_reports_bad_rows():
+    read_batch = load_script('usage-recorder', 'record_session').read_batch
+
+    data = '\n' + jsonl(
+        {'stage': '调试', 'problem': 'a', 'date': '2024-05-01'},
+        {'stage': '调试', 'problem': 'b', 'date': '2024-05-02', 'timestamp': '09:30'},
+        {'stage': '调试', 'problem': 'no date'},
+        {'problem': 'no stage', 'date': '2024-05-01'},
+        {'stage': '调试', 'problem': 'unpadded', 'date': '2024-5-1'},
+        {'stage': '调试', 'problem': 'invalid', 'date': '2024-02-30'},
+        '{"stage": "调试", "problem": ',
+        {'stage': '调试', 'problem': 'c', 'date': '2024-05-01'},
+    )
+    by_date, skipped = read_batch(io.StringIO(data), default_date='2024-05-03')
+
+    assert {d: [r['problem'] for r in rs] for d, rs in by_date.items()} == {
+        '2024-05-01': ['a', 'c'], '2024-05-02': ['b'], '2024-05-03': ['no date'],
+    }
+    assert by_date['2024-05-02'][0]['timestamp'] == '09:30'
+    assert by_date['2024-05-01'][0]['type'] == '其他'
+    # 开头的空行计入行号
+    assert skipped == [5, 6, 7, 8]
+
+
+def test_batch_import_creates_only_padded_day_files(storage):
+    result = run_batch(jsonl(
+        {'stage': '调试', 'problem': 'ok', 'date': '2026-01-05'},
+        {'stage': '调试', 'problem': 'bad', 'date': '2026-1-5'},
+    ))
+    assert result.returncode == 0
+    assert '第 2 行' in result.stderr.decode('utf-8')
+    assert sorted(p.name for p in storage.glob('*.md')) == ['2026-01-05.md']
+
+
+def test_batch_import_csv_with_bom_from_stdin(storage):
+    data = '\ufeffstage,problem,date,time\n调试,csv one,2024-05-01,3\n,missing stage,2024-05-01,1\n'
+    result = run_batch(data, '--batch-format', 'csv')
+    assert result.returncode == 0
+    assert '第 3 行' in result.stderr.decode('utf-8')
+    records = get_all_records(storage)
+    assert [(r.date, r.problem, r.time) for r in records] == [('2024-05-01', 'csv one', '3')]
+
+
+def test_batch_with_only_bad_rows_fails(storage):
+    result = run_batch(jsonl({'stage': '调试', 'problem': 'x', 'date': '05/01/2024'}))
+    assert result.returncode == 1
+    assert not list(storage.glob('*.md'))
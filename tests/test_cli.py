@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+"""命令行日期参数：统一为 YYYY-MM-DD，错误格式由 argparse 报错退出"""
+
+import argparse
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+from tracker_core.cli import parse_date_arg
+
+SCRIPTS = [
+    ROOT / 'skills' / 'usage-recorder' / 'scripts' / 'view_records.py',
+    ROOT / 'skills' / 'usage-observer' / 'scripts' / 'view_records.py',
+]
+
+
+def test_parse_date_arg():
+    assert parse_date_arg('2024-05-01') == '2024-05-01'
+    for value in ('2024-5-1', '2024-02-30', '05/01/2024', ''):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_date_arg(value)
+
+
+@pytest.mark.parametrize('script', SCRIPTS, ids=lambda p: p.parts[-3])
+def test_view_records_rejects_bad_date(storage, script):
+    result = subprocess.run([sys.executable, str(script), '--date', '2024-5-1'], capture_output=True)
+    assert result.returncode == 2
+    assert 'YYYY-MM-DD' in result.stderr.decode('utf-8')
+    assert not list(storage.glob('*.md'))
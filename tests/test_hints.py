@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+"""历史解决方案提示：已解决问题的索引生成、相似问题查询、增量更新，以及 hook 路由时的提示与回退"""
+
+import json
+
+from conftest import load_script, make_record
+from keyword_router import handle_request
+from tracker_core.hints import HintLoader, get_hint_index_path
+from tracker_core.writer import write_records
+
+build_hints = load_script('usage-observer', 'build_hints').build_hints
+
+NPM = 'npm install 依赖冲突报错'
+
+
+def fill(storage):
+    write_records('2024-05-01', [
+        make_record(NPM, status='已解决', solution='加 --legacy-peer-deps', docs='npm.md'),
+        make_record('数据库连接池耗尽', status='已解决', solution='调大连接池'),
+        make_record('样式错位', status='待解决', solution='-'),
+        make_record('未写解决方案', status='已解决', solution='-'),
+    ], storage, 'markdown')
+    write_records('2024-05-03', [
+        make_record(NPM, status='已解决', solution='加 --legacy-peer-deps'),
+    ], storage, 'markdown')
+
+
+def test_index_holds_only_resolved_problems_with_solutions(storage):
+    fill(storage)
+    _, index, rebuilt = build_hints(storage)
+    assert rebuilt
+    assert sorted(doc[0] for doc in index.docs) == [NPM, '数据库连接池耗尽']
+
+
+def test_lookup_finds_similar_solved_problem(storage):
+    fill(storage)
+    _, index, _ = build_hints(storage)
+
+    hints = index.lookup('执行 npm install 时依赖冲突报错了，怎么办')
+    assert [h['problem'] for h in hints] == [NPM]
+    # 同一问题和解决方案合并计数，日期取最近一次，相关文档沿用之前记录的
+    assert hints[0]['solution'] == '加 --legacy-peer-deps'
+    assert (hints[0]['count'], hints[0]['date'], hints[0]['docs']) == (2, '2024-05-03', 'npm.md')
+    assert hints[0]['score'] >= 0.5
+
+    assert index.lookup('页面样式错位') == []
+    assert index.lookup('') == []
+
+
+def test_incremental_build(storage):
+    fill(storage)
+    build_hints(storage)
+
+    history, _, rebuilt = build_hints(storage)
+    assert not rebuilt and history.days_parsed == 0
+
+    write_records('2024-05-04', [make_record('端口被占用', status='已解决', solution='换端口')], storage, 'markdown')
+    history, index, rebuilt = build_hints(storage)
+    assert rebuilt and history.days_parsed == 1
+    assert index.lookup('端口被占用')[0]['solution'] == '换端口'
+
+    _, rebuilt_index, _ = build_hints(storage, rebuild=True)
+    assert sorted(index.docs) == sorted(rebuilt_index.docs)
+
+
+def test_loader_reloads_regenerated_index(storage):
+    path = get_hint_index_path(storage)
+    loader = HintLoader(lambda: path)
+    assert loader.lookup(NPM) == []
+
+    fill(storage)
+    build_hints(storage)
+    assert loader.lookup(NPM)[0]['problem'] == NPM
+
+    write_records('2024-05-04', [make_record('端口被占用', status='已解决', solution='换端口')], storage, 'markdown')
+    build_hints(storage)
+    assert loader.lookup('端口被占用')[0]['solution'] == '换端口'
+
+
+def observer_params(prompt):
+    output, code = handle_request(json.dumps({'prompt': prompt, 'sessionId': 's1'}).encode('utf-8'))
+    assert code == 0
+    action = json.loads(output)['actions'][0]
+    assert action['skill'] == 'usage-analytics:usage-observer'
+    return action['params']
+
+
+def test_router_attaches_similar_solutions(storage):
+    assert observer_params('npm install 依赖冲突又报错了')['similar_solutions'] == []
+
+    fill(storage)
+    build_hints(storage)
+    hints = observer_params('npm install 依赖冲突又报错了')['similar_solutions']
+    assert [h['solution'] for h in hints] == ['加 --legacy-peer-deps']
+
+
+def test_router_ignores_unreadable_index(storage):
+    path = get_hint_index_path(storage)
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b'not a pickle')
+    assert observer_params('npm install 依赖冲突又报错了')['similar_solutions'] == []
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""关键词匹配器：find_all 与逐关键词查找结果一致、分组优先级、大小写折叠后的位置，以及 hook 路由输出"""
+
+import json
+import random
+
+import pytest
+
+from keyword_matcher import KeywordMatcher
+from keyword_router import MATCHER, PROBLEM_KEYWORDS, RESOLUTION_KEYWORDS, handle_request
+
+GROUPS = {'resolution': RESOLUTION_KEYWORDS, 'problem': PROBLEM_KEYWORDS}
+
+
+def find_all_naive(text, groups=GROUPS):
+    """逐个关键词反复 str.find，收集全部（含重叠的）匹配"""
+    folded = text.lower()
+    matches = set()
+    for group, keywords in groups.items():
+        for keyword in {k.lower() for k in keywords}:
+            start = folded.find(keyword)
+            while start >= 0:
+                matches.add((keyword, group, start, start + len(keyword)))
+                start = folded.find(keyword, start + 1)
+    return matches
+
+
+def random_text(rng, length):
+    alphabet = list('测试失败错误问题超时慢好了解决 abcdefiknorstwxERORFAILDone\'') + ['error', 'fixed', '没问题了']
+    return ''.join(rng.choice(alphabet) for _ in range(length))
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_find_all_matches_naive_search(seed):
+    text = random_text(random.Random(seed), 400)
+    assert {tuple(m) for m in MATCHER.find_all(text)} == find_all_naive(text)
+
+
+def test_overlapping_keywords_are_all_reported():
+    matcher = KeywordMatcher({'g': ['he', 'she', 'hers', 'his']})
+    assert [(m.keyword, m.start, m.end) for m in matcher.find_all('ushers')] == \
+        [('she', 1, 4), ('he', 2, 4), ('hers', 2, 6)]
+
+
+def test_positions_refer_to_original_text_when_lowercase_changes_length():
+    text = 'İİ ERROR'
+    match = MATCHER.find_all(text)[0]
+    assert (match.keyword, text[match.start:match.end]) == ('error', 'ERROR')
+    first = MATCHER.first_match(text, ('problem',))
+    assert text[first.start:first.end] == 'ERROR'
+
+
+def test_first_match_respects_group_priority():
+    text = 'the build failed, now it is fixed'
+    assert MATCHER.first_match(text, ('resolution', 'problem')).group == 'resolution'
+    assert MATCHER.first_match(text, ('problem', 'resolution')).group == 'problem'
+    assert MATCHER.first_match('今天天气不错', ('resolution', 'problem')) is None
+    assert MATCHER.contains('build FAILED', 'problem')
+    assert not MATCHER.contains('build FAILED', 'resolution')
+
+
+def route(prompt):
+    output, code = handle_request(json.dumps({'prompt': prompt, 'sessionId': 's1'}).encode('utf-8'))
+    assert code == 0
+    return json.loads(output)
+
+
+def test_router_invokes_resolver_or_observer(storage):
+    resolved = route('问题解决了，谢谢')
+    assert resolved['actions'][0]['skill'] == 'usage-analytics:usage-resolver'
+
+    problem = route('运行测试报错')
+    params = problem['actions'][0]['params']
+    assert problem['actions'][0]['skill'] == 'usage-analytics:usage-observer'
+    assert params['matched_keyword'] == {'keyword': '报错', 'start': 4, 'end': 6}
+
+    assert route('帮我写个函数')['actions'] == []
+
+
+def test_router_reports_invalid_json():
+    output, code = handle_request(b'{not json')
+    assert code == 1
+    assert json.loads(output)['decision'] == 'continue'
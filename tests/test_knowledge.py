@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""教练知识库（CKB1）：写入后读取一致、损坏文件，以及增量构建与全量重建一致"""
+
+import pytest
+
+from conftest import load_script, make_record
+from tracker_core.knowledge import KnowledgeBase, get_knowledge_path, write_knowledge
+from tracker_core.writer import write_records
+
+ENTRIES = [
+    ('stage', '调试', 3, 30, [('构建失败', 2), ('超时', 1)], [('重装依赖', 2)], [('package.json', 1)]),
+    ('type', '工具错误', 1, 5, [('Read 失败', 1)], [], []),
+    ('type', '执行失败', 4, 12, [('构建失败', 4)], [('重装依赖', 3), ('回滚', 1)], []),
+]
+
+
+@pytest.fixture
+def kb_path(tmp_path):
+    path = tmp_path / 'knowledge' / 'coach_kb.bin'
+    write_knowledge(path, ENTRIES, generation=7, day_count=30)
+    return path
+
+
+def test_round_trip(kb_path):
+    with KnowledgeBase.open(kb_path) as kb:
+        assert (kb.generation, kb.day_count, len(kb)) == (7, 30, 3)
+        assert kb.values('type') == ['执行失败', '工具错误']
+        entry = kb.entry('stage', '调试')
+        assert entry == {
+            'dimension': 'stage', 'value': '调试', 'count': 3, 'minutes': 30, 'avg_minutes': 10.0,
+            'problems': [{'text': '构建失败', 'count': 2}, {'text': '超时', 'count': 1}],
+            'solutions': [{'text': '重装依赖', 'count': 2}],
+            'docs': [{'text': 'package.json', 'count': 1}],
+        }
+        assert kb.entry('type', '执行失败', limit=1)['solutions'] == [{'text': '重装依赖', 'count': 3}]
+        assert kb.entry('type', '不存在') is None
+        assert [e['value'] for e in kb.entries('stage')] == ['调试']
+
+
+def test_missing_or_foreign_files_are_rejected(kb_path, tmp_path):
+    assert KnowledgeBase.open(tmp_path / 'missing.bin') is None
+
+    empty = tmp_path / 'empty.bin'
+    empty.write_bytes(b'')
+    assert KnowledgeBase.open(empty) is None
+
+    foreign = tmp_path / 'foreign.bin'
+    foreign.write_bytes(b'XXXX' + kb_path.read_bytes()[4:])
+    assert KnowledgeBase.open(foreign) is None
+
+
+def read_entries(storage):
+    with KnowledgeBase.open(get_knowledge_path(storage)) as kb:
+        return kb.generation, {dim: kb.entries(dim) for dim in ('type', 'stage')}
+
+
+def test_incremental_build_matches_rebuild(storage):
+    knowledge_base = load_script('usage-coach', 'knowledge_base')
+    write_records('2024-05-01', [make_record('构建失败', status='已解决', solution='重装依赖', time='10'),
+                                 make_record('超时', status='待解决')], storage, 'markdown')
+    write_records('2024-05-02', [make_record('构建失败', status='已解决', solution='回滚', time='4')],
+                  storage, 'markdown')
+
+    _, written = knowledge_base.build_knowledge(storage)
+    assert written
+    _, written = knowledge_base.build_knowledge(storage)
+    assert not written
+
+    write_records('2024-05-02', [make_record('Read 失败', type='工具错误', status='已解决', time='2')],
+                  storage, 'markdown')
+    (storage / '2024-05-01.md').unlink()
+    history, written = knowledge_base.build_knowledge(storage)
+    assert written and history.days_parsed == 1 and history.days_removed == 1
+    generation, incremental = read_entries(storage)
+
+    knowledge_base.build_knowledge(storage, rebuild=True)
+    rebuilt_generation, rebuilt = read_entries(storage)
+    assert rebuilt == incremental
+    assert rebuilt_generation > generation
+    assert [e['value'] for e in incremental['type']] == ['工具错误', '执行失败']
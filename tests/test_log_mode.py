@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+"""日志存储模式：追加、渲染、由 markdown 导入日志，以及没有日志的日期不被渲染覆盖"""
+
+import os
+import subprocess
+import sys
+
+from conftest import ROOT, make_record
+from tracker_core import log as record_log
+from tracker_core.parser import parse_day_records
+from tracker_core.writer import list_stale_days, render_day, render_stale_days, write_records
+
+DAY = '2024-05-01'
+RECORD_SESSION = ROOT / 'skills' / 'usage-recorder' / 'scripts' / 'record_session.py'
+
+
+def problems(storage, date_str=DAY):
+    return [r.problem for r in parse_day_records(storage / f'{date_str}.md', date_str)]
+
+
+def test_log_mode_appends_and_renders(storage):
+    write_records(DAY, [make_record('a'), make_record('b')], storage, 'log')
+    write_records(DAY, [make_record('c')], storage, 'log')
+
+    assert [r['problem'] for r in record_log.read_records(storage, DAY)] == ['a', 'b', 'c']
+    assert list_stale_days(storage) == [DAY]
+    assert render_stale_days(storage) == [DAY]
+    assert problems(storage) == ['a', 'b', 'c']
+    assert list_stale_days(storage) == []
+
+
+def test_first_log_write_seeds_existing_markdown(storage):
+    write_records(DAY, [make_record('md1')], storage, 'markdown')
+    write_records(DAY, [make_record('md2')], storage, 'markdown')
+
+    write_records(DAY, [make_record('log1')], storage, 'log')
+    render_day(DAY, storage)
+    assert problems(storage) == ['md1', 'md2', 'log1']
+
+
+def test_day_with_log_stays_in_log_mode(storage):
+    write_records(DAY, [make_record('log1')], storage, 'log')
+    write_records(DAY, [make_record('md')], storage, 'markdown')
+
+    assert [r['problem'] for r in record_log.read_records(storage, DAY)] == ['log1', 'md']
+
+
+def test_truncated_log_line_is_skipped(storage):
+    write_records(DAY, [make_record('ok')], storage, 'log')
+    with open(record_log.get_log_path(storage, DAY), 'a', encoding='utf-8') as f:
+        f.write('{"stage": "调试", "prob')
+
+    render_day(DAY, storage)
+    assert problems(storage) == ['ok']
+
+
+def run_render(storage, *args):
+    env = dict(os.environ, CLAUDE_ANALYSIS_PATH=str(storage))
+    return subprocess.run([sys.executable, str(RECORD_SESSION), '--render', *args],
+                          env=env, capture_output=True, text=True)
+
+
+def test_render_date_without_log_keeps_markdown(storage):
+    write_records(DAY, [make_record('a'), make_record('b')], storage, 'markdown')
+    before = (storage / f'{DAY}.md').read_text(encoding='utf-8')
+
+    result = run_render(storage, '--date', DAY)
+    assert result.returncode == 1
+    assert (storage / f'{DAY}.md').read_text(encoding='utf-8') == before
+    assert problems(storage) == ['a', 'b']
+
+
+def test_render_renders_only_stale_days(storage):
+    write_records('2024-05-01', [make_record('markdown only')], storage, 'markdown')
+    write_records('2024-05-02', [make_record('logged')], storage, 'log')
+
+    result = run_render(storage)
+    assert result.returncode == 0
+    assert '已渲染 1 个' in result.stdout
+    assert problems(storage, '2024-05-01') == ['markdown only']
+    assert problems(storage, '2024-05-02') == ['logged']
+
+
+def test_append_after_torn_line_keeps_new_record(storage):
+    write_records(DAY, [make_record('ok')], storage, 'log')
+    with open(record_log.get_log_path(storage, DAY), 'a', encoding='utf-8') as f:
+        f.write('{"stage": "x", "prob')
+
+    write_records(DAY, [make_record('after-crash')], storage, 'log')
+    assert [r['problem'] for r in record_log.read_records(storage, DAY)] == ['ok', 'after-crash']
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""Markdown 转 HTML：单遍行内格式解析、逐行流式转换、批量转换只转换改动过的文件"""
+
+import itertools
+import os
+import time
+
+import pytest
+
+from conftest import load_script
+
+md_to_html = load_script('usage-analyst', 'md_to_html')
+
+DOCUMENT = """# 报告
+
+## 卡片
+- a
+- **b**
+
+```
+x = 1
+*y*
+```
+| h1 | h2 |
+|---|---|
+| 1 | 2 |
+
+文本
+"""
+
+
+@pytest.mark.parametrize('text, html', [
+    ('纯文本', '纯文本'),
+    ('**粗体** 和 *斜体*', '<strong>粗体</strong> 和 <em>斜体</em>'),
+    ('__粗体__ _斜体_', '<strong>粗体</strong> <em>斜体</em>'),
+    ('`a*b*`', '<code>a*b*</code>'),
+    (r'\*不是斜体\*', '*不是斜体*'),
+    ('**a *b* c**', '<strong>a <em>b</em> c</strong>'),
+    ('*a **b** c*', '<em>a <strong>b</strong> c</em>'),
+    ('**`x**y`**', '<strong><code>x**y</code></strong>'),
+    ('a*b', 'a*b'),
+])
+def test_inline_formatting(text, html):
+    assert md_to_html.parse_inline_formatting(text) == html
+
+
+def test_unclosed_markers_do_not_backtrack():
+    start = time.perf_counter()
+    md_to_html.parse_inline_formatting('*' + 'a' * 20000 + '`' * 3)
+    md_to_html.parse_inline_formatting('**' + '*a' * 5000)
+    assert time.perf_counter() - start < 1
+
+
+def test_block_structure():
+    assert md_to_html.parse_markdown_simple(DOCUMENT).split('\n') == [
+        '<h1>报告</h1>',
+        '<div class="card"><h2>卡片</h2>',
+        '<ul>', '<li>a</li>', '<li><strong>b</strong></li>', '</ul>',
+        '<pre><code>x = 1', '*y*</code></pre>',
+        '<table>', '<thead><tr><th>h1</th><th>h2</th></tr></thead>', '<tbody>',
+        '<tr><td>1</td><td>2</td></tr>', '</tbody></table>',
+        '<p>文本</p>',
+        '</div>',
+    ]
+
+
+def test_lines_are_converted_lazily():
+    endless = itertools.chain(['# 标题'], itertools.repeat('段落'))
+    head = itertools.islice(md_to_html.iter_html_lines(endless), 3)
+    assert list(head) == ['<h1>标题</h1>', '<p>段落</p>', '<p>段落</p>']
+
+
+def test_streamed_file_matches_in_memory_conversion(tmp_path):
+    md_file = tmp_path / 'report.md'
+    md_file.write_text(DOCUMENT, encoding='utf-8')
+    assert md_to_html.convert_markdown_to_html(md_file, quiet=True)
+
+    html = (tmp_path / 'report.html').read_text(encoding='utf-8')
+    assert '<title>报告' in html
+    assert md_to_html.parse_markdown_simple(DOCUMENT.rstrip('\n')) in html
+
+
+def test_batch_converts_only_changed_files(tmp_path):
+    for name in ('a', 'b', 'c'):
+        (tmp_path / f'{name}.md').write_text(f'# {name}\n', encoding='utf-8')
+    out = tmp_path / 'html'
+
+    assert md_to_html.batch_convert(tmp_path, out) == 3
+    assert md_to_html.batch_convert(tmp_path, out) == 0
+
+    # 只被 touch 过的文件按内容哈希跳过
+    stat = (tmp_path / 'a.md').stat()
+    os.utime(tmp_path / 'a.md', ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert md_to_html.batch_convert(tmp_path, out) == 0
+
+    (tmp_path / 'b.md').write_text('# b changed\n', encoding='utf-8')
+    (out / 'c.html').unlink()
+    assert md_to_html.batch_convert(tmp_path, out) == 2
+    assert 'b changed' in (out / 'b.html').read_text(encoding='utf-8')
+
+    assert md_to_html.batch_convert(tmp_path, out, force=True) == 3
+
+
+def test_parallel_batch_matches_serial(tmp_path):
+    for i in range(4):
+        (tmp_path / f'r{i}.md').write_text(DOCUMENT.replace('报告', f'报告 {i}'), encoding='utf-8')
+
+    assert md_to_html.batch_convert(tmp_path, tmp_path / 'serial') == 4
+    assert md_to_html.batch_convert(tmp_path, tmp_path / 'parallel', jobs=2) == 4
+    for i in range(4):
+        # 页头带生成时间，只比较正文
+        serial = (tmp_path / 'serial' / f'r{i}.html').read_text(encoding='utf-8')
+        parallel = (tmp_path / 'parallel' / f'r{i}.html').read_text(encoding='utf-8')
+        body = md_to_html.parse_markdown_simple(DOCUMENT.replace('报告', f'报告 {i}').rstrip('\n'))
+        assert body in serial and body in parallel
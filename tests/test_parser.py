@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+"""markdown 日文件表格解析：9 列 / 12 列归一化、转义和分隔行"""
+
+from conftest import make_record
+from tracker_core.parser import normalize_parts, parse_day_records, parse_existing_records, split_table_row
+from tracker_core.records import Record
+from tracker_core.writer import render_markdown
+
+DAY = '2024-05-01'
+
+
+def test_nine_column_row_gains_docs_session_and_note():
+    parts = ['10:00', '调试', '运行测试', '测试失败', '执行失败', '修改断言', '20', '高', '已解决']
+    assert normalize_parts(parts) == [
+        '10:00', '调试', '运行测试', '测试失败', '执行失败', '修改断言', '', '', '20', '高', '已解决', '',
+    ]
+
+
+def test_twelve_column_row_is_unchanged():
+    parts = ['10:00', '调试', '-', '问题', '其他', '-', 'a.md', 's1', '5', '中', '待解决', '备注']
+    assert normalize_parts(parts) == parts
+
+
+def test_other_lengths_are_padded_or_truncated_to_twelve():
+    assert normalize_parts(['x'] * 10) == ['x'] * 10 + ['', '']
+    assert normalize_parts(['x'] * 14) == ['x'] * 12
+
+
+def test_escaped_pipe_stays_in_cell():
+    assert split_table_row(r'| 10:00 | a \| b | c |') == ['10:00', 'a | b', 'c']
+
+
+def test_mixed_legacy_and_full_rows(tmp_path):
+    md_path = tmp_path / f'{DAY}.md'
+    md_path.write_text(
+        '# 2024-05-01\n\n## 详细记录\n\n'
+        '| 时间戳 | 阶段 | 步骤 | 问题 | 类型 | 解决方案 | 耗时 | 优先级 | 状态 |\n'
+        '|--------|------|------|------|------|----------|------|--------|------|\n'
+        '| 09:00 | 调试 | - | 旧格式 | 工具错误 | 重试 | 3 | 低 | 已解决 |\n'
+        '| 10:00 | 测试 | - | 新格式 --- 分隔 | 其他 | - | a.md | s1 | 7 | 中 | 待解决 | 备注 |\n',
+        encoding='utf-8')
+
+    old, new = parse_day_records(md_path, DAY)
+    assert old == Record(DAY, '09:00', '调试', '-', '旧格式', '工具错误', '重试', '', '', '3', '低', '已解决', '')
+    assert new == Record(DAY, '10:00', '测试', '-', '新格式 --- 分隔', '其他', '-', 'a.md', 's1', '7', '中',
+                         '待解决', '备注')
+
+
+def test_rendered_day_parses_back():
+    records = [make_record('含 | 竖线'), make_record('第二条', note='偶发', status='已解决')]
+    rows = parse_existing_records(render_markdown(DAY, records))
+    assert [row[3] for row in rows] == ['含 | 竖线', '第二条']
+    assert rows[1][10:] == ['已解决', '偶发']
@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""高频问题聚类：MinHash 相似度估计、近似描述归入同一问题簇、增量更新与缓存状态"""
+
+import random
+
+from conftest import load_script, make_record
+from tracker_core.cache import CachedState, save_versioned_pickle
+from tracker_core.minhash import signature, similarity
+from tracker_core.writer import write_records
+
+problem_clusters = load_script('usage-analyst', 'problem_clusters')
+
+
+def fill(storage):
+    write_records('2024-05-01', [
+        make_record('npm install 安装依赖超时'),
+        make_record('npm install 安装依赖超时了'),
+        make_record('数据库连接池耗尽', status='已解决'),
+    ], storage, 'markdown')
+    write_records('2024-05-02', [
+        make_record('npm install 安装依赖超时', time='20'),
+        make_record('数据库连接池耗尽导致报错'),
+        make_record('样式错位'),
+    ], storage, 'markdown')
+
+
+def test_signature_estimates_jaccard():
+    rng = random.Random(1)
+    words = [f'w{i}' for i in range(200)]
+    for _ in range(10):
+        a = set(rng.sample(words, 60))
+        b = set(rng.sample(sorted(a), 40)) | set(rng.sample(words, 20))
+        jaccard = len(a & b) / len(a | b)
+        assert abs(similarity(signature(a), signature(b)) - jaccard) < 0.2
+    assert signature(set()) is None
+
+
+def test_near_duplicates_share_a_cluster(storage):
+    fill(storage)
+    results, total, cluster_count = problem_clusters.load_clusters(storage).top_clusters(min_size=1)
+
+    assert (total, cluster_count) == (6, 3)
+    assert [(c['problem'], c['count'], c['variants'], c['minutes'], c['resolved']) for c in results] == [
+        ('npm install 安装依赖超时', 3, 2, 30, 0),
+        ('数据库连接池耗尽', 2, 2, 10, 1),
+        ('样式错位', 1, 1, 5, 0),
+    ]
+    assert results[0]['examples'] == ['npm install 安装依赖超时了']
+
+    clusters = problem_clusters.load_clusters(storage)
+    assert clusters.top_clusters(start_date='2024-05-02')[0] == []
+    later, total, _ = clusters.top_clusters(start_date='2024-05-02', min_size=1)
+    assert total == 3 and [c['count'] for c in later] == [1, 1, 1]
+
+
+def summarize(clusters):
+    """问题簇的成员与合计（出现次数相同的描述中哪个作为代表取决于加入顺序，不比较）"""
+    results, total, cluster_count = clusters.top_clusters(min_size=1)
+    return total, cluster_count, sorted(
+        (c['count'], c['minutes'], c['resolved'], sorted([c['problem']] + c['examples'])) for c in results
+    )
+
+
+def test_incremental_update_matches_rebuild(storage):
+    fill(storage)
+    problem_clusters.load_clusters(storage)
+
+    write_records('2024-05-03', [make_record('数据库连接池耗尽'), make_record('新问题')], storage, 'markdown')
+    (storage / '2024-05-01.md').unlink()
+    clusters = problem_clusters.load_clusters(storage)
+    assert clusters.days_parsed == 1
+
+    rebuilt = problem_clusters.load_clusters(storage, rebuild=True)
+    assert summarize(clusters) == summarize(rebuilt)
+
+
+class Counted(CachedState):
+    STATE_VERSION = 3
+    TRANSIENT = ('runs',)
+
+    def __init__(self):
+        self.items = []
+        self.runs = 0
+
+
+def test_cached_state_round_trip(tmp_path):
+    path = tmp_path / 'state.pickle'
+    state = Counted()
+    state.items.append('a')
+    state.runs = 5
+    state.save(path)
+
+    loaded = Counted.load(path)
+    assert loaded.items == ['a']
+    # 只对本次运行有意义的字段不写入缓存
+    assert loaded.runs == 0
+
+
+def test_cached_state_rejects_other_versions_and_corrupt_files(tmp_path):
+    path = tmp_path / 'state.pickle'
+    save_versioned_pickle(path, Counted.STATE_VERSION + 1, Counted())
+    assert Counted.load(path).items == []
+
+    path.write_bytes(b'not a pickle')
+    assert Counted.load(path).items == []
+    assert Counted.load(tmp_path / 'missing.pickle').items == []
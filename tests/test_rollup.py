@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""预聚合汇总：日汇总组合出的周、月、季度和任意范围汇总与直接逐条累加一致"""
+
+from datetime import date, timedelta
+
+import pytest
+
+from conftest import load_script, make_record
+from tracker_core.history import get_all_records
+from tracker_core.rollup import Rollups, add_record, new_aggregate, period_range
+from tracker_core.writer import write_records
+
+FIRST = date(2024, 1, 20)
+LAST = date(2024, 4, 10)
+
+
+@pytest.fixture
+def history(storage):
+    day = FIRST
+    n = 0
+    while day <= LAST:
+        records = [make_record(f'{day} p{i}', time=str(n + i), status=('已解决', '待解决')[(n + i) % 2],
+                               type=('执行失败', '工具错误', '其他')[(n + i) % 3])
+                   for i in range(n % 3 + 1)]
+        write_records(day.isoformat(), records, storage, 'markdown')
+        day += timedelta(days=3)
+        n += 1
+    return storage
+
+
+def direct(storage, start_date=None, end_date=None):
+    aggregate = new_aggregate()
+    for r in get_all_records(storage, start_date=start_date, end_date=end_date):
+        add_record(aggregate, r)
+    return aggregate
+
+
+@pytest.mark.parametrize('start_date, end_date', [
+    (None, None),
+    ('2024-01-25', '2024-03-31'),
+    ('2024-02-01', '2024-02-29'),
+    ('2024-02-10', '2024-04-02'),
+    ('2024-05-01', '2024-05-31'),
+])
+def test_range_matches_direct_aggregate(history, start_date, end_date):
+    assert Rollups(history).range(start_date, end_date) == direct(history, start_date, end_date)
+
+
+@pytest.mark.parametrize('period, key', [('week', '2024-W05'), ('month', '2024-02'), ('quarter', '2024-Q1')])
+def test_periods_match_direct_aggregate(history, period, key):
+    first, last = period_range(period, key)
+    assert Rollups(history).period(period, key) == direct(history, first.isoformat(), last.isoformat())
+
+
+def test_changed_day_is_reparsed_alone(history):
+    Rollups(history).period('quarter', '2024-Q1')
+
+    write_records('2024-02-04', [make_record('新增', time='30')], history, 'markdown')
+    rollups = Rollups(history)
+    assert rollups.period('quarter', '2024-Q1') == direct(history, '2024-01-01', '2024-03-31')
+    assert rollups.days_parsed == 1
+
+
+def test_non_date_markdown_files_are_ignored(history):
+    (history / 'weekly-report.md').write_text('# 周报\n', encoding='utf-8')
+    (history / '2024-13-01.md').write_text('# 无效日期\n', encoding='utf-8')
+
+    assert Rollups(history).range() == direct(history)
+    build_rollups = load_script('usage-analyst', 'build_rollups').build_rollups
+    _, results = build_rollups(history)
+    assert [key for key, _ in results['quarter']] == ['2024-Q1', '2024-Q2']
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""全文检索：按字段权重的相关度排序、短语匹配、单字查询、日期过滤与写入后的增量索引"""
+
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT, make_record
+from tracker_core.store import RecordStore
+from tracker_core.writer import write_records
+
+RECORD_STORE = ROOT / 'skills' / 'usage-recorder' / 'scripts' / 'record_store.py'
+
+
+@pytest.fixture
+def store(storage):
+    write_records('2024-05-01', [
+        make_record('npm install timeout', solution='换镜像源'),
+        make_record('构建失败', solution='清理缓存后重新构建'),
+        make_record('文件锁等待超时', note='偶发'),
+    ], storage, 'markdown')
+    write_records('2024-05-02', [
+        make_record('测试用例失败', note='与 npm 缓存有关'),
+        make_record('构建成功但测试失败', solution='修复断言'),
+    ], storage, 'markdown')
+    with RecordStore.open(storage) as s:
+        s.sync(storage)
+        yield s
+
+
+def problems(results):
+    return [r.problem for _, r in results]
+
+
+def test_problem_match_ranks_above_note_match(store):
+    assert problems(store.search('npm')) == ['npm install timeout', '测试用例失败']
+
+
+def test_chinese_query_matches_as_phrase(store):
+    assert problems(store.search('构建失败')) == ['构建失败']
+    assert set(problems(store.search('失败'))) == {'构建失败', '测试用例失败', '构建成功但测试失败'}
+
+
+def test_single_character_query(store):
+    assert problems(store.search('锁')) == ['文件锁等待超时']
+
+
+def test_all_terms_by_default_or_any_term(store):
+    assert problems(store.search('npm 缓存')) == ['测试用例失败']
+    assert set(problems(store.search('npm 缓存', any_term=True))) == {
+        'npm install timeout', '测试用例失败', '构建失败',
+    }
+
+
+def test_date_filters(store):
+    assert set(problems(store.search('失败', start_date='2024-05-02'))) == {'测试用例失败', '构建成功但测试失败'}
+    assert problems(store.search('失败', end_date='2024-05-01')) == ['构建失败']
+    assert store.search('npm', start_date='2024-06-01') == []
+
+
+def test_new_records_are_indexed_on_write(storage, store):
+    write_records('2024-05-03', [make_record('新的 npm 问题')], storage, 'markdown')
+    with RecordStore.open(storage) as fresh:
+        assert fresh.sync(storage) == 0
+        assert '新的 npm 问题' in problems(fresh.search('npm'))
+
+
+def test_like_fallback_finds_the_same_records(store):
+    for query in ('npm', '失败', '锁'):
+        assert set(problems(store._search_like(query, 10, None, None, False))) == set(problems(store.search(query)))
+
+
+def test_search_requires_import(storage):
+    (storage / '2024-05-01.md').write_text('# 2024-05-01\n', encoding='utf-8')
+    result = subprocess.run([sys.executable, str(RECORD_STORE), 'search', 'npm'], capture_output=True)
+    assert result.returncode == 1
+    assert '--import' in result.stdout.decode('utf-8')
+    assert not (storage / 'records.db').exists()
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""二进制记录段（TSEG）：写入后读取一致、范围查询与统计、损坏文件，以及与 markdown 日文件互相转换"""
+
+import pytest
+
+from conftest import load_script, make_record
+from tracker_core.parser import parse_day_records
+from tracker_core.records import Record
+from tracker_core.rollup import new_aggregate, merge_aggregate
+from tracker_core.segment import Segment, write_segment
+from tracker_core.stats import calculate_stats, stats_from_aggregate
+from tracker_core.writer import write_records
+
+RECORDS = [
+    Record('2024-05-03', '14:30', '测试', '运行测试', 'pytest 超时', '性能问题', '增加超时', 'pytest.ini',
+           'session_1', '12', '高', '已解决', ''),
+    Record('2024-05-01', '09:05', '调试', '-', '构建失败 | 依赖', '执行失败', '-', '-', 'session_2', '3', '中',
+           '待解决', '偶发'),
+    Record('2024-05-01', '上午', '调试', '', '', '', '', '', '', '约 10 分钟', '', '', ''),
+    Record('2024-05-02', '23:59', '部署', '发布', 'pytest 超时', '其他', '重试', '', 'session_1', '', '低',
+           '需跟进', '备注 ✓'),
+]
+
+SORTED = sorted(RECORDS, key=lambda r: r.date)
+
+
+@pytest.fixture
+def segment_path(tmp_path):
+    path = tmp_path / 'segments' / '2024-05.seg'
+    assert write_segment(path, RECORDS) == len(RECORDS)
+    return path
+
+
+def comparable(stats):
+    return {key: dict(value) if isinstance(value, dict) else value for key, value in stats.items()}
+
+
+def test_round_trip_keeps_every_field_in_date_order(segment_path):
+    with Segment.open(segment_path) as segment:
+        assert len(segment) == len(RECORDS)
+        assert list(segment.iter_records()) == SORTED
+        assert [segment.record(i) for i in range(len(segment))] == SORTED
+
+
+def test_date_range_selects_records(segment_path):
+    with Segment.open(segment_path) as segment:
+        assert segment.date_range('2024-05-02', '2024-05-02') == (2, 3)
+        assert list(segment.iter_records('2024-05-02')) == SORTED[2:]
+        assert list(segment.iter_records('2024-06-01')) == []
+
+
+@pytest.mark.parametrize('start, end', [(None, None), ('2024-05-02', None), (None, '2024-05-01')])
+def test_aggregate_matches_stats_from_records(segment_path, start, end):
+    selected = [r for r in SORTED if (not start or r.date >= start) and (not end or r.date <= end)]
+    aggregate = new_aggregate()
+    with Segment.open(segment_path) as segment:
+        merge_aggregate(aggregate, segment.aggregate(start, end))
+    assert comparable(stats_from_aggregate(aggregate)) == comparable(calculate_stats(selected))
+
+
+def test_missing_truncated_or_foreign_files_are_rejected(segment_path, tmp_path):
+    assert Segment.open(tmp_path / 'missing.seg') is None
+
+    data = segment_path.read_bytes()
+    truncated = tmp_path / 'truncated.seg'
+    truncated.write_bytes(data[:len(data) // 2])
+    assert Segment.open(truncated) is None
+
+    foreign = tmp_path / 'foreign.seg'
+    foreign.write_bytes(b'XXXX' + data[4:])
+    assert Segment.open(foreign) is None
+
+
+def test_pack_and_unpack_day_files(storage, tmp_path):
+    record_segments = load_script('usage-recorder', 'record_segments')
+    for date_str, problems in (('2024-04-30', ['四月']), ('2024-05-01', ['a', 'b']), ('2024-05-20', ['c'])):
+        write_records(date_str, [make_record(p) for p in problems], storage, 'markdown')
+
+    segment_dir = storage / 'segments'
+    packed = record_segments.pack_days(storage, segment_dir, '2024-05-10')
+    # 范围两端扩展为整月，五月的段文件包含 5 月 1 日
+    assert [(path.name, days, count) for path, days, count in packed] == [('2024-05.seg', 2, 3)]
+
+    output = tmp_path / 'restored'
+    with Segment.open(segment_dir / '2024-05.seg') as segment:
+        written, skipped = record_segments.unpack_segment(segment, output)
+    assert sorted(written) == ['2024-05-01', '2024-05-20'] and skipped == []
+    for date_str in written:
+        assert parse_day_records(output / f'{date_str}.md', date_str) == \
+            parse_day_records(storage / f'{date_str}.md', date_str)
+
+    with Segment.open(segment_dir / '2024-05.seg') as segment:
+        assert record_segments.unpack_segment(segment, output) == ([], ['2024-05-01', '2024-05-20'])
+
+
+def test_pack_ignores_non_date_markdown_files(storage):
+    record_segments = load_script('usage-recorder', 'record_segments')
+    write_records('2024-05-01', [make_record('a')], storage, 'markdown')
+    (storage / 'weekly-report.md').write_text('# 周报\n', encoding='utf-8')
+
+    segment_dir = storage / 'segments'
+    packed = record_segments.pack_days(storage, segment_dir)
+    assert [(path.name, days, count) for path, days, count in packed] == [('2024-05.seg', 1, 1)]
+    assert sorted(p.name for p in segment_dir.iterdir()) == ['2024-05.seg']
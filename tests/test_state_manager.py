@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""追踪状态存储：日志重放（含中断后的残缺行和未清空的日志）、快照合并、过期淘汰与按月归档"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from state_manager import COMPACT_THRESHOLD, StateStore, get_archive_path, resolve_problem
+
+# 事务开始时会按当前时间淘汰过期条目，测试中的时间以当前时间为准
+NOW = datetime.now()
+
+
+def problem(problem_id, session_id='s1', hours_ago=1):
+    return {
+        'id': problem_id, 'session_id': session_id, 'problem': f'问题 {problem_id}', 'stage': '调试',
+        'type': '其他', 'start_time': (NOW - timedelta(hours=hours_ago)).isoformat(), 'user_input': '',
+        'status': 'active',
+    }
+
+
+@pytest.fixture
+def state_path(tmp_path):
+    return tmp_path / 'tracking_state.json'
+
+
+def test_changes_are_journaled_and_replayed(state_path):
+    with StateStore.transaction(state_path) as store:
+        store.add(problem('p1'))
+        store.add(problem('p2', 's2'))
+    with StateStore.transaction(state_path) as store:
+        assert store.resolve('p1', '重试')['status'] == 'resolved'
+
+    assert not state_path.exists()
+    store = StateStore.read(state_path)
+    assert [p['id'] for p in store.active()] == ['p2']
+    assert store.active('s1') == []
+    assert store.journal_ops == 3
+
+
+def test_truncated_journal_line_after_crash_is_ignored(state_path):
+    with StateStore.transaction(state_path) as store:
+        store.add(problem('p1'))
+    with open(state_path.with_suffix('.journal'), 'a', encoding='utf-8') as f:
+        f.write('{"op": "remove", "ids": ["p')
+
+    assert [p['id'] for p in StateStore.read(state_path).active()] == ['p1']
+
+
+def test_replaying_journal_over_newer_snapshot_is_idempotent(state_path):
+    with StateStore.transaction(state_path) as store:
+        store.add(problem('p1'))
+        store.add(problem('p2'))
+        store.remove(['p1'])
+    journal = state_path.with_suffix('.journal').read_bytes()
+
+    # 合并快照后、清空日志前中断：快照已含全部修改，日志仍在
+    store = StateStore.read(state_path)
+    store.compact()
+    state_path.with_suffix('.journal').write_bytes(journal)
+
+    replayed = StateStore.read(state_path)
+    assert replayed.to_dict() == store.to_dict()
+    assert [p['id'] for p in replayed.active()] == ['p2']
+
+
+def test_long_journal_is_compacted_into_snapshot(state_path):
+    for i in range(COMPACT_THRESHOLD + 1):
+        with StateStore.transaction(state_path) as store:
+            store.add(problem(f'p{i}'))
+
+    snapshot = json.loads(state_path.read_text(encoding='utf-8'))
+    assert len(snapshot['active_problems']) == COMPACT_THRESHOLD + 1
+    assert state_path.with_suffix('.journal').stat().st_size == 0
+    assert len(StateStore.read(state_path).active()) == COMPACT_THRESHOLD + 1
+
+
+def test_duplicate_id_gets_suffix(state_path):
+    with StateStore.transaction(state_path) as store:
+        assert store.add(problem('p1')) == 'p1'
+        assert store.add(problem('p1')) == 'p1_2'
+
+
+def test_expired_problems_and_sessions_move_to_monthly_archive(state_path):
+    with StateStore.transaction(state_path) as store:
+        store.add(problem('old', 's_old', hours_ago=30))
+        store.add(problem('recent', 's_new', hours_ago=2))
+
+        expired = store.expire(max_age_hours=24, now=NOW)
+
+    assert [p['id'] for p in expired] == ['old']
+    store = StateStore.read(state_path)
+    assert [p['id'] for p in store.active()] == ['recent']
+    assert 's_old' not in store.session_history
+    assert 's_new' in store.session_history
+
+    archive_path = get_archive_path(state_path, NOW)
+    assert archive_path.name == f"tracking-{NOW.strftime('%Y-%m')}.jsonl"
+    archived = [json.loads(line) for line in archive_path.read_text(encoding='utf-8').splitlines()]
+    assert archived[0]['id'] == 'old'
+    assert archived[0]['status'] == 'expired'
+    assert archived[1]['session_id'] == 's_old'
+    assert archived[1]['problem_ids'] == ['old']
+
+
+def test_failed_transaction_archives_nothing(state_path):
+    state_path.write_text(json.dumps({'active_problems': [problem('old', hours_ago=30)]}), encoding='utf-8')
+
+    # 事务体抛出异常时不提交，淘汰的条目也不能出现在归档里
+    with pytest.raises(RuntimeError):
+        with StateStore.transaction(state_path) as store:
+            store.expire(max_age_hours=24, now=NOW)
+            assert store.active() == []
+            raise RuntimeError
+    assert not get_archive_path(state_path, NOW).exists()
+    assert [p['id'] for p in StateStore.read(state_path).active()] == ['old']
+
+
+def test_expire_uses_heap_across_later_adds(state_path):
+    with StateStore.transaction(state_path) as store:
+        store.add(problem('a', hours_ago=10))
+        assert store.expire(max_age_hours=24, now=NOW) == []
+        store.add(problem('b', 's2', hours_ago=5))
+
+        expired = store.expire(max_age_hours=6, now=NOW)
+    assert [p['id'] for p in expired] == ['a']
+    assert [p['id'] for p in StateStore.read(state_path).active()] == ['b']
+
+
+def test_resolving_old_problem_before_expiry(state_path, monkeypatch):
+    monkeypatch.setenv('CLAUDE_ANALYSIS_PATH', str(state_path.parent))
+    snapshot = {'active_problems': [problem('old', hours_ago=30), problem('other', 's2', hours_ago=30)]}
+    state_path.write_text(json.dumps(snapshot), encoding='utf-8')
+
+    resolved = resolve_problem('old', '重启')
+    assert resolved['status'] == 'resolved'
+    assert resolved['elapsed_minutes'] >= 30 * 60
+
+    # 事务提交前仍会淘汰其它过期问题；已解决的问题不进入归档
+    assert StateStore.read(state_path).active() == []
+    lines = get_archive_path(state_path, datetime.now()).read_text(encoding='utf-8').splitlines()
+    assert [e['id'] for e in map(json.loads, lines) if 'id' in e] == ['other']
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""SQLite 记录索引：查询和分组统计与直接解析日文件一致，写入与手动编辑后保持同步"""
+
+from conftest import make_record
+from tracker_core.history import get_all_records
+from tracker_core.stats import calculate_stats, stats_from_aggregate
+from tracker_core.store import RecordStore
+from tracker_core.writer import write_records
+
+DAYS = ['2024-05-01', '2024-05-02', '2024-05-03']
+
+
+def fill(storage):
+    for n, day in enumerate(DAYS):
+        records = [make_record(f'{day} p{i}', status=('已解决', '待解决', '需跟进')[i % 3], time=str(i),
+                               type=('执行失败', '工具错误')[i % 2], stage=('调试', '编码')[n % 2])
+                   for i in range(n + 2)]
+        write_records(day, records, storage, 'markdown')
+
+
+def assert_in_sync(store, storage, start_date=None, end_date=None):
+    expected = get_all_records(storage, start_date=start_date, end_date=end_date)
+    assert store.query(start_date, end_date) == expected
+    assert stats_from_aggregate(store.aggregate(start_date, end_date)) == calculate_stats(expected)
+
+
+def test_aggregate_matches_parsed_records(storage):
+    fill(storage)
+    with RecordStore.open(storage) as store:
+        assert store.sync(storage) == len(DAYS)
+        assert_in_sync(store, storage)
+        assert_in_sync(store, storage, '2024-05-02', '2024-05-03')
+        assert_in_sync(store, storage, end_date='2024-05-01')
+
+
+def test_writes_and_edits_stay_in_sync(storage):
+    fill(storage)
+    with RecordStore.open(storage) as store:
+        store.sync(storage)
+
+    # 启用索引后，recorder 的写入直接同步到索引
+    write_records(DAYS[0], [make_record('new one')], storage, 'markdown')
+    write_records(DAYS[1], [make_record('new a'), make_record('new b')], storage, 'markdown')
+    with RecordStore.open(storage) as store:
+        assert store.sync(storage) == 0
+        assert_in_sync(store, storage)
+
+    # 手动编辑和删除的日文件在下次查询前重新导入或移除
+    md_path = storage / f'{DAYS[2]}.md'
+    md_path.write_text(md_path.read_text(encoding='utf-8').replace('p1', 'edited'), encoding='utf-8')
+    (storage / f'{DAYS[0]}.md').unlink()
+    with RecordStore.open(storage) as store:
+        assert store.sync(storage) == 1
+        assert_in_sync(store, storage)
+        assert not store.query(DAYS[0], DAYS[0])
+
+
+def test_sync_ignores_non_date_markdown_files(storage):
+    fill(storage)
+    (storage / 'weekly-report.md').write_text('# 周报\n', encoding='utf-8')
+    with RecordStore.open(storage) as store:
+        assert store.sync(storage) == len(DAYS)
+        assert_in_sync(store, storage)
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""markdown 日文件写入：增量概览统计 sidecar 与全量重算一致，增量追加（原地写入的例外）"""
+
+from conftest import make_record
+from tracker_core.writer import apply_summary, load_counters, scan_summary, write_records
+
+DAY = '2024-05-01'
+
+
+def write_one(storage, problem, **fields):
+    return write_records(DAY, [make_record(problem, **fields)], storage, 'markdown')
+
+
+def test_fast_append_only_appends_rows_and_patches_summary(storage):
+    md_path = write_one(storage, 'first')
+    write_one(storage, 'second')
+    before = md_path.read_bytes()
+    inode = md_path.stat().st_ino
+
+    write_one(storage, 'third', status='已解决', time='3')
+    after = md_path.read_bytes()
+
+    # 原地路径：同一个文件，已有字节只有概览区数字变化，新行接在末尾
+    assert md_path.stat().st_ino == inode
+    assert len(after) > len(before)
+    changed = [i for i, (a, b) in enumerate(zip(before, after)) if a != b]
+    assert changed and max(changed) < before.index('## 详细记录'.encode('utf-8'))
+
+    content = after.decode('utf-8')
+    assert content == apply_summary(content, scan_summary(content))
+
+
+def test_counters_match_full_rescan(storage):
+    md_path = None
+    for i in range(12):
+        md_path = write_one(storage, f'p{i}', status='已解决' if i % 3 else '待解决', time=str(i),
+                            type='执行失败' if i % 2 else '工具错误')
+
+    content = md_path.read_text(encoding='utf-8')
+    saved = load_counters(md_path)
+    assert saved is not None
+    assert saved['summary'] == scan_summary(content)
+    assert content == apply_summary(content, scan_summary(content))
+    assert '- 记录总数: 12' in content
+
+
+def test_manual_edit_invalidates_counters(storage):
+    md_path = write_one(storage, 'first')
+    write_one(storage, 'second')
+    assert load_counters(md_path) is not None
+
+    content = md_path.read_text(encoding='utf-8')
+    lines = content.split('\n')
+    row = next(i for i, line in enumerate(lines) if '| first |' in line)
+    del lines[row]
+    md_path.write_text('\n'.join(lines), encoding='utf-8')
+    assert load_counters(md_path) is None
+
+    write_one(storage, 'third')
+    content = md_path.read_text(encoding='utf-8')
+    assert '- 记录总数: 2' in content
+    assert load_counters(md_path)['summary'] == scan_summary(content)
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+"""
+Claude Session Tracker - 共用核心库
+observer、recorder、analyst 的脚本和 hooks 共用的记录解析、存储、统计与文件锁：
+
+- paths:   存储目录
+- records: 紧凑记录类型与码表
+- parser:  markdown 日文件表格解析（兼容旧版 9 列与完整 12 列）
+- writer:  日文件写入（概览统计 sidecar、原子改写、日志模式）
+- log:     追加写入的 JSONL 记录日志
+- locks:   跨进程文件锁
+- cache:   解析结果缓存
+- history: 按日期范围加载日文件
+- store:   SQLite 记录索引
+- stats:   统计累加器
+- cli:     脚本共用的命令行参数类型
+
+脚本通过把插件根目录加入 sys.path 后以 ``from tracker_core.xxx import ...`` 使用。
+"""
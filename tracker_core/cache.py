@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Claude Session Tracker - 解析结果缓存
+每个日文件一个 pickle 缓存项（.cache/YYYY-MM-DD.pickle），以文件大小、修改时间和 inode 作为有效性标记，
+查看历史时只重新解析改动过的文件
+"""
+
+import os
+import pickle
+
+# 解析结果格式变化时递增，使旧缓存失效
+CACHE_VERSION = 4
+
+# 读取 pickle 缓存时视为"缓存不可用"的异常：文件不存在、写入中断被截断、内容损坏或类定义已改变
+PICKLE_ERRORS = (OSError, EOFError, ValueError, TypeError, AttributeError, ImportError,
+                 pickle.UnpicklingError)
+
+
+def get_cache_dir(storage_path):
+    """获取缓存目录（存储目录下的 .cache/）"""
+    return storage_path / '.cache'
+
+
+def file_key(path):
+    """文件的 (大小, 修改时间, inode)"""
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns, stat.st_ino
+
+
+def load_versioned_pickle(path, version):
+    """读取 save_versioned_pickle 写入的内容，不存在、损坏或版本不符时返回 None"""
+    try:
+        with open(path, 'rb') as f:
+            saved_version, payload = pickle.load(f)
+    except PICKLE_ERRORS:
+        return None
+    return payload if saved_version == version else None
+
+
+def save_versioned_pickle(path, version, payload):
+    """带格式版本写入 pickle：先写临时文件再替换，读取方不会读到写了一半的文件"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    with open(tmp_path, 'wb') as f:
+        pickle.dump((version, payload), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+class CachedState:
+    """可增量更新并整体缓存为 pickle 的状态的基类
+
+    子类设置 STATE_VERSION（格式变化时递增）；TRANSIENT 中的字段只对本次运行有意义
+    （如本次重新解析的日文件数），不写入缓存，读取后重置为 0。
+    """
+
+    STATE_VERSION = 0
+    TRANSIENT = ()
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        for name in self.TRANSIENT:
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        for name in self.TRANSIENT:
+            setattr(self, name, 0)
+
+    @classmethod
+    def load(cls, path):
+        """读取缓存，不存在、损坏或版本不符时返回空状态"""
+        state = load_versioned_pickle(path, cls.STATE_VERSION)
+        return state if isinstance(state, cls) else cls()
+
+    def save(self, path):
+        save_versioned_pickle(path, self.STATE_VERSION, self)
+
+
+class ParseCache:
+    """按文件缓存解析结果，并统计命中/未命中次数"""
+
+    def __init__(self, storage_path):
+        self.cache_dir = get_cache_dir(storage_path)
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, md_path):
+        return self.cache_dir / f'{md_path.stem}.pickle'
+
+    def _read(self, entry_path, key):
+        entry = load_versioned_pickle(entry_path, CACHE_VERSION)
+        if entry is None or entry[0] != key:
+            return None
+        return entry[1]
+
+    def _write(self, entry_path, key, records):
+        try:
+            save_versioned_pickle(entry_path, CACHE_VERSION, (key, records))
+        except OSError:
+            # 缓存写入失败不影响查看
+            pass
+
+    def load(self, md_path, date_str, parse):
+        """返回日文件的解析结果，缓存失效时调用 parse(md_path, date_str) 并写回缓存"""
+        key = file_key(md_path)
+        entry_path = self._entry_path(md_path)
+
+        records = self._read(entry_path, key)
+        if records is not None:
+            self.hits += 1
+            return records
+
+        self.misses += 1
+        records = parse(md_path, date_str)
+        self._write(entry_path, key, records)
+        return records
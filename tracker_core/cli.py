@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Claude Session Tracker - 命令行参数
+各脚本共用的 argparse 参数类型
+"""
+
+import argparse
+from datetime import date
+
+
+def parse_date_arg(value):
+    """校验 YYYY-MM-DD 格式的日期参数"""
+    try:
+        return date.fromisoformat(value).isoformat()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"日期格式应为 YYYY-MM-DD: {value}")
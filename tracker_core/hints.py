@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Claude Session Tracker - 历史解决方案提示索引
+已解决记录的问题描述建立倒排索引（检索词 → 记录编号），检索词按 IDF 加权；
+查询时把 prompt 切为检索词，累加命中的历史问题的权重，得分为历史问题的加权检索词被 prompt 覆盖的比例。
+索引由 build_hints.py 离线增量生成（.cache/solution_hints.pickle），hook 只读取，每个进程加载一次
+"""
+
+import heapq
+import math
+import os
+from array import array
+
+from .cache import get_cache_dir, load_versioned_pickle, save_versioned_pickle
+from .text import shingles
+
+# 索引格式变化时递增，使旧索引失效
+HINT_VERSION = 1
+
+# 每次查询返回的历史解决方案数
+HINT_TOP_K = 3
+
+# 历史问题的加权检索词至少有这个比例出现在 prompt 中才作为提示
+HINT_MIN_SCORE = 0.5
+
+# prompt 只取开头这么多字符参与查询（问题描述通常在开头，之后多为粘贴的日志）
+MAX_QUERY_CHARS = 2000
+
+# 出现在超过这么多条历史问题中的检索词不建索引：区分度低，且倒排列表过长会拖慢查询
+MAX_POSTINGS = 2000
+
+
+def get_hint_index_path(storage_path):
+    """获取提示索引路径"""
+    return get_cache_dir(storage_path) / 'solution_hints.pickle'
+
+
+class HintIndex:
+    """已解决问题的倒排索引
+
+    docs 为去重后的 (问题描述, 解决方案, 相关文档, 最近日期, 出现次数)，
+    postings 为检索词 → 含该词的 docs 编号，weights 为检索词的 IDF 权重，
+    norms 为每条问题的检索词权重之和。
+    """
+
+    def __init__(self, docs=(), postings=None, weights=None, norms=None):
+        self.docs = list(docs)
+        self.postings = postings or {}
+        self.weights = weights or {}
+        self.norms = norms if norms is not None else array('d')
+
+    def __len__(self):
+        return len(self.docs)
+
+    @classmethod
+    def build(cls, docs, doc_terms):
+        """由问题列表和各问题的检索词集合建立索引"""
+        postings = {}
+        for doc_id, terms in enumerate(doc_terms):
+            for term in terms:
+                ids = postings.get(term)
+                if ids is None:
+                    ids = postings[term] = array('I')
+                ids.append(doc_id)
+
+        count = len(docs)
+        postings = {term: ids for term, ids in postings.items() if len(ids) <= MAX_POSTINGS}
+        weights = {term: math.log(1 + count / len(ids)) for term, ids in postings.items()}
+        norms = array('d', (sum(weights.get(term, 0.0) for term in terms) for terms in doc_terms))
+        return cls(docs, postings, weights, norms)
+
+    def lookup(self, text, top=HINT_TOP_K, min_score=HINT_MIN_SCORE):
+        """与 text 相似的历史问题 [{problem, solution, docs, date, count, score}]，按得分降序"""
+        scores = {}
+        for term in shingles(text[:MAX_QUERY_CHARS]):
+            weight = self.weights.get(term)
+            if weight is None:
+                continue
+            for doc_id in self.postings[term]:
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight
+
+        norms, docs = self.norms, self.docs
+        candidates = []
+        for doc_id, total in scores.items():
+            score = total / norms[doc_id]
+            if score >= min_score:
+                # 得分相同时优先出现次数多、日期近的问题
+                candidates.append((round(score, 3), docs[doc_id][4], docs[doc_id][3], doc_id))
+
+        hints = []
+        for score, _, _, doc_id in heapq.nlargest(top, candidates):
+            problem, solution, doc_refs, date_str, count = docs[doc_id]
+            hints.append({
+                'problem': problem, 'solution': solution, 'docs': doc_refs,
+                'date': date_str, 'count': count, 'score': score,
+            })
+        return hints
+
+    @classmethod
+    def load(cls, path):
+        """读取索引，不存在、损坏或版本不符时返回 None"""
+        state = load_versioned_pickle(path, HINT_VERSION)
+        if state is None:
+            return None
+        try:
+            return cls(*state)
+        except (TypeError, ValueError):
+            return None
+
+    def save(self, path):
+        save_versioned_pickle(path, HINT_VERSION, (self.docs, self.postings, self.weights, self.norms))
+
+
+class HintLoader:
+    """进程内只加载一次提示索引；索引文件被重新生成（大小或修改时间变化）后下次查询时重新加载
+
+    供 hook 使用：索引不存在或无法读取时不给提示，不影响路由。
+    """
+
+    def __init__(self, path_func):
+        self.path_func = path_func
+        self.stamp = None
+        self.index = None
+
+    def get(self):
+        path = self.path_func()
+        try:
+            stat = os.stat(path)
+        except OSError:
+            self.stamp, self.index = None, None
+            return None
+        stamp = (stat.st_size, stat.st_mtime_ns)
+        if stamp != self.stamp:
+            self.index = HintIndex.load(path)
+            self.stamp = stamp
+        return self.index
+
+    def lookup(self, text, top=HINT_TOP_K):
+        index = self.get()
+        if index is None:
+            return []
+        return index.lookup(text, top)
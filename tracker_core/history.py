@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Claude Session Tracker - 按日期范围加载日文件
+先由日期范围确定候选日文件，范围外的文件不会被打开；未改动的日文件可直接使用解析缓存
+"""
+
+from datetime import date, timedelta
+
+from .parser import iter_day_records, parse_day_records
+from .paths import get_storage_path
+
+# 范围不超过该天数时直接拼出候选文件名逐个检查，否则扫描目录后按文件名过滤
+MAX_PROBE_DAYS = 366
+
+
+def is_day_stem(stem):
+    """文件名（不含扩展名）是否为 YYYY-MM-DD 格式的有效日期"""
+    try:
+        return date.fromisoformat(stem).isoformat() == stem
+    except ValueError:
+        return False
+
+
+def iter_day_files(storage_path, start_date=None, end_date=None):
+    """按日期顺序列出范围内（含两端）的日文件，None 表示不限
+
+    只比较文件名中的日期字符串，范围外的文件不会被打开；文件名不是 YYYY-MM-DD 的 .md 文件
+    （如手动放入的 weekly-report.md）不是日文件，跳过。
+    """
+    if start_date and end_date:
+        # fromisoformat 由 C 实现，不会像 strptime 那样在首次调用时导入 _strptime/locale/calendar
+        first = date.fromisoformat(start_date)
+        last = date.fromisoformat(end_date)
+        if (last - first).days < MAX_PROBE_DAYS:
+            for offset in range((last - first).days + 1):
+                md_file = storage_path / f"{(first + timedelta(days=offset)).isoformat()}.md"
+                if md_file.exists():
+                    yield md_file
+            return
+
+    for md_file in sorted(storage_path.glob('*.md')):
+        date_str = md_file.stem
+        if (start_date and date_str < start_date) or (end_date and date_str > end_date):
+            continue
+        if is_day_stem(date_str):
+            yield md_file
+
+
+def iter_records(storage_path=None, cache=None, start_date=None, end_date=None):
+    """按日期顺序逐条返回日期范围内（含两端，默认不限）的记录（生成器）
+
+    传入 cache（ParseCache）时，大小、修改时间和 inode 未变的日文件直接使用缓存的解析结果；
+    否则逐行解析，内存占用与历史长度无关。
+    """
+    if storage_path is None:
+        storage_path = get_storage_path()
+
+    if not storage_path.exists():
+        return
+
+    for md_file in iter_day_files(storage_path, start_date, end_date):
+        date_str = md_file.stem
+        if cache is not None:
+            yield from cache.load(md_file, date_str, parse_day_records)
+        else:
+            yield from iter_day_records(md_file, date_str)
+
+
+def get_all_records(storage_path=None, cache=None, start_date=None, end_date=None):
+    """获取日期范围内（含两端，默认不限）的所有记录列表"""
+    return list(iter_records(storage_path, cache, start_date, end_date))
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Claude Session Tracker - 教练知识库文件格式
+知识库按问题类型和会话阶段各一组条目，每个条目含已解决记录数、耗时合计，以及常见问题、有效解决方案、
+相关文档（各带出现次数）。文件为定长二进制表加字符串堆（小端）:
+
+  文件头  魔数、格式版本、生成次数、条目数、列表项数、覆盖的日文件数
+  条目表  维度、取值、记录数、耗时合计、三个列表在列表项表中的起点和长度
+  列表项  文本在字符串堆中的偏移和长度、出现次数
+  字符串堆 UTF-8 文本
+
+读取时 mmap 整个文件，只解析文件头和条目表，列表项和文本按需读取，不必重新分析原始历史
+"""
+
+import mmap
+import os
+import struct
+
+# 格式变化时递增，旧文件视为不存在
+KNOWLEDGE_VERSION = 1
+
+MAGIC = b'CKB1'
+
+# 条目的维度（文件中保存下标）
+DIMENSIONS = ('type', 'stage')
+
+# 每个条目的列表（文件中按此顺序保存）
+LISTS = ('problems', 'solutions', 'docs')
+
+HEADER = struct.Struct('<4sIIIII')
+ENTRY = struct.Struct('<B3x10I')
+ITEM = struct.Struct('<III')
+
+
+def get_knowledge_dir(storage_path):
+    """获取知识库目录（存储目录下的 knowledge/）"""
+    return storage_path / 'knowledge'
+
+
+def get_knowledge_path(storage_path):
+    """获取教练知识库文件路径"""
+    return get_knowledge_dir(storage_path) / 'coach_kb.bin'
+
+
+def write_knowledge(path, entries, generation, day_count):
+    """写入知识库文件（先写临时文件再替换，读取方不会看到写了一半的文件）
+
+    entries 为 (维度, 取值, 记录数, 耗时合计, 常见问题, 解决方案, 相关文档) 的可迭代对象，
+    三个列表均为 [(文本, 出现次数)]，按写入顺序保存。
+    """
+    heap = bytearray()
+    strings = {}
+
+    def intern(text):
+        ref = strings.get(text)
+        if ref is None:
+            data = text.encode('utf-8')
+            ref = strings[text] = (len(heap), len(data))
+            heap.extend(data)
+        return ref
+
+    entry_rows = []
+    items = []
+    for dimension, value, count, minutes, *lists in entries:
+        row = [DIMENSIONS.index(dimension), *intern(value), count, minutes]
+        for values in lists:
+            row.extend((len(items), len(values)))
+            items.extend((*intern(text), n) for text, n in values)
+        entry_rows.append(row)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, KNOWLEDGE_VERSION, generation, len(entry_rows), len(items), day_count))
+        f.write(b''.join(ENTRY.pack(*row) for row in entry_rows))
+        f.write(b''.join(ITEM.pack(*item) for item in items))
+        f.write(heap)
+    os.replace(tmp_path, path)
+
+
+class KnowledgeBase:
+    """mmap 方式只读打开的知识库"""
+
+    def __init__(self, mm):
+        self.mm = mm
+        magic, version, self.generation, entry_count, self.item_count, self.day_count = \
+            HEADER.unpack_from(mm)
+        if magic != MAGIC or version != KNOWLEDGE_VERSION:
+            raise ValueError('不是当前版本的知识库文件')
+        self.items_offset = HEADER.size + entry_count * ENTRY.size
+        self.heap_offset = self.items_offset + self.item_count * ITEM.size
+        self.rows = list(ENTRY.iter_unpack(mm[HEADER.size:self.items_offset]))
+        self.index = {(DIMENSIONS[row[0]], self._text(row[1], row[2])): row for row in self.rows}
+
+    @classmethod
+    def open(cls, path):
+        """打开知识库，不存在、为空、损坏或版本不符时返回 None"""
+        try:
+            with open(path, 'rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        try:
+            return cls(mm)
+        except (struct.error, ValueError, IndexError, UnicodeDecodeError):
+            mm.close()
+            return None
+
+    def close(self):
+        self.mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _text(self, offset, length):
+        start = self.heap_offset + offset
+        return self.mm[start:start + length].decode('utf-8')
+
+    def _items(self, first, count, limit):
+        result = []
+        offset = self.items_offset + first * ITEM.size
+        for _ in range(min(count, limit)):
+            text_offset, length, n = ITEM.unpack_from(self.mm, offset)
+            result.append({'text': self._text(text_offset, length), 'count': n})
+            offset += ITEM.size
+        return result
+
+    def _entry(self, dimension, value, row, limit):
+        count, minutes = row[3], row[4]
+        entry = {
+            'dimension': dimension, 'value': value, 'count': count, 'minutes': minutes,
+            'avg_minutes': round(minutes / count, 1) if count else 0,
+        }
+        for i, name in enumerate(LISTS):
+            entry[name] = self._items(row[5 + 2 * i], row[6 + 2 * i], limit)
+        return entry
+
+    def values(self, dimension):
+        """维度下的全部取值，按记录数降序"""
+        rows = [(row[3], value) for (dim, value), row in self.index.items() if dim == dimension]
+        return [value for _, value in sorted(rows, key=lambda item: (-item[0], item[1]))]
+
+    def entry(self, dimension, value, limit=None):
+        """单个条目（各列表最多 limit 项），不存在时返回 None"""
+        row = self.index.get((dimension, value))
+        if row is None:
+            return None
+        return self._entry(dimension, value, row, self.item_count if limit is None else limit)
+
+    def entries(self, dimension, limit=None):
+        """维度下的全部条目，按记录数降序"""
+        return [self.entry(dimension, value, limit) for value in self.values(dimension)]
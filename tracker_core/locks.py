@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Claude Session Tracker - 跨进程文件锁
+多个 Claude Code 会话同时记录时，用锁文件串行化同一天文件的读-改-写；不同日期互不等待
+"""
+
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def file_lock(lock_path, shared=False):
+    """持有 lock_path 上的锁；shared=True 时为共享读锁（Windows 下总是独占）"""
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if fcntl:
+            fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+    finally:
+        os.close(fd)
+
+
+def get_day_lock_path(storage_path, date_str):
+    """某天的写锁文件（存储目录下的 .locks/）"""
+    return storage_path / '.locks' / f'{date_str}.lock'
+
+
+def day_lock(storage_path, date_str):
+    """某天日文件、日志、sidecar 的写锁"""
+    return file_lock(get_day_lock_path(storage_path, date_str))
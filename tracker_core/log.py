@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Claude Session Tracker - 追加写入的记录日志
+每天一个 JSONL 文件，每条记录追加一行并 fsync；markdown 日文件由日志渲染生成
+"""
+
+import json
+import os
+
+from .paths import get_log_dir
+
+
+def get_log_path(storage_path, date_str):
+    """获取指定日期的日志文件路径"""
+    return get_log_dir(storage_path) / f'{date_str}.jsonl'
+
+
+def append_records(storage_path, date_str, records):
+    """追加记录到日志，写入后 fsync，单次写入成本与文件大小无关"""
+    log_path = get_log_path(storage_path, date_str)
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+
+    data = ''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in records).encode('utf-8')
+    with open(log_path, 'a+b') as f:
+        # 上次写入中断留下的残缺行没有换行符，先补上，新记录不会接在残缺行后面被一起丢弃
+        if f.seek(0, os.SEEK_END):
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b'\n':
+                data = b'\n' + data
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    return log_path
+
+
+def append_record(storage_path, date_str, record):
+    """追加单条记录到日志"""
+    return append_records(storage_path, date_str, [record])
+
+
+def read_records(storage_path, date_str):
+    """按写入顺序读取日志中的记录（跳过写入中断产生的残缺行）"""
+    log_path = get_log_path(storage_path, date_str)
+    if not log_path.exists():
+        return []
+
+    records = []
+    with open(log_path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def list_log_dates(storage_path):
+    """列出所有有日志的日期"""
+    log_dir = get_log_dir(storage_path)
+    if not log_dir.exists():
+        return []
+    return sorted(p.stem for p in log_dir.glob('*.jsonl'))
+
+
+def is_stale(storage_path, date_str):
+    """markdown 视图是否落后于日志"""
+    log_path = get_log_path(storage_path, date_str)
+    if not log_path.exists():
+        return False
+    md_path = storage_path / f'{date_str}.md'
+    if not md_path.exists():
+        return True
+    return log_path.stat().st_mtime_ns > md_path.stat().st_mtime_ns
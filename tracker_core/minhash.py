@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Claude Session Tracker - MinHash 签名与 LSH 分桶
+问题描述切分为检索词集合（text.shingles），取 NUM_PERM 个哈希函数各自的最小值组成签名，
+两个签名相同位置取值相等的比例即两组检索词 Jaccard 相似度的估计。签名按 BANDS 段分桶，
+任一段完全相同的描述落入同一个桶，只需与同桶的描述比较，不必两两比较
+"""
+
+from collections import Counter
+from hashlib import shake_128
+from operator import eq
+
+# 签名长度（哈希函数个数）及分段：BANDS 段 × ROWS 行，相似度约 (1/BANDS)^(1/ROWS) ≈ 0.5 以上的描述大概率同桶
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+
+# 同桶的描述估计相似度达到该值才视为相似
+SIMILARITY_THRESHOLD = 0.5
+
+# 每个桶只看最近加入的这些成员，近似描述很多时查找成本仍有上限
+MAX_BUCKET_MEMBERS = 32
+
+# 同桶次数最多的这些签名才逐个比较相似度
+MAX_CANDIDATES = 8
+
+# 每个检索词的 shake_128 摘要切为 NUM_PERM 个 32 位整数，作为相互独立的哈希函数取值
+DIGEST_SIZE = NUM_PERM * 4
+
+
+def signature(tokens):
+    """检索词集合的 MinHash 签名（NUM_PERM 个整数的元组），集合为空时返回 None"""
+    if not tokens:
+        return None
+    # 每个检索词一次摘要即得到全部哈希值，逐列取最小值在 C 中完成
+    rows = [memoryview(shake_128(token.encode('utf-8')).digest(DIGEST_SIZE)).cast('I') for token in tokens]
+    return tuple(map(min, zip(*rows)))
+
+
+def similarity(sig1, sig2):
+    """两个签名估计的 Jaccard 相似度"""
+    return sum(map(eq, sig1, sig2)) / NUM_PERM
+
+
+def band_keys(sig):
+    """签名各段的桶键（整数元组的哈希值与运行无关，可以持久化）"""
+    return [hash(sig[i:i + ROWS]) for i in range(0, NUM_PERM, ROWS)]
+
+
+class LSHIndex:
+    """签名的 LSH 分桶索引；相同签名只保存一次，编号按加入顺序"""
+
+    def __init__(self):
+        self.signatures = []
+        self.ids = {}
+        self.buckets = [{} for _ in range(BANDS)]
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def find(self, sig):
+        """已加入的相同签名的编号，没有时返回 None"""
+        return self.ids.get(sig)
+
+    def add(self, sig):
+        """加入签名，返回编号（相同签名返回已有编号）"""
+        sig_id = self.ids.get(sig)
+        if sig_id is None:
+            sig_id = self.ids[sig] = len(self.signatures)
+            self.signatures.append(sig)
+            for bucket, key in zip(self.buckets, band_keys(sig)):
+                bucket.setdefault(key, []).append(sig_id)
+        return sig_id
+
+    def similar(self, sig, threshold=SIMILARITY_THRESHOLD, limit=MAX_CANDIDATES):
+        """估计相似度达到 threshold 的已加入签名 [(相似度, 编号)]，按相似度降序
+
+        同桶的段数越多越可能相似，只比较同桶段数最多的 limit 个签名。
+        """
+        hits = Counter()
+        for bucket, key in zip(self.buckets, band_keys(sig)):
+            members = bucket.get(key)
+            if members:
+                hits.update(members[-MAX_BUCKET_MEMBERS:])
+
+        result = []
+        for sig_id, _ in hits.most_common(limit):
+            score = similarity(sig, self.signatures[sig_id])
+            if score >= threshold:
+                result.append((score, sig_id))
+        result.sort(key=lambda item: (-item[0], item[1]))
+        return result
+
+    def __getstate__(self):
+        # ids 可由 signatures 重建，不写入缓存
+        return {'signatures': self.signatures, 'buckets': self.buckets}
+
+    def __setstate__(self, state):
+        self.signatures = state['signatures']
+        self.buckets = state['buckets']
+        self.ids = {sig: sig_id for sig_id, sig in enumerate(self.signatures)}
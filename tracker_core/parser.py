@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Claude Session Tracker - markdown 日文件解析
+observer 与 recorder 共用的表格解析：兼容旧版 9 列和完整 12 列表格，逐行处理，不整体读入文件
+"""
+
+import re
+
+from .records import Record
+
+# 表格单元格分隔符（不匹配转义的 \|）
+CELL_SEPARATOR = re.compile(r'(?<!\\)\|')
+
+# 表头分隔行（只由 |、-、: 和空白组成）；数据行的单元格里出现 --- 时不会被误判
+SEPARATOR_ROW = re.compile(r'\|[\s:|-]*\|')
+
+# 详细记录表格的列数（时间戳 + 11 个字段）
+TABLE_COLUMNS = 12
+
+
+def split_table_row(line):
+    """拆分表格行为单元格，并还原转义的 |"""
+    if '\\|' not in line:
+        return [c.strip() for c in line.strip().split('|')[1:-1]]
+    cells = CELL_SEPARATOR.split(line.strip())[1:-1]
+    return [c.strip().replace('\\|', '|') for c in cells]
+
+
+def normalize_parts(parts):
+    """把表格行的单元格统一为完整 12 列
+
+    旧版 9 列为：时间戳 | 阶段 | 步骤 | 问题 | 类型 | 解决方案 | 耗时 | 优先级 | 状态，
+    缺少相关文档、Session ID 和备注。
+    """
+    if len(parts) == 9:
+        return parts[:6] + ['', ''] + parts[6:] + ['']
+    if len(parts) != TABLE_COLUMNS:
+        return (parts + [''] * TABLE_COLUMNS)[:TABLE_COLUMNS]
+    return parts
+
+
+def iter_table_rows(lines):
+    """从日文件的行中逐条取出详细记录表格的单元格（生成器），统一为 12 列"""
+    in_table = False
+    for line in lines:
+        line = line.strip()
+        if not in_table:
+            in_table = line.startswith('| 时间戳 ')
+            continue
+        if not line.startswith('|') or len(line) <= 10:
+            continue
+        if '---' in line and SEPARATOR_ROW.fullmatch(line):
+            continue
+
+        parts = split_table_row(line)
+        if len(parts) >= 9 and parts[0] != '时间戳':
+            yield normalize_parts(parts)
+
+
+def parse_existing_records(content):
+    """解析日文件内容中的全部记录，返回 12 列单元格列表"""
+    return list(iter_table_rows(content.split('\n')))
+
+
+def iter_day_records(md_path, date_str):
+    """逐行解析日文件中的记录（生成器），返回 Record"""
+    with open(md_path, encoding='utf-8') as f:
+        for parts in iter_table_rows(f):
+            yield Record.from_parts(date_str, parts)
+
+
+def parse_day_records(md_path, date_str):
+    """解析日文件中的全部记录"""
+    return list(iter_day_records(md_path, date_str))
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Claude Session Tracker - 存储目录
+"""
+
+import os
+from pathlib import Path
+
+
+def get_storage_path():
+    """获取存储路径（CLAUDE_ANALYSIS_PATH，默认为 ~/.claude/claude-analysis）"""
+    custom_path = os.environ.get('CLAUDE_ANALYSIS_PATH')
+    if custom_path:
+        return Path(custom_path)
+    return Path.home() / '.claude' / 'claude-analysis'
+
+
+def ensure_directory(path):
+    """确保目录存在"""
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def get_log_dir(storage_path):
+    """获取日志目录（存储目录下的 log/）"""
+    return storage_path / 'log'
+
+
+def get_storage_mode():
+    """获取存储模式: markdown（默认，直接改写日文件）或 log（追加写日志，markdown 按需渲染）"""
+    return os.environ.get('CLAUDE_ANALYSIS_STORAGE', 'markdown')
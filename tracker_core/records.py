@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Claude Session Tracker - 紧凑的记录类型
+解析后的每条记录用 __slots__ 对象表示，阶段、类型、优先级、状态这类取值有限的字段
+在码表中驻留为小整数编码，不再为每行保留一份字符串
+"""
+
+# 概览中统计的问题类型
+SUMMARY_TYPES = ['工具错误', '理解偏差', '执行失败', '性能问题', '其他']
+
+FIELDS = (
+    'date', 'timestamp', 'stage', 'step', 'problem', 'type', 'solution',
+    'docs', 'session', 'time', 'priority', 'status', 'note'
+)
+
+
+class CodeTable:
+    """字符串 <-> 小整数编码的码表，新取值按出现顺序追加"""
+
+    def __init__(self, values=()):
+        self.values = []
+        self.codes = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def value(self, code):
+        return self.values[code]
+
+    def __len__(self):
+        return len(self.values)
+
+
+STAGES = CodeTable()
+TYPES = CodeTable(SUMMARY_TYPES)
+PRIORITIES = CodeTable(['高', '中', '低'])
+STATUSES = CodeTable(['已解决', '待解决', '需跟进'])
+
+
+class Record:
+    """一条会话记录
+
+    stage/type/priority/status 以编码保存（*_code），同名属性返回对应字符串；
+    pickle 时保存字符串，码表在不同进程间不必一致。
+    """
+
+    __slots__ = (
+        'date', 'timestamp', 'stage_code', 'step', 'problem', 'type_code', 'solution',
+        'docs', 'session', 'time', 'priority_code', 'status_code', 'note'
+    )
+
+    def __init__(self, date, timestamp='', stage='', step='', problem='', type='', solution='',
+                 docs='', session='', time='', priority='', status='', note=''):
+        self.date = date
+        self.timestamp = timestamp
+        self.stage_code = STAGES.code(stage)
+        self.step = step
+        self.problem = problem
+        self.type_code = TYPES.code(type)
+        self.solution = solution
+        self.docs = docs
+        self.session = session
+        self.time = time
+        self.priority_code = PRIORITIES.code(priority)
+        self.status_code = STATUSES.code(status)
+        self.note = note
+
+    @property
+    def stage(self):
+        return STAGES.values[self.stage_code]
+
+    @property
+    def type(self):
+        return TYPES.values[self.type_code]
+
+    @property
+    def priority(self):
+        return PRIORITIES.values[self.priority_code]
+
+    @property
+    def status(self):
+        return STATUSES.values[self.status_code]
+
+    @classmethod
+    def from_parts(cls, date_str, parts):
+        """由表格行的单元格（时间戳起，最多 12 列）创建"""
+        return cls(date_str, *parts[:12])
+
+    @classmethod
+    def from_mapping(cls, mapping):
+        """由字段名到取值的映射（如 SQLite 行、JSON 对象）创建"""
+        return cls(*(mapping.get(field) or '' for field in FIELDS))
+
+    def astuple(self):
+        return tuple(getattr(self, field) for field in FIELDS)
+
+    def to_dict(self):
+        return dict(zip(FIELDS, self.astuple()))
+
+    def __reduce__(self):
+        return (Record, self.astuple())
+
+    def __eq__(self, other):
+        if not isinstance(other, Record):
+            return NotImplemented
+        return self.astuple() == other.astuple()
+
+    def __repr__(self):
+        return f"Record({', '.join(f'{f}={v!r}' for f, v in zip(FIELDS, self.astuple()))})"
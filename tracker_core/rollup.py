@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Claude Session Tracker - 预聚合汇总（summary/）
+每个日文件对应一个日汇总（按类型、阶段、状态、优先级计数及耗时合计），月汇总由日汇总组合，
+季度汇总由月汇总组合，ISO 周汇总由日汇总组合。每个汇总记录组成它的日文件的大小和修改时间，
+日文件改动后只重新解析该日，再重新组合它所在的周、月、季度；周报、月报只需读取少量汇总文件
+"""
+
+import json
+import os
+from datetime import date, timedelta
+
+from .history import iter_day_files
+from .parser import iter_day_records
+from .stats import classify_status
+from .store import file_stamp, parse_minutes
+
+# 汇总格式变化时递增，使旧汇总失效
+ROLLUP_VERSION = 1
+
+# 支持的汇总周期
+PERIODS = ('week', 'month', 'quarter')
+
+# 分组计数的维度（与 RecordStore.aggregate 一致）
+GROUP_COLUMNS = ('type', 'stage', 'status', 'priority')
+
+
+def get_summary_dir(storage_path):
+    """获取汇总目录（存储目录下的 summary/）"""
+    return storage_path / 'summary'
+
+
+def new_aggregate():
+    """空的汇总数据
+
+    total/total_time/type/stage/status/priority/date 与 RecordStore.aggregate 的结构一致，
+    可直接交给 stats_from_aggregate；date_time、date_resolved 为每日耗时和已解决数。
+    """
+    aggregate = {'total': 0, 'total_time': 0}
+    for column in GROUP_COLUMNS + ('date', 'date_time', 'date_resolved'):
+        aggregate[column] = {}
+    return aggregate
+
+
+def add_record(aggregate, r):
+    """把一条记录累加到汇总"""
+    minutes = parse_minutes(r.time)
+    aggregate['total'] += 1
+    aggregate['total_time'] += minutes
+    for column in GROUP_COLUMNS:
+        counts = aggregate[column]
+        value = getattr(r, column)
+        counts[value] = counts.get(value, 0) + 1
+
+    day = r.date
+    aggregate['date'][day] = aggregate['date'].get(day, 0) + 1
+    aggregate['date_time'][day] = aggregate['date_time'].get(day, 0) + minutes
+    resolved = 1 if classify_status(r.status) == 'resolved' else 0
+    aggregate['date_resolved'][day] = aggregate['date_resolved'].get(day, 0) + resolved
+
+
+def merge_aggregate(into, aggregate):
+    """把一个汇总合并到另一个汇总"""
+    into['total'] += aggregate['total']
+    into['total_time'] += aggregate['total_time']
+    for column, counts in aggregate.items():
+        if isinstance(counts, dict):
+            target = into[column]
+            for key, count in counts.items():
+                target[key] = target.get(key, 0) + count
+    return into
+
+
+def period_key(period, day):
+    """日期所在周期的名称：2024-W03、2024-01、2024-Q1"""
+    if period == 'week':
+        year, week = day.isocalendar()[:2]
+        return f'{year}-W{week:02d}'
+    if period == 'month':
+        return f'{day.year}-{day.month:02d}'
+    return f'{day.year}-Q{(day.month - 1) // 3 + 1}'
+
+
+def month_end(first):
+    """该月最后一天"""
+    return (first.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+
+
+def period_range(period, key):
+    """周期的第一天和最后一天（date）"""
+    if period == 'week':
+        year, week = key.split('-W')
+        first = date.fromisocalendar(int(year), int(week), 1)
+        return first, first + timedelta(days=6)
+    if period == 'month':
+        first = date.fromisoformat(f'{key}-01')
+        return first, month_end(first)
+    year, quarter = key.split('-Q')
+    first = date(int(year), int(quarter) * 3 - 2, 1)
+    return first, month_end(date(int(year), int(quarter) * 3, 1))
+
+
+def iter_period_keys(period, first, last):
+    """按顺序列出与 [first, last] 相交的周期名称"""
+    seen = None
+    day = first
+    while day <= last:
+        key = period_key(period, day)
+        if key != seen:
+            yield key
+            seen = key
+        day = period_range(period, key)[1] + timedelta(days=1)
+
+
+class Rollups:
+    """按需构建和读取汇总，并统计重新解析的日文件数和重新组合的周期数"""
+
+    def __init__(self, storage_path):
+        self.storage_path = storage_path
+        self.summary_dir = get_summary_dir(storage_path)
+        self.days_parsed = 0
+        self.periods_composed = 0
+
+    def _path(self, period, key):
+        return self.summary_dir / period / f'{key}.json'
+
+    def _read(self, path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('version') != ROLLUP_VERSION:
+            return None
+        return entry
+
+    def _write(self, path, entry):
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            # 汇总写入失败不影响结果，下次重新计算
+            pass
+
+    def day(self, md_file):
+        """日文件的汇总；日文件大小或修改时间变化时重新解析"""
+        path = self._path('day', md_file.stem)
+        stamp = list(file_stamp(md_file))
+        entry = self._read(path)
+        if entry is not None and entry['source'] == stamp:
+            return entry['aggregate']
+
+        self.days_parsed += 1
+        aggregate = new_aggregate()
+        for r in iter_day_records(md_file, md_file.stem):
+            add_record(aggregate, r)
+        self._write(path, {'version': ROLLUP_VERSION, 'source': stamp, 'aggregate': aggregate})
+        return aggregate
+
+    def period(self, period, key):
+        """周期汇总；组成它的日文件有增删或改动时重新组合
+
+        月、周由日汇总组合，季度由月汇总组合。
+        """
+        first, last = period_range(period, key)
+        day_files = list(iter_day_files(self.storage_path, first.isoformat(), last.isoformat()))
+        sources = {md_file.stem: list(file_stamp(md_file)) for md_file in day_files}
+
+        path = self._path(period, key)
+        entry = self._read(path)
+        if entry is not None and entry['sources'] == sources:
+            return entry['aggregate']
+
+        self.periods_composed += 1
+        aggregate = new_aggregate()
+        if period == 'quarter':
+            for month in iter_period_keys('month', first, last):
+                merge_aggregate(aggregate, self.period('month', month))
+        else:
+            for md_file in day_files:
+                merge_aggregate(aggregate, self.day(md_file))
+        self._write(path, {'version': ROLLUP_VERSION, 'sources': sources, 'aggregate': aggregate})
+        return aggregate
+
+    def range(self, start_date=None, end_date=None):
+        """日期范围（含两端，None 表示不限）的汇总：整月使用月汇总，首尾不足一个月的部分使用日汇总"""
+        day_files = list(iter_day_files(self.storage_path, start_date, end_date))
+        aggregate = new_aggregate()
+        if not day_files:
+            return aggregate
+
+        first = date.fromisoformat(start_date or day_files[0].stem)
+        last = date.fromisoformat(end_date or day_files[-1].stem)
+        by_date = {md_file.stem: md_file for md_file in day_files}
+
+        day = first
+        while day <= last:
+            if day.day == 1 and month_end(day) <= last:
+                merge_aggregate(aggregate, self.period('month', period_key('month', day)))
+                day = month_end(day) + timedelta(days=1)
+                continue
+            md_file = by_date.get(day.isoformat())
+            if md_file is not None:
+                merge_aggregate(aggregate, self.day(md_file))
+            day += timedelta(days=1)
+        return aggregate
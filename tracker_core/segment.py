@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Claude Session Tracker - 二进制记录段
+一个段文件保存一段日期（按日期排序）的全部记录，按列存放（小端，每列 8 字节对齐）:
+
+  文件头   魔数、格式版本、记录数、枚举值个数、字符串堆大小
+  枚举表   阶段、类型、优先级、状态共用的取值表（各值在字符串堆中的偏移、长度）
+  定长列   日期 (yyyymmdd)、时间戳分钟数、四个枚举码、耗时分钟数、Session 哈希、标记
+  文本列   步骤、问题、解决方案、相关文档、Session、备注，以及非规范的时间戳/耗时原文（偏移列 + 长度列）
+  字符串堆 UTF-8 文本，相同文本只存一份
+
+读取时 mmap 整个文件，各列直接作为 memoryview 使用：按日期二分定位范围，计数、求和、分组统计都在
+定长列上完成，不解析文本也不复制数据；只有取出完整记录时才解码该行的文本
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from hashlib import blake2b
+
+from .records import Record
+from .store import parse_minutes
+
+# 格式变化时递增，旧版本的段文件不再读取
+SEGMENT_VERSION = 1
+
+MAGIC = b'TSEG'
+
+HEADER = struct.Struct('<4sHxxIII4x')
+
+# 定长列（名称, array 类型码），按此顺序存放
+FIXED_COLUMNS = (
+    ('date', 'I'),
+    ('clock', 'H'),
+    ('stage', 'H'),
+    ('type', 'H'),
+    ('priority', 'H'),
+    ('status', 'H'),
+    ('minutes', 'I'),
+    ('session_hash', 'Q'),
+    ('flags', 'B'),
+)
+
+# 以枚举码保存的列（共用一张取值表）
+ENUM_COLUMNS = ('stage', 'type', 'priority', 'status')
+
+# 保存在字符串堆中的列；timestamp、time 只在原文不是规范格式时保存（见 flags）
+TEXT_COLUMNS = ('step', 'problem', 'solution', 'docs', 'session', 'note', 'timestamp', 'time')
+
+# flags 位：时间戳不是 HH:MM / 耗时不是规范的整数，原文在对应文本列
+RAW_TIMESTAMP = 1
+RAW_TIME = 2
+
+# 时间戳不是 HH:MM 时 clock 列的取值
+NO_CLOCK = 0xFFFF
+
+MAX_MINUTES = 0xFFFFFFFF
+
+# 与 RecordStore.aggregate 一致的分组维度
+GROUP_COLUMNS = ('type', 'stage', 'status', 'priority')
+
+
+def get_segment_dir(storage_path):
+    """获取段文件目录（存储目录下的 segments/）"""
+    return storage_path / 'segments'
+
+
+def date_key(date_str):
+    """YYYY-MM-DD 转为 yyyymmdd 整数"""
+    return int(date_str.replace('-', ''))
+
+
+def date_string(key):
+    """yyyymmdd 整数转为 YYYY-MM-DD"""
+    return f'{key // 10000:04d}-{key // 100 % 100:02d}-{key % 100:02d}'
+
+
+def session_hash(session):
+    """Session ID 的 64 位哈希（与运行无关，空值为 0），按会话分组时不必比较字符串"""
+    if not session:
+        return 0
+    return int.from_bytes(blake2b(session.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def encode_clock(timestamp):
+    """HH:MM 转为当天的分钟数，其他格式返回 NO_CLOCK"""
+    if len(timestamp) == 5 and timestamp[2] == ':' and timestamp[:2].isdigit() and timestamp[3:].isdigit():
+        hours, minutes = int(timestamp[:2]), int(timestamp[3:])
+        if hours < 24 and minutes < 60:
+            return hours * 60 + minutes
+    return NO_CLOCK
+
+
+def decode_clock(clock):
+    return f'{clock // 60:02d}:{clock % 60:02d}'
+
+
+def align(size):
+    return -(-size // 8) * 8
+
+
+def little_endian(column):
+    """array 转为小端字节（大端机器上先复制再换序）"""
+    if sys.byteorder == 'big':
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def write_segment(path, records):
+    """把记录写入段文件（按日期稳定排序；先写临时文件再替换），返回记录数"""
+    records = sorted(records, key=lambda r: r.date)
+    fixed = {name: array(code) for name, code in FIXED_COLUMNS}
+    offsets = {name: array('I') for name in TEXT_COLUMNS}
+    lengths = {name: array('I') for name in TEXT_COLUMNS}
+    # 堆的第一个字节为占位，空文本为 (0, 0)，其他文本的偏移都大于 0：偏移即可唯一确定一段文本
+    heap = bytearray(1)
+    strings = {'': (0, 0)}
+    enum_values = []
+    enum_codes = {}
+
+    def intern(text):
+        ref = strings.get(text)
+        if ref is None:
+            data = text.encode('utf-8')
+            ref = strings[text] = (len(heap), len(data))
+            heap.extend(data)
+        return ref
+
+    def enum_code(value):
+        code = enum_codes.get(value)
+        if code is None:
+            code = enum_codes[value] = len(enum_values)
+            enum_values.append(value)
+        return code
+
+    for r in records:
+        clock = encode_clock(r.timestamp)
+        minutes = min(parse_minutes(r.time), MAX_MINUTES)
+        flags = 0
+        texts = {'step': r.step, 'problem': r.problem, 'solution': r.solution, 'docs': r.docs,
+                 'session': r.session, 'note': r.note, 'timestamp': '', 'time': ''}
+        if clock == NO_CLOCK:
+            flags |= RAW_TIMESTAMP
+            texts['timestamp'] = r.timestamp
+        if r.time != str(minutes):
+            flags |= RAW_TIME
+            texts['time'] = r.time
+
+        fixed['date'].append(date_key(r.date))
+        fixed['clock'].append(clock)
+        for name in ENUM_COLUMNS:
+            fixed[name].append(enum_code(getattr(r, name)))
+        fixed['minutes'].append(minutes)
+        fixed['session_hash'].append(session_hash(r.session))
+        fixed['flags'].append(flags)
+        for name in TEXT_COLUMNS:
+            offset, length = intern(texts[name])
+            offsets[name].append(offset)
+            lengths[name].append(length)
+
+    if len(enum_values) > 0xFFFF:
+        raise ValueError(f'枚举取值过多（{len(enum_values)} 个），请缩小段的日期范围')
+    enum_refs = [intern(value) for value in enum_values]
+
+    columns = [array('I', (offset for offset, _ in enum_refs)), array('I', (length for _, length in enum_refs))]
+    columns.extend(fixed[name] for name, _ in FIXED_COLUMNS)
+    for name in TEXT_COLUMNS:
+        columns.extend((offsets[name], lengths[name]))
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, SEGMENT_VERSION, len(records), len(enum_values), len(heap)))
+        for column in columns:
+            data = little_endian(column)
+            f.write(data)
+            f.write(b'\0' * (align(len(data)) - len(data)))
+        f.write(heap)
+    os.replace(tmp_path, path)
+    return len(records)
+
+
+class Segment:
+    """mmap 方式只读打开的段文件
+
+    columns 为定长列（memoryview，可直接切片、求和、计数），enum_values 为枚举码对应的取值。
+    """
+
+    def __init__(self, mm):
+        self.mm = mm
+        magic, version, self.count, enum_count, heap_size = HEADER.unpack_from(mm)
+        if magic != MAGIC or version != SEGMENT_VERSION:
+            raise ValueError('不是当前版本的段文件')
+        self._views = [memoryview(mm)]
+        self._offset = HEADER.size
+        self._dates = {}
+        try:
+            enum_offsets = self._take('I', enum_count)
+            enum_lengths = self._take('I', enum_count)
+            self.columns = {name: self._take(code, self.count) for name, code in FIXED_COLUMNS}
+            self.text_columns = {name: (self._take('I', self.count), self._take('I', self.count))
+                                 for name in TEXT_COLUMNS}
+            self.heap = self._views[0][self._offset:self._offset + heap_size]
+            self._views.append(self.heap)
+            if len(self.heap) != heap_size:
+                raise ValueError('段文件不完整')
+            self.enum_values = [self._decode(offset, length)
+                                for offset, length in zip(enum_offsets, enum_lengths)]
+        except Exception:
+            self._release()
+            raise
+
+    def _take(self, typecode, count):
+        """从当前位置取一列（小端机器上零复制）"""
+        size = array(typecode).itemsize * count
+        raw = self._views[0][self._offset:self._offset + size]
+        if len(raw) != size:
+            raw.release()
+            raise ValueError('段文件不完整')
+        self._offset += align(size)
+        if sys.byteorder == 'big':
+            column = array(typecode, raw.tobytes())
+            column.byteswap()
+            return column
+        view = raw.cast(typecode)
+        self._views.extend((raw, view))
+        return view
+
+    @classmethod
+    def open(cls, path):
+        """打开段文件，不存在、为空、损坏或版本不符时返回 None"""
+        try:
+            with open(path, 'rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        try:
+            return cls(mm)
+        except (struct.error, ValueError, TypeError, UnicodeDecodeError):
+            mm.close()
+            return None
+
+    def _release(self):
+        for view in reversed(self._views):
+            view.release()
+
+    def close(self):
+        self._release()
+        try:
+            self.mm.close()
+        except BufferError:
+            # 调用方仍持有列的切片，mmap 随这些切片一起释放
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def _decode(self, offset, length):
+        return str(self.heap[offset:offset + length], 'utf-8')
+
+    def text(self, name, i):
+        """第 i 条记录的文本列"""
+        offsets, lengths = self.text_columns[name]
+        return self._decode(offsets[i], lengths[i])
+
+    def date_range(self, start_date=None, end_date=None):
+        """日期范围（含两端，None 表示不限）内记录的下标区间 [lo, hi)"""
+        dates = self.columns['date']
+        lo = bisect_left(dates, date_key(start_date)) if start_date else 0
+        hi = bisect_right(dates, date_key(end_date)) if end_date else self.count
+        return lo, max(lo, hi)
+
+    def record(self, i):
+        """第 i 条记录（解码文本）"""
+        columns, values = self.columns, self.enum_values
+        key = columns['date'][i]
+        date_str = self._dates.get(key)
+        if date_str is None:
+            date_str = self._dates[key] = date_string(key)
+        flags = columns['flags'][i]
+        timestamp = self.text('timestamp', i) if flags & RAW_TIMESTAMP else decode_clock(columns['clock'][i])
+        time = self.text('time', i) if flags & RAW_TIME else str(columns['minutes'][i])
+        return Record(
+            date_str, timestamp, values[columns['stage'][i]], self.text('step', i), self.text('problem', i),
+            values[columns['type'][i]], self.text('solution', i), self.text('docs', i), self.text('session', i),
+            time, values[columns['priority'][i]], values[columns['status'][i]], self.text('note', i),
+        )
+
+    def _text_slice(self, name, lo, hi, decoded):
+        """文本列 [lo, hi) 的全部文本；堆中同一段文本只解码一次（decoded 为跨列共用的偏移 → 文本缓存）"""
+        offsets, lengths = self.text_columns[name]
+        offset_list = offsets[lo:hi].tolist()
+        found = dict(zip(offset_list, lengths[lo:hi].tolist()))
+        heap = self.heap
+        for offset in found.keys() - decoded.keys():
+            decoded[offset] = str(heap[offset:offset + found[offset]], 'utf-8')
+        return list(map(decoded.__getitem__, offset_list))
+
+    def iter_records(self, start_date=None, end_date=None):
+        """按日期顺序逐条返回范围内的记录（生成器）
+
+        逐列批量取出范围内的值，不逐条查列；重复出现的文本（同样的问题、会话）只解码一次。
+        """
+        lo, hi = self.date_range(start_date, end_date)
+        if lo == hi:
+            return
+        columns, values = self.columns, self.enum_values
+        decoded = {0: ''}
+        fixed = [columns[name][lo:hi].tolist() for name in ('date', 'clock', 'minutes', 'flags')]
+        # 时间戳和耗时都是规范格式时不必读取它们的原文列
+        raw = any(fixed[3])
+        texts = {name: self._text_slice(name, lo, hi, decoded) if raw or name not in ('timestamp', 'time')
+                 else [''] * (hi - lo) for name in TEXT_COLUMNS}
+        dates = {}
+        enums = [[values[code] for code in columns[name][lo:hi].tolist()] for name in ENUM_COLUMNS]
+        rows = zip(*fixed, *enums, *(texts[name] for name in TEXT_COLUMNS))
+        for (key, clock, minutes, flags, stage, type_name, priority, status,
+             step, problem, solution, docs, session, note, raw_timestamp, raw_time) in rows:
+            date_str = dates.get(key)
+            if date_str is None:
+                date_str = dates[key] = date_string(key)
+            yield Record(
+                date_str, raw_timestamp if flags & RAW_TIMESTAMP else decode_clock(clock), stage, step, problem,
+                type_name, solution, docs, session, raw_time if flags & RAW_TIME else str(minutes),
+                priority, status, note,
+            )
+
+    def aggregate(self, start_date=None, end_date=None):
+        """日期范围内的分组统计，结构与 RecordStore.aggregate 一致（可交给 stats_from_aggregate）
+
+        只读取定长列：计数和求和在 memoryview 切片上完成，不解码任何文本。
+        """
+        lo, hi = self.date_range(start_date, end_date)
+        columns, values = self.columns, self.enum_values
+        result = {'total': hi - lo, 'total_time': sum(columns['minutes'][lo:hi])}
+        for name in GROUP_COLUMNS:
+            result[name] = {values[code]: n for code, n in Counter(columns[name][lo:hi]).items()}
+        result['date'] = {date_string(key): n for key, n in Counter(columns['date'][lo:hi]).items()}
+        return result
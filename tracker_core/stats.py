@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Claude Session Tracker - 记录统计
+单遍累加器：逐条累加记录，或把 SQLite 分组统计转换为同样的结构，observer 与 recorder 共用
+"""
+
+from collections import defaultdict
+
+# 状态分类（按顺序匹配关键词）
+STATUS_CLASSES = (('resolved', '已解决'), ('pending', '待解决'), ('follow_up', '需跟进'))
+
+
+def classify_status(status):
+    """状态字符串归类为 resolved/pending/follow_up，均不匹配时返回 None"""
+    for name, keyword in STATUS_CLASSES:
+        if keyword in status:
+            return name
+    return None
+
+
+def new_stats():
+    """空的统计数据"""
+    return {
+        'total_count': 0,
+        'total_time': 0,
+        'resolved': 0,
+        'pending': 0,
+        'follow_up': 0,
+        'type_distribution': defaultdict(int),
+        'stage_distribution': defaultdict(int),
+        'priority_distribution': defaultdict(int),
+        'daily_counts': defaultdict(int)
+    }
+
+
+def add_to_stats(stats, r):
+    """把一条记录累加到统计数据"""
+    stats['total_count'] += 1
+
+    # 时间统计
+    if r.time and r.time.isdigit():
+        stats['total_time'] += int(r.time)
+
+    # 状态统计
+    status = r.status
+    if '已解决' in status:
+        stats['resolved'] += 1
+    elif '待解决' in status:
+        stats['pending'] += 1
+    elif '需跟进' in status:
+        stats['follow_up'] += 1
+
+    # 类型、阶段、优先级分布
+    stats['type_distribution'][r.type] += 1
+    stats['stage_distribution'][r.stage] += 1
+    stats['priority_distribution'][r.priority] += 1
+
+    # 每日计数
+    stats['daily_counts'][r.date] += 1
+
+
+def calculate_stats(records):
+    """单次遍历计算统计数据，records 可以是任意可迭代对象"""
+    stats = new_stats()
+    for r in records:
+        add_to_stats(stats, r)
+    return stats
+
+
+def stats_from_aggregate(agg):
+    """把 SQLite 分组统计（RecordStore.aggregate）转换为 calculate_stats 的格式"""
+    stats = new_stats()
+    stats['total_count'] = agg['total']
+    stats['total_time'] = agg['total_time']
+    stats['type_distribution'].update(agg['type'])
+    stats['stage_distribution'].update(agg['stage'])
+    stats['priority_distribution'].update(agg['priority'])
+    stats['daily_counts'].update(agg['date'])
+
+    for status, count in agg['status'].items():
+        name = classify_status(status or '')
+        if name:
+            stats[name] += count
+
+    return stats
+
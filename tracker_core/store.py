@@ -0,0 +1,442 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Claude Session Tracker - SQLite 记录索引（可选）
+markdown 日文件仍是数据源，records.db 是带索引的派生副本：
+存在 records.db 时，查看脚本用 SQL 做日期范围查询和分组统计，不再逐个解析 markdown 文件；
+全文检索使用同一数据库中的 FTS5 倒排索引（records_fts），首次检索时建立，之后随记录写入增量更新
+"""
+
+import heapq
+import math
+from collections import Counter
+from pathlib import Path
+
+from .history import iter_day_files
+from .parser import iter_table_rows
+from .records import Record
+from .text import count_phrase, index_text, match_expression, query_phrases, query_terms
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    timestamp TEXT,
+    stage TEXT,
+    step TEXT,
+    problem TEXT,
+    type TEXT,
+    solution TEXT,
+    docs TEXT,
+    session TEXT,
+    time TEXT,
+    minutes INTEGER NOT NULL DEFAULT 0,
+    priority TEXT,
+    status TEXT,
+    note TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_records_date ON records(date);
+CREATE INDEX IF NOT EXISTS idx_records_session ON records(session);
+CREATE INDEX IF NOT EXISTS idx_records_type ON records(date, type);
+CREATE INDEX IF NOT EXISTS idx_records_stage ON records(date, stage);
+CREATE INDEX IF NOT EXISTS idx_records_status ON records(date, status);
+CREATE INDEX IF NOT EXISTS idx_records_priority ON records(date, priority);
+
+-- 每个日文件导入时的大小和修改时间，用于发现需要重新导入的文件
+CREATE TABLE IF NOT EXISTS sources (
+    date TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+"""
+
+RECORD_COLUMNS = [
+    'date', 'timestamp', 'stage', 'step', 'problem', 'type', 'solution',
+    'docs', 'session', 'time', 'priority', 'status', 'note'
+]
+
+# 分组统计支持的维度
+GROUP_COLUMNS = ('type', 'stage', 'status', 'priority', 'date')
+
+# 全文检索的字段及计分权重（问题描述最重要）
+SEARCH_COLUMNS = ('problem', 'solution', 'step', 'note')
+SEARCH_WEIGHTS = (4.0, 2.0, 1.0, 1.0)
+
+# 一次检索最多参与排序的候选记录数：匹配更多时只对最近写入的这些记录计分，使常见词的检索耗时有上限
+SEARCH_CANDIDATES = 1000
+
+# BM25 参数
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 全文索引格式（分词方式）变化时递增，旧索引在下次检索时重建
+FTS_VERSION = 2
+
+# 检索词写入 FTS5 前已由 index_text 切分并以空格分隔，unicode61 只需按空格拆开；
+# search_terms 为各检索词出现的记录数（文档频率），term 为空字符串的一行是已索引的记录总数。
+# FTS5 自带的 bm25() 每次检索都要遍历所有匹配记录统计文档频率，因此单独维护
+FTS_SCHEMA = (
+    f"CREATE VIRTUAL TABLE records_fts USING fts5({', '.join(SEARCH_COLUMNS)}, "
+    f"tokenize='unicode61 remove_diacritics 0')",
+    "CREATE TABLE search_terms (term TEXT PRIMARY KEY, df INTEGER NOT NULL) WITHOUT ROWID",
+)
+
+
+def get_db_path(storage_path):
+    """获取数据库路径"""
+    return storage_path / 'records.db'
+
+
+def is_enabled(storage_path):
+    """是否启用了 SQLite 索引（已执行过导入）"""
+    return get_db_path(storage_path).exists()
+
+
+def parse_minutes(time_str):
+    """耗时列转为分钟数，非数字按 0 计"""
+    return int(time_str) if time_str and time_str.isdigit() else 0
+
+
+def file_stamp(path):
+    """文件的 (大小, 修改时间)"""
+    stat = path.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+class RecordStore:
+    """SQLite 记录索引"""
+
+    def __init__(self, db_path):
+        self.db_path = Path(db_path)
+        # 只在实际打开索引时加载 sqlite3，未启用索引的查看不必付出导入开销
+        import sqlite3
+
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self.conn.create_function('index_text', 1, index_text)
+        # 全文索引只在建立过（检索过）之后随写入维护
+        self.fts = self._fts_version() == FTS_VERSION
+
+    @classmethod
+    def open(cls, storage_path):
+        return cls(get_db_path(storage_path))
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ---- 全文索引 ----
+
+    def _fts_version(self):
+        """已建立的全文索引版本（PRAGMA user_version），未建立时为 0"""
+        exists = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'records_fts'"
+        ).fetchone()
+        return self.conn.execute("PRAGMA user_version").fetchone()[0] if exists else 0
+
+    def _count_terms(self, where, params, sign):
+        """按满足条件的记录的索引文本增减文档频率（sign 为 1 或 -1）"""
+        counts = Counter()
+        rows = self.conn.execute(
+            f"SELECT {', '.join(SEARCH_COLUMNS)} FROM records_fts "
+            f"WHERE rowid IN (SELECT id FROM records WHERE {where})", params
+        )
+        for row in rows:
+            counts.update(set(' '.join(row).split()))
+            counts[''] += 1
+        self.conn.executemany(
+            "INSERT INTO search_terms (term, df) VALUES (?, ?) "
+            "ON CONFLICT (term) DO UPDATE SET df = df + excluded.df",
+            ((term, sign * count) for term, count in counts.items())
+        )
+        if sign < 0:
+            self.conn.execute("DELETE FROM search_terms WHERE df <= 0 AND term != ''")
+
+    def _index_rows(self, where, params):
+        """把满足条件的记录写入全文索引"""
+        if self.fts:
+            columns = ', '.join(SEARCH_COLUMNS)
+            values = ', '.join(f"index_text({c})" for c in SEARCH_COLUMNS)
+            self.conn.execute(
+                f"INSERT INTO records_fts (rowid, {columns}) SELECT id, {values} FROM records WHERE {where}",
+                params
+            )
+            self._count_terms(where, params, 1)
+
+    def _delete_date(self, date_str):
+        """删除一天的记录及其全文索引"""
+        if self.fts:
+            self._count_terms("date = ?", (date_str,), -1)
+            self.conn.execute(
+                "DELETE FROM records_fts WHERE rowid IN (SELECT id FROM records WHERE date = ?)",
+                (date_str,)
+            )
+        self.conn.execute("DELETE FROM records WHERE date = ?", (date_str,))
+
+    def ensure_fts(self):
+        """需要时建立（或按新版本重建）全文索引，返回是否可用；SQLite 未编译 FTS5 时返回 False"""
+        if self.fts:
+            return True
+        import sqlite3
+
+        columns = ', '.join(SEARCH_COLUMNS)
+        values = ', '.join(f"index_text({c})" for c in SEARCH_COLUMNS)
+        try:
+            with self.conn:
+                self.conn.execute("DROP TABLE IF EXISTS records_fts")
+                self.conn.execute("DROP TABLE IF EXISTS search_terms")
+                for statement in FTS_SCHEMA:
+                    self.conn.execute(statement)
+                self.conn.execute(
+                    f"INSERT INTO records_fts (rowid, {columns}) SELECT id, {values} FROM records"
+                )
+                # 整库建立时由 fts5vocab 直接统计文档频率，不必在 Python 中逐行计数
+                self.conn.execute(
+                    "CREATE VIRTUAL TABLE temp.records_vocab USING fts5vocab(main, records_fts, row)"
+                )
+                self.conn.execute("INSERT INTO search_terms SELECT term, doc FROM temp.records_vocab")
+                self.conn.execute("DROP TABLE temp.records_vocab")
+                self.conn.execute(
+                    "INSERT INTO search_terms (term, df) SELECT '', COUNT(*) FROM records"
+                )
+                self.conn.execute(f"PRAGMA user_version = {FTS_VERSION}")
+            self.fts = True
+        except sqlite3.OperationalError:
+            self.fts = False
+        return self.fts
+
+    # ---- 写入 ----
+
+    def _insert_rows(self, rows):
+        """插入 (RECORD_COLUMNS 顺序的取值..., 分钟数) 行"""
+        self.conn.executemany(
+            f"INSERT INTO records ({', '.join(RECORD_COLUMNS)}, minutes) "
+            f"VALUES ({', '.join('?' * len(RECORD_COLUMNS))}, ?)",
+            rows
+        )
+
+    def _insert(self, records):
+        self._insert_rows(
+            [r.get(c) or '' for c in RECORD_COLUMNS] + [parse_minutes(r.get('time'))]
+            for r in records
+        )
+
+    def _set_stamp(self, date_str, stamp):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO sources (date, size, mtime_ns) VALUES (?, ?, ?)",
+            (date_str, stamp[0], stamp[1])
+        )
+
+    def get_stamp(self, date_str):
+        row = self.conn.execute(
+            "SELECT size, mtime_ns FROM sources WHERE date = ?", (date_str,)
+        ).fetchone()
+        return (row['size'], row['mtime_ns']) if row else None
+
+    def import_file(self, md_path, date_str=None):
+        """（重新）导入一个日文件"""
+        date_str = date_str or md_path.stem
+        with self.conn:
+            self._delete_date(date_str)
+            with open(md_path, encoding='utf-8') as f:
+                self._insert_rows([date_str] + parts + [parse_minutes(parts[8])]
+                                  for parts in iter_table_rows(f))
+            self._index_rows("date = ?", (date_str,))
+            self._set_stamp(date_str, file_stamp(md_path))
+
+    def append(self, md_path, date_str, record, stamp_before):
+        """recorder 写入日文件后同步新记录"""
+        self.extend(md_path, date_str, [record], stamp_before)
+
+    def extend(self, md_path, date_str, records, stamp_before):
+        """recorder 向日文件写入一批记录后同步
+
+        写入前的文件状态与索引一致时只插入新行，否则重新导入整天。
+        """
+        if self.get_stamp(date_str) != stamp_before:
+            self.import_file(md_path, date_str)
+            return
+        with self.conn:
+            last_id = self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM records").fetchone()[0]
+            self._insert(dict(r, date=date_str) for r in records)
+            self._index_rows("id > ?", (last_id,))
+            self._set_stamp(date_str, file_stamp(md_path))
+
+    def sync(self, storage_path, start_date=None, end_date=None):
+        """导入范围内新增或改动过的日文件，删除已不存在的日期，返回导入的文件数"""
+        md_files = {md_file.stem: md_file for md_file in iter_day_files(storage_path, start_date, end_date)}
+
+        imported = 0
+        known = dict(((r['date'], (r['size'], r['mtime_ns'])) for r in self.conn.execute(
+            "SELECT date, size, mtime_ns FROM sources"
+        )))
+        for date_str, md_file in sorted(md_files.items()):
+            if known.get(date_str) != file_stamp(md_file):
+                self.import_file(md_file, date_str)
+                imported += 1
+
+        removed = [d for d in known if d not in md_files
+                   and (not start_date or d >= start_date) and (not end_date or d <= end_date)]
+        if removed:
+            with self.conn:
+                for date_str in removed:
+                    self._delete_date(date_str)
+                    self.conn.execute("DELETE FROM sources WHERE date = ?", (date_str,))
+        return imported
+
+    # ---- 查询 ----
+
+    @staticmethod
+    def _range(start_date, end_date, column='date'):
+        clauses, params = [], []
+        if start_date:
+            clauses.append(f"{column} >= ?")
+            params.append(start_date)
+        if end_date:
+            clauses.append(f"{column} <= ?")
+            params.append(end_date)
+        return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+    def iter_query(self, start_date=None, end_date=None):
+        """按日期范围（含两端）逐条返回记录（生成器），按日期和写入顺序排列"""
+        where, params = self._range(start_date, end_date)
+        rows = self.conn.execute(
+            f"SELECT {', '.join(RECORD_COLUMNS)} FROM records{where} ORDER BY date, id", params
+        )
+        for row in rows:
+            yield Record(*row)
+
+    def query(self, start_date=None, end_date=None):
+        """按日期范围（含两端）查询记录列表"""
+        return list(self.iter_query(start_date, end_date))
+
+    def aggregate(self, start_date=None, end_date=None):
+        """按日期范围做分组统计：总数、总耗时及各维度的计数"""
+        where, params = self._range(start_date, end_date)
+        total, total_time = self.conn.execute(
+            f"SELECT COUNT(*), COALESCE(SUM(minutes), 0) FROM records{where}", params
+        ).fetchone()
+
+        result = {'total': total, 'total_time': total_time}
+        for column in GROUP_COLUMNS:
+            rows = self.conn.execute(
+                f"SELECT {column}, COUNT(*) FROM records{where} "
+                f"GROUP BY {column} ORDER BY MIN(id)", params
+            )
+            result[column] = {value: count for value, count in rows}
+        return result
+
+    # ---- 全文检索 ----
+
+    def search(self, query, limit=10, start_date=None, end_date=None, any_term=False):
+        """全文检索，返回按相关度排列的 [(得分, Record)]
+
+        查询中的各项默认全部匹配，any_term 时匹配任一项。FTS5 倒排索引找出匹配的记录，
+        只对最近写入的 SEARCH_CANDIDATES 条（any_term 时每项各取这么多）按 BM25 计分；
+        没有 FTS5 时退回逐条 LIKE 匹配。
+        """
+        if not self.ensure_fts():
+            return self._search_like(query, limit, start_date, end_date, any_term)
+        phrases = query_phrases(query)
+        if not phrases:
+            return []
+
+        if any_term:
+            candidates = {}
+            for phrase in phrases:
+                candidates.update(self._candidates(match_expression([phrase]), start_date, end_date))
+        else:
+            candidates = dict(self._candidates(match_expression(phrases), start_date, end_date))
+        if not candidates:
+            return []
+
+        scores = self._score(candidates, phrases)
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+        ids = [record_id for record_id, _ in top]
+        rows = self.conn.execute(
+            f"SELECT id, {', '.join(RECORD_COLUMNS)} FROM records "
+            f"WHERE id IN ({', '.join('?' * len(ids))})", ids
+        )
+        records = {row[0]: Record(*row[1:]) for row in rows}
+        return [(score, records[record_id]) for record_id, score in top]
+
+    def _candidates(self, expression, start_date, end_date):
+        """匹配表达式的最近写入的候选记录：(id, 各字段的索引文本)"""
+        where, params = self._range(start_date, end_date, 'r.date')
+        join = " JOIN records r ON r.id = f.rowid" if where else ''
+        where = where.replace(' WHERE ', ' AND ', 1)
+        rows = self.conn.execute(
+            f"SELECT f.rowid, {', '.join('f.' + c for c in SEARCH_COLUMNS)} FROM records_fts f{join} "
+            f"WHERE records_fts MATCH ?{where} ORDER BY f.rowid DESC LIMIT ?",
+            [expression] + params + [SEARCH_CANDIDATES]
+        )
+        return ((row[0], tuple(row[1:])) for row in rows)
+
+    def _score(self, candidates, phrases):
+        """按字段加权的 BM25 为候选记录计分
+
+        短语的文档频率取其中各检索词的最小值；字段平均长度取候选记录的平均值。
+        """
+        terms = {term for phrase in phrases for term in phrase.split()}
+        rows = self.conn.execute(
+            f"SELECT term, df FROM search_terms WHERE term IN ({', '.join('?' * (len(terms) + 1))})",
+            [''] + list(terms)
+        )
+        dfs = dict(rows.fetchall())
+        total = dfs.pop('', 0)
+        idf = {}
+        for phrase in phrases:
+            df = min(dfs.get(term, 0) for term in phrase.split())
+            idf[phrase] = math.log(1 + (total - df + 0.5) / (df + 0.5))
+
+        lengths = {record_id: [text.count(' ') + 1 if text else 0 for text in texts]
+                   for record_id, texts in candidates.items()}
+        average = [max(1.0, sum(column) / len(lengths)) for column in zip(*lengths.values())]
+
+        scores = {}
+        for record_id, texts in candidates.items():
+            score = 0.0
+            for column, (text, weight) in enumerate(zip(texts, SEARCH_WEIGHTS)):
+                if not text:
+                    continue
+                norm = BM25_K1 * (1 - BM25_B + BM25_B * lengths[record_id][column] / average[column])
+                for phrase in phrases:
+                    tf = count_phrase(text, phrase)
+                    if tf:
+                        score += idf[phrase] * weight * tf * (BM25_K1 + 1) / (tf + norm)
+            scores[record_id] = score
+        return scores
+
+    def _search_like(self, query, limit, start_date, end_date, any_term):
+        """没有 FTS5 时的检索：LIKE 匹配后按命中字段的权重计分"""
+        terms = query_terms(query)
+        if not terms:
+            return []
+
+        where, params = self._range(start_date, end_date)
+        matches = []
+        for term in terms:
+            matches.append('(' + ' OR '.join(f"{c} LIKE ?" for c in SEARCH_COLUMNS) + ')')
+            params.extend([f'%{term}%'] * len(SEARCH_COLUMNS))
+        condition = '(' + (' OR ' if any_term else ' AND ').join(matches) + ')'
+        where = f"{where} AND {condition}" if where else f" WHERE {condition}"
+
+        results = []
+        rows = self.conn.execute(
+            f"SELECT {', '.join(RECORD_COLUMNS)} FROM records{where} ORDER BY date DESC, id DESC", params
+        )
+        for row in rows:
+            r = Record(*row)
+            score = sum(weight for term in terms
+                        for column, weight in zip(SEARCH_COLUMNS, SEARCH_WEIGHTS)
+                        if term in getattr(r, column).lower())
+            results.append((score, r))
+        # 得分相同时较新的记录在前
+        results.sort(key=lambda item: -item[0])
+        return results[:limit]
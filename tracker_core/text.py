@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Claude Session Tracker - 全文检索分词
+英文等按单词切分并转小写；中日韩文字没有空格分词，连续的文字切为相邻二元组（构建失败 → 构建 建失 失败），
+单个字保留为一元。索引和查询使用同一分词，查询中连续的中文按短语匹配；索引文本另在末尾附上每个中文单字，
+单字查询（「慢」「构」）也能命中
+"""
+
+import re
+from functools import lru_cache
+
+# 中日韩文字（假名、CJK 统一表意文字及扩展 A、兼容表意文字、韩文音节）
+CJK_CHARS = '\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af'
+
+
+@lru_cache(maxsize=None)
+def token_pattern():
+    """一段连续的中日韩文字，或一个其他文字的单词（字母、数字）
+
+    Unicode 字符类编译较慢，首次分词时才编译，查看脚本导入 store 时不必付出这部分开销。
+    """
+    return re.compile(rf'([{CJK_CHARS}]+)|([^\W_{CJK_CHARS}]+)')
+
+
+def cjk_bigrams(run):
+    """连续的中日韩文字切为相邻二元组，单字保留"""
+    if len(run) == 1:
+        return [run]
+    return [run[i:i + 2] for i in range(len(run) - 1)]
+
+
+def tokenize(text):
+    """文本切分为检索词列表（按出现顺序）"""
+    tokens = []
+    for cjk, word in token_pattern().findall(text.lower()):
+        if cjk:
+            tokens.extend(cjk_bigrams(cjk))
+        else:
+            tokens.append(word)
+    return tokens
+
+
+def shingles(text):
+    """文本的检索词集合，用于相似度比较；纯数字（行号、编号等）不参与比较"""
+    return {token for token in tokenize(text) if not token.isdigit()}
+
+
+def index_text(text):
+    """写入全文索引的文本：检索词以空格分隔
+
+    多字中文只切出二元组，单字查询匹配不到，因此再把其中每个字作为一元附在末尾；
+    附在全部二元组之后不打断二元组的相邻关系，多字查询的短语匹配不受影响。
+    """
+    if not text:
+        return ''
+    tokens = tokenize(text)
+    for cjk, _ in token_pattern().findall(text.lower()):
+        if len(cjk) > 1:
+            tokens.extend(cjk)
+    return ' '.join(tokens)
+
+
+def query_terms(query):
+    """查询中的词：连续的中文、单词各为一项（用于 LIKE 回退检索）"""
+    return [cjk or word for cjk, word in token_pattern().findall(query.lower())]
+
+
+def query_phrases(query):
+    """查询拆为检索短语（检索词以空格分隔，去重）：连续的中文为其二元组组成的短语，其他单词各为一个短语"""
+    phrases = (' '.join(cjk_bigrams(cjk)) if cjk else word
+               for cjk, word in token_pattern().findall(query.lower()))
+    return list(dict.fromkeys(phrases))
+
+
+def match_expression(phrases, any_term=False):
+    """检索短语转为 FTS5 MATCH 表达式，默认全部匹配，any_term 时任一匹配"""
+    return (' OR ' if any_term else ' AND ').join(f'"{phrase}"' for phrase in phrases)
+
+
+def count_phrase(text, phrase):
+    """短语在 index_text 文本中出现的次数"""
+    return f' {text} '.count(f' {phrase} ')
@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Claude Session Tracker - 写入 markdown 日文件
+概览统计由 .counters/ sidecar 增量维护，通常只需原地更新概览区并在末尾追加行；
+日志模式下记录追加到 JSONL 日志，markdown 作为派生视图按需渲染
+"""
+
+import json
+import os
+import re
+import zlib
+from datetime import datetime
+
+from . import log as record_log
+from .locks import day_lock
+from .parser import iter_table_rows, parse_existing_records
+from .paths import get_storage_mode, get_storage_path
+from .records import SUMMARY_TYPES
+
+# 记录字段（与表格第 2~12 列顺序一致，第 1 列为时间戳）
+RECORD_FIELDS = [
+    'stage', 'step', 'problem', 'type', 'solution', 'docs',
+    'session', 'time', 'priority', 'status', 'note'
+]
+
+# 不以 | 开头的行（表格之外的内容）
+NON_TABLE_LINE = re.compile(r'\n(?![ \t]*\|)')
+
+# 概览区结束标记及查找范围；sidecar 校验文件末尾的字节数
+SUMMARY_END_MARKER = '\n## 详细记录'.encode('utf-8')
+HEAD_SCAN_BYTES = 64 * 1024
+TAIL_BYTES = 4096
+
+
+def generate_markdown_header(date_str):
+    """生成 markdown 文件头部"""
+    return f"""# Claude Code 会话记录 - {date_str}
+
+## 概览
+
+- 记录总数: 0
+- 总耗时: 0 分钟
+- 已解决问题: 0
+- 待解决问题: 0
+
+## 问题分布
+
+| 类型 | 数量 |
+|------|------|
+| 工具错误 | 0 |
+| 理解偏差 | 0 |
+| 执行失败 | 0 |
+| 性能问题 | 0 |
+| 其他 | 0 |
+
+## 详细记录
+
+| 时间戳 | 阶段 | 步骤 | 问题 | 类型 | 解决方案 | 相关文档 | Session ID | 耗时 | 优先级 | 状态 | 备注 |
+|--------|------|------|------|------|----------|----------|------------|------|--------|------|------|
+"""
+
+
+def new_summary():
+    """空的概览统计"""
+    return {
+        'total_records': 0,
+        'total_time': 0,
+        'resolved': 0,
+        'pending': 0,
+        'type_counts': {t: 0 for t in SUMMARY_TYPES}
+    }
+
+
+def count_record(summary, time_val, status, prob_type):
+    """把一条记录计入概览统计（O(1)）"""
+    summary['total_records'] += 1
+    summary['total_time'] += time_val
+
+    if status:
+        if '已解决' in status:
+            summary['resolved'] += 1
+        elif '待解决' in status or '需跟进' in status:
+            summary['pending'] += 1
+
+    if prob_type:
+        type_counts = summary['type_counts']
+        if prob_type in type_counts:
+            type_counts[prob_type] += 1
+        else:
+            type_counts['其他'] += 1
+
+
+def add_record_to_summary(summary, record):
+    """把新记录计入概览统计"""
+    try:
+        time_val = int(record['time']) if record.get('time') else 0
+    except (TypeError, ValueError):
+        time_val = 0
+    count_record(summary, time_val, record.get('status'), record.get('type'))
+
+
+def scan_summary(content):
+    """解析全部表格行，重新计算概览统计"""
+    summary = new_summary()
+    for parts in iter_table_rows(content.split('\n')):
+        time_val = int(parts[8]) if parts[8].isdigit() else 0
+        count_record(summary, time_val, parts[10], parts[4] or '其他')
+    return summary
+
+
+def apply_summary(content, summary):
+    """把概览统计写回文件头部（只处理"详细记录"之前的部分）"""
+    table_pos = content.find('\n## 详细记录')
+    if table_pos < 0:
+        table_pos = len(content)
+    head, rest = content[:table_pos], content[table_pos:]
+
+    type_counts = summary['type_counts']
+    updated_lines = []
+    for line in head.split('\n'):
+        if line.startswith('- 记录总数:'):
+            updated_lines.append(f"- 记录总数: {summary['total_records']}")
+        elif line.startswith('- 总耗时:'):
+            updated_lines.append(f"- 总耗时: {summary['total_time']} 分钟")
+        elif line.startswith('- 已解决问题:'):
+            updated_lines.append(f"- 已解决问题: {summary['resolved']}")
+        elif line.startswith('- 待解决问题:'):
+            updated_lines.append(f"- 待解决问题: {summary['pending']}")
+        elif line.startswith('| ') and line[2:].split(' |', 1)[0] in type_counts:
+            prob_type = line[2:].split(' |', 1)[0]
+            updated_lines.append(f"| {prob_type} | {type_counts[prob_type]} |")
+        else:
+            updated_lines.append(line)
+
+    return '\n'.join(updated_lines) + rest
+
+
+def update_summary(content, new_record, is_new_file=False):
+    """更新概览统计信息（全量重算）"""
+    summary = scan_summary(content)
+
+    # 对于新文件，记录已经在表格中，不需要再加1
+    # 对于已有文件，需要加1
+    if not is_new_file:
+        add_record_to_summary(summary, new_record)
+
+    return apply_summary(content, summary)
+
+
+def get_counters_path(md_path):
+    """获取日文件概览统计 sidecar 路径"""
+    return md_path.parent / '.counters' / f'{md_path.stem}.json'
+
+
+def file_checksum(head, tail):
+    """日文件校验和：覆盖文件头部（概览区）与末尾块，配合文件大小/修改时间识别手动编辑
+
+    只用于发现改动，使用 zlib.crc32（hashlib 首次导入需加载 OpenSSL，占每次记录启动时间的一大块）。
+    """
+    return format(zlib.crc32(head + b'\0' + tail), '08x')
+
+
+def read_head_tail(f, head_size, size):
+    """读取文件头部概览区与末尾 TAIL_BYTES 字节"""
+    f.seek(0)
+    head = f.read(head_size)
+    f.seek(max(head_size, size - TAIL_BYTES))
+    return head, f.read()
+
+
+def load_counters(md_path):
+    """读取 sidecar 中的概览统计；文件大小、修改时间或校验和不符（被手动编辑过）时返回 None"""
+    try:
+        saved = json.loads(get_counters_path(md_path).read_text(encoding='utf-8'))
+        stat = md_path.stat()
+        if saved.get('size') != stat.st_size or saved.get('mtime_ns') != stat.st_mtime_ns:
+            return None
+        with open(md_path, 'rb') as f:
+            head, tail = read_head_tail(f, saved['head_size'], stat.st_size)
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+    if saved.get('checksum') != file_checksum(head, tail):
+        return None
+    saved['head'] = head
+    return saved
+
+
+def save_counters(md_path, summary, appendable):
+    """保存概览统计及日文件当前的大小、修改时间和校验和"""
+    with open(md_path, 'rb') as f:
+        head_size = f.read(HEAD_SCAN_BYTES).find(SUMMARY_END_MARKER)
+        stat = os.fstat(f.fileno())
+        if head_size < 0:
+            head_size = 0
+            appendable = False
+        head, tail = read_head_tail(f, head_size, stat.st_size)
+
+    counters_path = get_counters_path(md_path)
+    counters_path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        'summary': summary,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'head_size': head_size,
+        'appendable': appendable,
+        'checksum': file_checksum(head, tail)
+    }
+    write_text_atomic(counters_path, json.dumps(payload, ensure_ascii=False))
+
+
+def copy_summary(summary):
+    """复制概览统计（type_counts 为嵌套字典）"""
+    return dict(summary, type_counts=dict(summary['type_counts']))
+
+
+def fast_append(md_path, record, counters, timestamp):
+    """原地更新概览区并在文件末尾追加一行，成本与文件大小无关
+
+    概览区字节长度变化（如计数进位）或表格不在文件末尾时返回 False，由调用方整文件改写。
+
+    这是日文件"先写临时文件再原子替换"的唯一例外：原子替换需要重写整个文件，正是增量统计要避免的。
+    已有的记录行不会被改写——新行以一次追加写入，之后只覆盖概览区中变化的几个字节
+    （长度不变，文件结构不变）。不持锁的读者最坏只会短暂看到尚未更新的计数，不会看到残缺的记录；
+    解析和统计都由表格行重新计算，不读取概览区。
+    """
+    if not counters.get('appendable'):
+        return False
+
+    summary = copy_summary(counters['summary'])
+    add_record_to_summary(summary, record)
+
+    old_head = counters['head']
+    head = old_head.decode('utf-8').replace('\r\n', '\n')
+    new_head = apply_summary(head, summary).replace('\n', os.linesep).encode('utf-8')
+    if len(new_head) != len(old_head):
+        return False
+
+    row = (format_record_row(record, timestamp) + os.linesep).encode('utf-8')
+    # 只覆盖新旧概览区之间不同的字节
+    first = next((i for i, (a, b) in enumerate(zip(old_head, new_head)) if a != b), len(new_head))
+    last = len(new_head)
+    while last > first and old_head[last - 1] == new_head[last - 1]:
+        last -= 1
+    with open(md_path, 'r+b', buffering=0) as f:
+        f.seek(0, os.SEEK_END)
+        f.write(row)
+        if last > first:
+            f.seek(first)
+            f.write(new_head[first:last])
+
+    save_counters(md_path, summary, appendable=True)
+    return True
+
+
+def is_appendable(content):
+    """详细记录表格是否位于文件末尾且以换行结束（可直接追加行）"""
+    header_pos = content.rfind('\n| 时间戳 ')
+    return (header_pos >= 0 and content.endswith('\n')
+            and not NON_TABLE_LINE.search(content.rstrip('\n'), header_pos + 1))
+
+
+def format_record_row(record, timestamp):
+    """构建表格行"""
+    row = [
+        timestamp,
+        record.get('stage', ''),
+        record.get('step', ''),
+        record.get('problem', ''),
+        record.get('type', '其他'),
+        record.get('solution', ''),
+        record.get('docs', ''),
+        record.get('session', ''),
+        record.get('time', ''),
+        record.get('priority', '中'),
+        record.get('status', '待解决'),
+        record.get('note', '')
+    ]
+
+    # 转义表格中的特殊字符，将 None 替换为空字符串
+    row = [str(cell).replace('|', '\\|').replace('\n', ' ') if cell is not None else '' for cell in row]
+
+    return '| ' + ' | '.join(row) + ' |'
+
+
+def append_record(content, record, timestamp=None):
+    """追加新记录到表格"""
+    timestamp = timestamp or datetime.now().strftime('%H:%M')
+    return append_rows(content, format_record_row(record, timestamp))
+
+
+def append_rows(content, table_row):
+    """把一行或多行（以换行分隔）表格行追加到详细记录表格末尾"""
+    # 详细记录表格位于文件末尾时（recorder 生成的文件）直接追加，无需逐行扫描
+    body = content.rstrip('\n')
+    header_pos = body.rfind('\n| 时间戳 ')
+    if header_pos >= 0 and not NON_TABLE_LINE.search(body, header_pos + 1):
+        return body + '\n' + table_row + content[len(body):]
+
+    # 找到表格结束位置并插入新行
+    lines = content.split('\n')
+    table_end = len(lines)
+
+    for i, line in enumerate(lines):
+        if line.strip().startswith('| 时间戳 '):
+            # 找到表头后的分隔行
+            if i + 1 < len(lines) and '---' in lines[i + 1]:
+                # 找到表格的最后一行
+                for j in range(i + 2, len(lines)):
+                    if not lines[j].strip().startswith('|'):
+                        table_end = j
+                        break
+                else:
+                    table_end = len(lines)
+
+    lines.insert(table_end, table_row)
+    return '\n'.join(lines)
+
+
+def render_markdown(date_str, records):
+    """由完整记录列表渲染 markdown 日文件（一次生成，不做逐条插入）"""
+    rows = [format_record_row(r, r.get('timestamp', '')) for r in records]
+    content = generate_markdown_header(date_str) + ''.join(row + '\n' for row in rows)
+    return update_summary(content, {}, is_new_file=True)
+
+
+def write_text_atomic(path, content):
+    """先写临时文件再原子替换，避免读者看到写了一半的文件"""
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    tmp_path.write_text(content, encoding='utf-8')
+    os.replace(tmp_path, path)
+
+
+def render_day(date_str, storage_path=None):
+    """由追加日志重新生成指定日期的 markdown 视图（调用方确认该日有日志，否则会生成空视图）"""
+    if storage_path is None:
+        storage_path = get_storage_path()
+    storage_path.mkdir(parents=True, exist_ok=True)
+    md_path = storage_path / f'{date_str}.md'
+    # 持有当天的写锁，避免渲染期间新追加的记录被较新的视图掩盖
+    with day_lock(storage_path, date_str):
+        records = record_log.read_records(storage_path, date_str)
+        write_text_atomic(md_path, render_markdown(date_str, records))
+    return md_path
+
+
+def list_stale_days(storage_path):
+    """列出 markdown 视图落后于日志的日期"""
+    return [d for d in record_log.list_log_dates(storage_path) if record_log.is_stale(storage_path, d)]
+
+
+def render_stale_days(storage_path=None):
+    """渲染所有落后于日志的 markdown 视图，返回渲染的日期列表"""
+    if storage_path is None:
+        storage_path = get_storage_path()
+    rendered = list_stale_days(storage_path)
+    for date_str in rendered:
+        render_day(date_str, storage_path)
+    return rendered
+
+
+def seed_log_from_markdown(md_path, date_str):
+    """日志模式首次写入某天时，把已有 markdown 中的记录导入日志，保证渲染不丢数据"""
+    records = []
+    for parts in parse_existing_records(md_path.read_text(encoding='utf-8')):
+        record = {'timestamp': parts[0]}
+        for field, value in zip(RECORD_FIELDS, parts[1:]):
+            record[field] = value
+        records.append(record)
+    if records:
+        record_log.append_records(md_path.parent, date_str, records)
+
+
+def append_to_markdown(md_path, date_str, record):
+    """把一条带 timestamp 的记录写入 markdown 日文件（调用方持有当天的写锁）"""
+    timestamp = record['timestamp']
+    stamp_before = None
+    if md_path.exists():
+        stat = md_path.stat()
+        stamp_before = (stat.st_size, stat.st_mtime_ns)
+
+    # 概览统计由 sidecar 增量维护：通常只需原地更新概览区并追加一行
+    counters = load_counters(md_path) if stamp_before else None
+    if counters is None or not fast_append(md_path, record, counters, timestamp):
+        # 读取或创建文件；文件被手动编辑过（校验和不符）时才全量重算统计
+        if md_path.exists():
+            content = md_path.read_text(encoding='utf-8')
+            summary = copy_summary(counters['summary']) if counters else scan_summary(content)
+        else:
+            content = generate_markdown_header(date_str)
+            summary = new_summary()
+
+        add_record_to_summary(summary, record)
+        content = apply_summary(append_record(content, record, timestamp), summary)
+
+        # 整文件改写时先写临时文件再原子替换
+        write_text_atomic(md_path, content)
+        save_counters(md_path, summary, appendable=is_appendable(content))
+
+    # 同步到 SQLite 索引（已启用时）
+    sync_record_store(md_path, date_str, [record], stamp_before)
+
+
+def sync_record_store(md_path, date_str, records, stamp_before):
+    """启用了 SQLite 索引时，把刚写入日文件的记录同步到索引"""
+    from .store import RecordStore, is_enabled
+
+    if not is_enabled(md_path.parent):
+        return
+    with RecordStore.open(md_path.parent) as store:
+        store.extend(md_path, date_str, records, stamp_before)
+
+
+def write_batch_to_markdown(md_path, date_str, records):
+    """把一批记录写入 markdown 日文件（调用方持有当天的写锁）：一次读取、一次写入"""
+    stamp_before = None
+    counters = None
+    if md_path.exists():
+        stat = md_path.stat()
+        stamp_before = (stat.st_size, stat.st_mtime_ns)
+        counters = load_counters(md_path)
+        content = md_path.read_text(encoding='utf-8')
+        summary = copy_summary(counters['summary']) if counters else scan_summary(content)
+    else:
+        content = generate_markdown_header(date_str)
+        summary = new_summary()
+
+    for record in records:
+        add_record_to_summary(summary, record)
+    rows = '\n'.join(format_record_row(r, r['timestamp']) for r in records)
+    content = apply_summary(append_rows(content, rows), summary)
+
+    write_text_atomic(md_path, content)
+    save_counters(md_path, summary, appendable=is_appendable(content))
+    sync_record_store(md_path, date_str, records, stamp_before)
+
+
+def write_records(date_str, records, storage_path=None, storage_mode=None):
+    """把一条或一批记录写入某天（持有当天的写锁），返回写入的文件路径
+
+    缺少 timestamp 的记录使用当前时间。已有日志的日期始终由日志管理，避免两种模式混写导致渲染时丢记录。
+    """
+    if storage_path is None:
+        storage_path = get_storage_path()
+    storage_path.mkdir(parents=True, exist_ok=True)
+    storage_mode = storage_mode or get_storage_mode()
+
+    now = datetime.now().strftime('%H:%M')
+    records = [r if r.get('timestamp') else dict(r, timestamp=now) for r in records]
+    md_path = storage_path / f'{date_str}.md'
+
+    # 同一天的读-改-写在当天的文件锁内进行，并行会话不会互相覆盖
+    with day_lock(storage_path, date_str):
+        log_path = record_log.get_log_path(storage_path, date_str)
+        if storage_mode == 'log' or log_path.exists():
+            if md_path.exists() and not log_path.exists():
+                seed_log_from_markdown(md_path, date_str)
+            return record_log.append_records(storage_path, date_str, records)
+        if len(records) == 1:
+            append_to_markdown(md_path, date_str, records[0])
+        else:
+            write_batch_to_markdown(md_path, date_str, records)
+    return md_path